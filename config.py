@@ -55,7 +55,10 @@ class Config:
        
         # API robustness
         self.max_retries = 3  # Maximum number of retries for API calls
-        self.retry_delay = 2  # Seconds to wait between retries
+        self.retry_delay = 2  # Seconds to wait before the first retry, doubled on each further retry
+        self.max_retry_delay = 10  # Upper bound on the wait between retries
+        self.max_order_workers = 8  # Maximum number of orders submitted concurrently
+        self.max_orders_per_second = 10  # Kite order placement rate limit
         
         # Notification settings
         self.enable_notifications = True
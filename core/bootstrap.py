@@ -0,0 +1,80 @@
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from auth.kite_auth import KiteAuth
+from core.strategy import Strategy
+from core.order_manager import OrderManager
+from core.expiry_manager import ExpiryManager
+from core.risk_manager import RiskManager
+from core.streaming import StreamingService
+
+# Workers in the application pool: the strategy and risk manager positions/orders refresh pairs
+APP_POOL_WORKERS = 4
+
+@dataclass(frozen=True)
+class Components:
+    """Trading components shared by the application and the dashboard"""
+    kite_auth: KiteAuth
+    kite: object
+    order_manager: OrderManager
+    expiry_manager: ExpiryManager
+    risk_manager: RiskManager
+    strategy: Strategy
+    executor: ThreadPoolExecutor = None
+    streaming_service: StreamingService = None
+
+@functools.lru_cache(maxsize=1)
+def get_components(logger, config, streaming=True):
+    """
+    Authenticate and build the trading components once per process
+    
+    Args:
+        logger: Logger instance
+        config: Configuration instance
+        streaming: True for the trading process, which refreshes the instruments
+            dump and streams ticks; False for read-only consumers like the dashboard
+    
+    Returns:
+        Components instance
+    """
+    # Authenticate with Kite
+    kite_auth = KiteAuth(logger)
+    kite = kite_auth.authenticate()
+    logger.info("Bootstrap: Authentication completed")
+    
+    # One pool for the refreshes, owned and shut down by the trading process;
+    # read-only consumers never shut it down, so they refresh sequentially instead
+    executor = None
+    if streaming:
+        executor = ThreadPoolExecutor(max_workers=APP_POOL_WORKERS, thread_name_prefix="app")
+    
+    order_manager = OrderManager(kite, logger, config)
+    
+    # Download the instruments dump once and share it with the expiry manager
+    if streaming:
+        instruments = order_manager.download_instruments()
+    else:
+        instruments = list(order_manager.instruments_cache.values())
+    expiry_manager = ExpiryManager(kite, logger, config, instruments=instruments or None)
+    
+    risk_manager = RiskManager(kite, logger, config, order_manager, executor=executor)
+    
+    streaming_service = None
+    if streaming:
+        streaming_service = StreamingService(kite, logger, config)
+        streaming_service.register_order_callback("order_manager", order_manager.on_order_update)
+    
+    strategy = Strategy(
+        kite,
+        logger,
+        config,
+        order_manager,
+        expiry_manager,
+        risk_manager,
+        streaming_service,
+        executor=executor
+    )
+    
+    logger.info("Bootstrap: All components initialized")
+    return Components(kite_auth, kite, order_manager, expiry_manager, risk_manager, strategy, executor, streaming_service)
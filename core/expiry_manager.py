@@ -1,11 +1,30 @@
 import os
 import logging
 import datetime
+import functools
 import pandas as pd
 from kiteconnect import KiteConnect
 
+@functools.lru_cache(maxsize=64)
+def _expiry_tag(expiry_date):
+    return expiry_date.strftime('%y%b').upper()
+
+def expiry_tag(expiry):
+    """
+    Get the monthly tradingsymbol tag for an expiry, e.g. 25APR
+    
+    Args:
+        expiry: Expiry date (datetime.date or datetime.datetime)
+        
+    Returns:
+        Expiry tag string
+    """
+    if isinstance(expiry, datetime.datetime):
+        expiry = expiry.date()
+    return _expiry_tag(expiry)
+
 class ExpiryManager:
-    def __init__(self, kite, logger, config):
+    def __init__(self, kite, logger, config, instruments=None):
         """
         Initialize ExpiryManager with KiteConnect instance
         
@@ -13,6 +32,7 @@ class ExpiryManager:
             kite: Authenticated KiteConnect instance
             logger: Logger instance
             config: Configuration instance
+            instruments: NFO instruments already loaded by the caller (optional)
         """
         self.kite = kite
         self.logger = logger
@@ -23,17 +43,25 @@ class ExpiryManager:
         self.monthly_expiry_dates = []
         self.weekly_expiry_dates = []
         
+        # Far month / next weekly expiry resolved for the current date
+        self._resolved_expiries = {}
+        self._resolved_for_date = None
+        
         # Initialize cache
-        self._init_expiry_dates()
+        self._init_expiry_dates(instruments)
         self.logger.info("ExpiryManager: Expiry manager initialized")
     
-    def _init_expiry_dates(self):
+    def _init_expiry_dates(self, instruments=None):
         """
         Initialize expiry dates cache
+        
+        Args:
+            instruments: Instruments to read expiries from instead of downloading them (optional)
         """
         try:
             self.logger.info("ExpiryManager: Initializing expiry dates cache")
-            all_instruments = self.kite.instruments("NFO")
+            self._resolved_expiries = {}
+            all_instruments = instruments if instruments is not None else self.kite.instruments("NFO")
             
             # Filter for NIFTY options
             nifty_options = [i for i in all_instruments if i['name'] == 'NIFTY']
@@ -76,6 +104,9 @@ class ExpiryManager:
             Expiry date (datetime.date) or None if not available
         """
         today = datetime.datetime.now().date()
+        cached = self._get_resolved_expiry('far', today)
+        if cached is not None:
+            return cached
         
         # Ensure we have enough expiry dates cached
         if len(self.monthly_expiry_dates) < self.config.far_month_expiry:
@@ -94,6 +125,7 @@ class ExpiryManager:
             return future_expiries[-1] if future_expiries else None
         
         # Return the 3rd future monthly expiry
+        self._resolved_expiries['far'] = future_expiries[2]
         return future_expiries[2]
     
     def get_next_weekly_expiry(self):
@@ -104,6 +136,9 @@ class ExpiryManager:
             Expiry date (datetime.date) or None if not available
         """
         today = datetime.datetime.now().date()
+        cached = self._get_resolved_expiry('weekly', today)
+        if cached is not None:
+            return cached
         
         # Filter future weekly expiries
         future_weekly_expiries = [exp for exp in self.weekly_expiry_dates if exp.date() > today]
@@ -114,8 +149,25 @@ class ExpiryManager:
             return future_monthly_expiries[0] if future_monthly_expiries else None
         
         # Return the next weekly expiry
+        self._resolved_expiries['weekly'] = future_weekly_expiries[0]
         return future_weekly_expiries[0]
     
+    def _get_resolved_expiry(self, name, today):
+        """
+        Get an expiry already resolved today, discarding results from earlier days
+        
+        Args:
+            name: Cache entry name ('far' or 'weekly')
+            today: Current date
+            
+        Returns:
+            Cached expiry date or None if not resolved today
+        """
+        if self._resolved_for_date != today:
+            self._resolved_expiries = {}
+            self._resolved_for_date = today
+        return self._resolved_expiries.get(name)
+    
     def is_expiry_day(self, expiry_date=None):
         """
         Check if today is an expiry day
@@ -0,0 +1,137 @@
+import math
+import numpy as np
+
+# Numba is optional: kernels are compiled when it is installed and run as plain Python otherwise
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+def _round_half_even(x):
+    """
+    Round to the nearest integer, ties to even (same as the built-in round)
+    
+    Args:
+        x: Value to round
+    
+    Returns:
+        Rounded value
+    """
+    floor = math.floor(x)
+    diff = x - floor
+    if diff > 0.5 or (diff == 0.5 and floor % 2 == 1):
+        floor += 1
+    return floor
+
+def round_to_strike(price, strike_gap):
+    """
+    Round a price to the nearest strike
+    
+    Args:
+        price: Price to round
+        strike_gap: Points between adjacent strikes
+    
+    Returns:
+        Nearest strike price
+    """
+    return int(_round_half_even(price / strike_gap)) * strike_gap
+
+def round_to_strike_50(price):
+    """
+    Round a price to the nearest strike on the Nifty 50-point strike gap
+    
+    Args:
+        price: Price to round
+    
+    Returns:
+        Nearest strike price
+    """
+    # Constant gap lets the compiler fold the division into a multiply
+    return int(_round_half_even(price * 0.02)) * 50
+
+def round_to_tick(price, tick_size):
+    """
+    Round a price to the nearest exchange tick
+    
+    Args:
+        price: Price to round
+        tick_size: Minimum price increment
+    
+    Returns:
+        Price on the tick grid, to 2 decimal places
+    """
+    return round(_round_half_even(price / tick_size) * tick_size, 2)
+
+def compute_strikes(spot, bias, strangle_distance, strike_gap):
+    """
+    Compute ATM and strangle strikes from the spot price
+    
+    Args:
+        spot: Spot price
+        bias: Bias added to the spot price
+        strangle_distance: Points away from ATM for strangle legs
+        strike_gap: Points between adjacent strikes
+    
+    Returns:
+        Tuple of (ATM strike, CE strangle strike, PE strangle strike)
+    """
+    atm = round_to_strike(spot + bias, strike_gap)
+    ce = round_to_strike(atm + strangle_distance, strike_gap)
+    pe = round_to_strike(atm - strangle_distance, strike_gap)
+    return atm, ce, pe
+
+def profitable_leg_indices(quantities, sell_prices, ltps, threshold):
+    """
+    Find short legs whose profit percentage has reached the threshold
+    
+    Args:
+        quantities: Net quantity per position
+        sell_prices: Average sell price per position
+        ltps: Last traded price per position (0 or NaN if unknown)
+        threshold: Profit percentage threshold
+    
+    Returns:
+        Array of indices of profitable short legs
+    """
+    out = np.empty(quantities.shape[0], dtype=np.int64)
+    k = 0
+    for i in range(quantities.shape[0]):
+        # Skip long/flat positions and legs without prices
+        if quantities[i] >= 0 or not sell_prices[i] > 0 or not ltps[i] > 0:
+            continue
+        pct = (sell_prices[i] - ltps[i]) / sell_prices[i] * 100.0
+        if pct >= threshold:
+            out[k] = i
+            k += 1
+    return out[:k]
+
+def hedge_strikes(strikes, premiums, signs, strike_gap):
+    """
+    Compute hedge strikes for several sell legs at once
+    
+    Args:
+        strikes: Sell leg strikes
+        premiums: Sell leg premiums
+        signs: +1 for CE legs (hedge above), -1 for PE legs (hedge below)
+        strike_gap: Points between adjacent strikes
+    
+    Returns:
+        Array of hedge strikes rounded to the nearest strike
+    """
+    out = np.empty(strikes.shape[0], dtype=np.int64)
+    for i in range(strikes.shape[0]):
+        out[i] = round_to_strike(strikes[i] + signs[i] * premiums[i], strike_gap)
+    return out
+
+if njit is not None:
+    # Explicit signatures compile at import; cache=True reuses the machine code across runs
+    _round_half_even = njit("float64(float64)", cache=True)(_round_half_even)
+    round_to_strike = njit("int64(float64, int64)", cache=True)(round_to_strike)
+    round_to_strike_50 = njit("int64(float64)", cache=True)(round_to_strike_50)
+    round_to_tick = njit("float64(float64, float64)", cache=True)(round_to_tick)
+    compute_strikes = njit("UniTuple(int64, 3)(float64, float64, float64, int64)", cache=True)(compute_strikes)
+    profitable_leg_indices = njit("int64[:](int64[:], float64[:], float64[:], float64)", cache=True)(profitable_leg_indices)
+    hedge_strikes = njit("int64[:](float64[:], float64[:], float64[:], int64)", cache=True)(hedge_strikes)
+else:
+    # Without numba the built-in round is faster and also rounds ties to even
+    _round_half_even = round
@@ -1,9 +1,23 @@
 import os
+import re
+import time
 import logging
 import datetime
+import threading
+import numpy as np
 import pandas as pd
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from kiteconnect import KiteConnect
 
+# NIFTY option symbols: monthly (NIFTY25APR18000CE) and weekly (NIFTY2541718000CE)
+TRADINGSYMBOL_RE = re.compile(r'^NIFTY(\d{2}[A-Z]{3}|\d{2}[1-9OND]\d{2})(\d+)(CE|PE)$')
+
+INSTRUMENTS_DTYPE = [('token', 'i8'), ('strike', 'i4'), ('expiry', 'M8[D]'), ('opt', 'U2'), ('symbol', 'U32')]
+
+# Local copy of the NFO instruments dump
+INSTRUMENTS_CSV = os.path.join('data', 'instruments.csv')
+
 class OrderManager:
     def __init__(self, kite, logger, config):
         """
@@ -21,9 +35,39 @@ class OrderManager:
         
         # Cache for instruments
         self.instruments_cache = {}
+        self.instruments_by_token = {}
+        self.tokens_by_key = {}
+        self.instruments_array = self.build_instruments_array([])
+        self.strikes_by_expiry_opt = {}
         self.positions = {}
+        self.positions_df = self.build_positions_df([])
+        self.positions_by_expiry_type = self.build_positions_index(self.positions_df)
         self.orders = {}
         
+        # Positions and orders keyed by instrument token, rebuilt when the source is replaced
+        self._positions_by_token = {}
+        self._positions_by_token_source = None
+        self._orders_by_token = {}
+        self._orders_by_token_source = None
+        
+        # Set when positions/orders may have changed since the last refresh
+        self.positions_dirty = True
+        self.orders_dirty = True
+        
+        # Monotonic time of the last successful refresh
+        self.positions_refreshed_at = None
+        self.orders_refreshed_at = None
+        
+        # Per-cycle cache of last traded prices, keyed by instrument token and "EXCHANGE:SYMBOL"
+        self.ltp_cache = {}
+        
+        # Executor for submitting independent orders concurrently
+        self.order_executor = ThreadPoolExecutor(max_workers=self.config.max_order_workers)
+        
+        # Submission times within the last second, shared by all order threads for rate limiting
+        self._order_times = deque()
+        self._order_rate_lock = threading.Lock()
+        
         # Initialize cache
         self._init_instruments_cache()
         self.logger.info("OrderManager: Order manager initialized")
@@ -33,36 +77,39 @@ class OrderManager:
          Download instruments data and save to CSV
          
          Returns:
-             True if successful, False otherwise
+             List of downloaded instruments if successful, None otherwise
          """
          try:
              self.logger.info("OrderManager: Downloading instruments data")
              
              # Create directory if it doesn't exist
-             os.makedirs('data', exist_ok=True)
+             os.makedirs(os.path.dirname(INSTRUMENTS_CSV), exist_ok=True)
              
              # Download instruments
              instruments = self.kite.instruments("NFO")
              
              # Save to CSV
              df = pd.DataFrame(instruments)
-             df.to_csv('data/instruments.csv', index=False)
+             df.to_csv(INSTRUMENTS_CSV, index=False)
              
              self.logger.info(f"OrderManager: Downloaded {len(instruments)} instruments")
-             return True
+             return instruments
          except Exception as e:
              self.logger.error(f"OrderManager: Failed to download instruments: {str(e)}")
-             return False
+             return None
     
-    def load_instruments_from_csv(self):
+    def load_instruments_from_csv(self, name=None):
          """
          Load instruments from CSV file
          
+         Args:
+             name: Only load instruments of this underlying (default: all)
+             
          Returns:
              List of instruments or None if failed
          """
          try:
-             csv_path = 'data/instruments.csv'
+             csv_path = INSTRUMENTS_CSV
              if not os.path.exists(csv_path):
                  self.logger.warning("OrderManager: Instruments CSV not found, downloading")
                  if not self.download_instruments():
@@ -71,17 +118,18 @@ class OrderManager:
              # Load CSV
              df = pd.read_csv(csv_path)
              
+             # Drop other underlyings before the per-row conversions below
+             if name is not None:
+                 df = df[df['name'] == name]
+             
+             # Convert expiry strings to datetime in one vectorized pass
+             if 'expiry' in df.columns:
+                 expiry = pd.to_datetime(df['expiry'], errors='coerce')
+                 df['expiry'] = pd.Series(expiry.dt.to_pydatetime(), index=df.index, dtype=object)
+             
              # Convert to list of dictionaries
              instruments = df.to_dict('records')
              
-             # Convert expiry strings to datetime
-             for instrument in instruments:
-                 if 'expiry' in instrument and instrument['expiry']:
-                     try:
-                         instrument['expiry'] = pd.to_datetime(instrument['expiry']).to_pydatetime()
-                     except:
-                         pass
-             
              self.logger.info(f"OrderManager: Loaded {len(instruments)} instruments from CSV")
              return instruments
          except Exception as e:
@@ -100,11 +148,9 @@ class OrderManager:
          """
          try:
              # Find instrument in cache
-             for instrument in self.instruments_cache.values():
-                 if instrument['instrument_token'] == instrument_token:
-                     lot_size = instrument.get('lot_size')
-                     if lot_size:
-                         return lot_size
+             instrument = self.instruments_by_token.get(instrument_token)
+             if instrument and instrument.get('lot_size'):
+                 return instrument['lot_size']
              
              # If not found in cache, use default
              return self.config.lot_size
@@ -120,7 +166,7 @@ class OrderManager:
              self.logger.info("OrderManager: Initializing instruments cache")
              
              # Try to load from CSV first
-             instruments = self.load_instruments_from_csv()
+             instruments = self.load_instruments_from_csv(name='NIFTY')
              
              # If CSV loading failed, fetch from API
              if not instruments:
@@ -140,10 +186,163 @@ class OrderManager:
                      key = f"{instrument['expiry'].strftime('%Y-%m-%d')}_{instrument['strike']}_{instrument['instrument_type']}"
                      self.instruments_cache[key] = instrument
              
+             # Materialize the values once for the index builds below
+             cached_instruments = tuple(self.instruments_cache.values())
+             
+             # Index by instrument token for O(1) reverse lookups
+             self.instruments_by_token = self.build_instruments_index(cached_instruments)
+             
+             # Index tokens by (expiry, strike, type) for O(1) forward lookups
+             self.tokens_by_key = {
+                 self._create_token_key(i['expiry'], i['strike'], i['instrument_type']): i['instrument_token']
+                 for i in cached_instruments
+             }
+             
+             # Columnar copy for vectorized range queries
+             self.instruments_array = self.build_instruments_array(cached_instruments)
+             
+             # Sorted listed strikes per (expiry, type) for nearest-strike searches
+             self.strikes_by_expiry_opt = {}
+             for expiry, opt in set(zip(self.instruments_array['expiry'], self.instruments_array['opt'])):
+                 mask = (self.instruments_array['expiry'] == expiry) & (self.instruments_array['opt'] == opt)
+                 self.strikes_by_expiry_opt[(expiry.astype(datetime.date), str(opt))] = np.unique(self.instruments_array['strike'][mask])
+             
              self.logger.info(f"OrderManager: Initialized instruments cache with {len(self.instruments_cache)} instruments")
          except Exception as e:
              self.logger.error(f"OrderManager: Error initializing instruments cache: {str(e)}")
     
+    @staticmethod
+    def build_instruments_index(instruments):
+        """
+        Index instruments by token, precomputing each expiry as an ordinal day
+        
+        Args:
+            instruments: Iterable of instrument dictionaries
+            
+        Returns:
+            Dictionary mapping instrument token to instrument, with expiry_ord added
+        """
+        index = {}
+        for instrument in instruments:
+            # Integer day numbers make expiry-day checks a plain int comparison
+            instrument['expiry_ord'] = OrderManager._to_date(instrument['expiry']).toordinal()
+            index[instrument['instrument_token']] = instrument
+        return index
+    
+    @staticmethod
+    def build_instruments_array(instruments):
+        """
+        Build a structured array of instruments for vectorized filtering
+        
+        Args:
+            instruments: Iterable of instrument dictionaries
+            
+        Returns:
+            NumPy structured array with token, strike, expiry, opt and symbol fields
+        """
+        rows = []
+        for i in instruments:
+            expiry = i['expiry']
+            if isinstance(expiry, datetime.datetime):
+                expiry = expiry.date()
+            rows.append((i['instrument_token'], int(i['strike']), expiry, i['instrument_type'], i['tradingsymbol']))
+        
+        return np.array(rows, dtype=INSTRUMENTS_DTYPE)
+    
+    def find_instruments(self, expiry=None, instrument_type=None, min_strike=None, max_strike=None):
+        """
+        Find instruments matching the given filters
+        
+        Args:
+            expiry: Expiry date (datetime.date, datetime.datetime or "YYYY-MM-DD")
+            instrument_type: CE or PE
+            min_strike: Lowest strike to include
+            max_strike: Highest strike to include
+            
+        Returns:
+            Structured array of matching instruments
+        """
+        arr = self.instruments_array
+        mask = np.ones(len(arr), dtype=bool)
+        
+        if expiry is not None:
+            if isinstance(expiry, datetime.datetime):
+                expiry = expiry.date()
+            mask &= arr['expiry'] == np.datetime64(expiry, 'D')
+        if instrument_type is not None:
+            mask &= arr['opt'] == instrument_type
+        if min_strike is not None:
+            mask &= arr['strike'] >= min_strike
+        if max_strike is not None:
+            mask &= arr['strike'] <= max_strike
+        
+        return arr[mask]
+    
+    def nearest_listed_strike(self, expiry, instrument_type, strike):
+        """
+        Get the listed strike closest to the given strike
+        
+        Args:
+            expiry: Expiry date (datetime.date, datetime.datetime or "YYYY-MM-DD")
+            instrument_type: CE or PE
+            strike: Target strike price
+            
+        Returns:
+            Nearest listed strike, or the given strike if none are listed for the expiry
+        """
+        strikes = self.strikes_by_expiry_opt.get((self._to_date(expiry), instrument_type))
+        if strikes is None or len(strikes) == 0:
+            return strike
+        
+        idx = int(np.searchsorted(strikes, strike))
+        if idx == len(strikes):
+            return int(strikes[-1])
+        if idx > 0 and strike - strikes[idx - 1] <= strikes[idx] - strike:
+            return int(strikes[idx - 1])
+        return int(strikes[idx])
+    
+    def listed_strikes_from(self, expiry, instrument_type, strike, count, descending=False):
+        """
+        Get consecutive listed strikes starting at a strike and moving away from it
+        
+        Args:
+            expiry: Expiry date (datetime.date, datetime.datetime or "YYYY-MM-DD")
+            instrument_type: CE or PE
+            strike: Starting strike price (included if listed)
+            count: Maximum number of strikes to return
+            descending: Walk down from the strike instead of up
+            
+        Returns:
+            List of listed strikes, or None if none are listed for the expiry
+        """
+        strikes = self.strikes_by_expiry_opt.get((self._to_date(expiry), instrument_type))
+        if strikes is None or len(strikes) == 0:
+            return None
+        
+        # Slices of the sorted strike array are views; only the returned window is copied
+        if descending:
+            end = int(np.searchsorted(strikes, strike, side='right'))
+            return strikes[max(0, end - count):end][::-1].tolist()
+        start = int(np.searchsorted(strikes, strike, side='left'))
+        return strikes[start:start + count].tolist()
+    
+    @staticmethod
+    def _to_date(expiry):
+        """
+        Normalize an expiry to a date
+        
+        Args:
+            expiry: Expiry date (datetime.date, datetime.datetime or "YYYY-MM-DD")
+            
+        Returns:
+            Expiry as datetime.date
+        """
+        if isinstance(expiry, datetime.datetime):
+            return expiry.date()
+        if isinstance(expiry, str):
+            return datetime.datetime.strptime(expiry, "%Y-%m-%d").date()
+        return expiry
+    
     def _api_call_with_retry(self, func, *args, **kwargs):
          """
          Make API call with retry
@@ -164,7 +363,8 @@ class OrderManager:
                  retries += 1
                  self.logger.warning(f"OrderManager: API call failed (attempt {retries}/{self.config.max_retries}): {str(e)}")
                  if retries < self.config.max_retries:
-                     time.sleep(self.config.retry_delay)
+                     # Back off exponentially so a struggling API is not hammered at a fixed rate
+                     time.sleep(min(self.config.retry_delay * 2 ** (retries - 1), self.config.max_retry_delay))
                  else:
                      self.logger.error(f"OrderManager: All retries failed for API call: {str(e)}")
                      return None
@@ -188,6 +388,25 @@ class OrderManager:
         
         return f"{expiry.strftime('%Y-%m-%d')}_{strike}_{instrument_type}"
     
+    def _create_token_key(self, expiry, strike, instrument_type):
+        """
+        Create a hashable key for instrument token lookup
+        
+        Args:
+            expiry: Expiry date (datetime.date, datetime.datetime or "YYYY-MM-DD")
+            strike: Strike price
+            instrument_type: CE or PE
+            
+        Returns:
+            Tuple of (expiry date, integer strike, instrument type)
+        """
+        if isinstance(expiry, datetime.datetime):
+            expiry = expiry.date()
+        elif isinstance(expiry, str):
+            expiry = datetime.datetime.strptime(expiry, "%Y-%m-%d").date()
+        
+        return (expiry, int(strike), instrument_type)
+    
     def get_instrument(self, expiry, strike, instrument_type):
         """
         Get instrument details from cache
@@ -227,6 +446,10 @@ class OrderManager:
         Returns:
             Instrument token or None if not found
         """
+        token = self.tokens_by_key.get(self._create_token_key(expiry, strike, instrument_type))
+        if token is not None:
+            return token
+        
         instrument = self.get_instrument(expiry, strike, instrument_type)
         if instrument:
             return instrument['instrument_token']
@@ -239,19 +462,66 @@ class OrderManager:
         Returns:
             Dictionary of positions
         """
+        # Clear before fetching so an order update arriving mid-fetch keeps the flag set
+        self.positions_dirty = False
         try:
             self.logger.info("OrderManager: Refreshing positions")
             positions = self.kite.positions()
             
             # Store positions
             self.positions = positions
+            self.positions_df = self.build_positions_df(positions['net'])
+            self.positions_by_expiry_type = self.build_positions_index(self.positions_df)
+            self.positions_refreshed_at = time.monotonic()
             
             self.logger.info(f"OrderManager: Refreshed positions: {len(positions['net'])} net positions")
             return positions
         except Exception as e:
+            self.positions_dirty = True
             self.logger.error(f"OrderManager: Failed to refresh positions: {str(e)}")
             return None
     
+    @staticmethod
+    def build_positions_df(net_positions):
+        """
+        Build a DataFrame of net positions with precomputed columns for fast filtering
+        
+        Args:
+            net_positions: List of net position dictionaries
+            
+        Returns:
+            DataFrame with opt_type, is_ce, is_pe, expiry_tag, parsed_strike and is_short columns added
+        """
+        positions_df = pd.DataFrame(net_positions)
+        if positions_df.empty:
+            positions_df = pd.DataFrame(columns=['tradingsymbol', 'quantity'])
+        
+        # Parse expiry tag, strike and option type from the symbol in one pass
+        parts = positions_df['tradingsymbol'].astype(str).str.extract(TRADINGSYMBOL_RE)
+        positions_df['expiry_tag'] = parts[0]
+        positions_df['parsed_strike'] = pd.to_numeric(parts[1])
+        positions_df['opt_type'] = parts[2].fillna(positions_df['tradingsymbol'].astype(str).str[-2:])
+        positions_df['is_ce'] = positions_df['opt_type'] == 'CE'
+        positions_df['is_pe'] = positions_df['opt_type'] == 'PE'
+        positions_df['is_short'] = positions_df['quantity'] < 0
+        return positions_df
+    
+    @staticmethod
+    def build_positions_index(positions_df):
+        """
+        Group positions by expiry tag and option type
+        
+        Args:
+            positions_df: DataFrame built by build_positions_df
+            
+        Returns:
+            Dictionary mapping (expiry_tag, opt_type) to a list of position dictionaries
+        """
+        index = defaultdict(list)
+        for position in positions_df.to_dict('records'):
+            index[(position['expiry_tag'], position['opt_type'])].append(position)
+        return dict(index)
+    
     def refresh_orders(self):
         """
         Refresh orders from Kite API
@@ -259,19 +529,33 @@ class OrderManager:
         Returns:
             List of orders
         """
+        # Clear before fetching so an order update arriving mid-fetch keeps the flag set
+        self.orders_dirty = False
         try:
             self.logger.info("OrderManager: Refreshing orders")
             orders = self.kite.orders()
             
             # Store orders
             self.orders = {order['order_id']: order for order in orders}
+            self.orders_refreshed_at = time.monotonic()
             
             self.logger.info(f"OrderManager: Refreshed orders: {len(orders)} orders")
             return orders
         except Exception as e:
+            self.orders_dirty = True
             self.logger.error(f"OrderManager: Failed to refresh orders: {str(e)}")
             return None
     
+    def on_order_update(self, data):
+        """
+        Mark positions and orders as stale when an order update is received
+        
+        Args:
+            data: Order update data from the streaming service
+        """
+        self.positions_dirty = True
+        self.orders_dirty = True
+    
     def get_position_for_instrument(self, instrument_token):
         """
         Get position for a specific instrument
@@ -285,11 +569,15 @@ class OrderManager:
         if not self.positions:
             self.refresh_positions()
         
-        for position in self.positions.get('net', []):
-            if position['instrument_token'] == instrument_token:
-                return position
+        if self._positions_by_token_source is not self.positions:
+            # Reversed so the first position for a token wins, as with a linear scan
+            self._positions_by_token = {
+                position['instrument_token']: position
+                for position in reversed(self.positions.get('net', []))
+            }
+            self._positions_by_token_source = self.positions
         
-        return None
+        return self._positions_by_token.get(instrument_token)
     
     def get_orders_for_instrument(self, instrument_token):
         """
@@ -304,7 +592,14 @@ class OrderManager:
         if not self.orders:
             self.refresh_orders()
         
-        return [order for order in self.orders.values() if order['instrument_token'] == instrument_token]
+        if self._orders_by_token_source is not self.orders:
+            orders_by_token = defaultdict(list)
+            for order in self.orders.values():
+                orders_by_token[order['instrument_token']].append(order)
+            self._orders_by_token = dict(orders_by_token)
+            self._orders_by_token_source = self.orders
+        
+        return list(self._orders_by_token.get(instrument_token, ()))
     
     def place_order(self, instrument_token, transaction_type, quantity, order_type="MARKET", price=0, trigger_price=0, tag=None):
         """
@@ -343,9 +638,13 @@ class OrderManager:
             if tag:
                 params["tag"] = tag
             
+            self._wait_for_order_slot()
             order_id = self.kite.place_order(variety="regular", **params)
             self.logger.info(f"OrderManager: Order placed successfully, order_id: {order_id}")
             
+            # A new order may change positions
+            self.positions_dirty = True
+            
             # Refresh orders to include the new order
             self.refresh_orders()
             
@@ -379,6 +678,59 @@ class OrderManager:
             
             return None
     
+    def _wait_for_order_slot(self):
+        """
+        Block until an order can be sent without exceeding the order rate limit
+        """
+        while True:
+            with self._order_rate_lock:
+                now = time.monotonic()
+                while self._order_times and now - self._order_times[0] >= 1.0:
+                    self._order_times.popleft()
+                
+                if len(self._order_times) < self.config.max_orders_per_second:
+                    self._order_times.append(now)
+                    return
+                
+                wait = 1.0 - (now - self._order_times[0])
+            
+            time.sleep(wait)
+    
+    def place_order_async(self, **kwargs):
+        """
+        Place an order without blocking the caller
+        
+        Args:
+            **kwargs: Keyword arguments accepted by place_order
+            
+        Returns:
+            Future resolving to the order ID if successful, None otherwise
+        """
+        return self.order_executor.submit(self.place_order, **kwargs)
+    
+    def place_basket(self, orders):
+        """
+        Place several independent orders together
+        
+        Args:
+            orders: List of dictionaries of place_order keyword arguments
+            
+        Returns:
+            List of order IDs (None for failed orders), in the same order as the input
+        """
+        self.logger.info(f"OrderManager: Placing basket of {len(orders)} orders")
+        
+        # All orders are in flight at once; place_order keeps them within the rate limit
+        futures = [self.order_executor.submit(self.place_order, **order) for order in orders]
+        return [future.result() for future in futures]
+    
+    def shutdown(self):
+        """
+        Wait for pending orders and release the order executor
+        """
+        self.logger.info("OrderManager: Shutting down order executor")
+        self.order_executor.shutdown(wait=True)
+    
     def modify_order(self, order_id, price=None, trigger_price=None, quantity=None, order_type=None):
         """
         Modify an existing order
@@ -451,9 +803,9 @@ class OrderManager:
             Trading symbol or None if not found
         """
         # Search in cache
-        for instrument in self.instruments_cache.values():
-            if instrument['instrument_token'] == instrument_token:
-                return instrument['tradingsymbol']
+        instrument = self.instruments_by_token.get(instrument_token)
+        if instrument:
+            return instrument['tradingsymbol']
         
         # If not found, try to get from API
         try:
@@ -530,6 +882,39 @@ class OrderManager:
         
         return None
     
+    def prefetch_ltps(self, keys):
+        """
+        Fetch last traded prices for several instruments in a single API call
+        and store them in the LTP cache
+        
+        Args:
+            keys: List of instrument tokens and/or "EXCHANGE:SYMBOL" strings
+            
+        Returns:
+            Dictionary of cached last traded prices
+        """
+        if not keys:
+            return self.ltp_cache
+        
+        try:
+            ltp_data = self.kite.ltp(keys)
+            for key, data in ltp_data.items():
+                self.ltp_cache[key] = data['last_price']
+                if 'instrument_token' in data:
+                    self.ltp_cache[data['instrument_token']] = data['last_price']
+            
+            self.logger.info(f"OrderManager: Prefetched LTPs for {len(ltp_data)} instruments")
+        except Exception as e:
+            self.logger.error(f"OrderManager: Failed to prefetch LTPs: {str(e)}")
+        
+        return self.ltp_cache
+    
+    def clear_ltp_cache(self):
+        """
+        Clear the LTP cache so that stale prices are not reused across cycles
+        """
+        self.ltp_cache = {}
+    
     def get_ltp(self, instrument_token):
         """
         Get last traded price for an instrument
@@ -540,6 +925,10 @@ class OrderManager:
         Returns:
             Last traded price or None if not available
         """
+        ltp = self.ltp_cache.get(instrument_token)
+        if ltp is not None:
+            return ltp
+        
         try:
             ltp_data = self.kite.ltp([instrument_token])
             return ltp_data[str(instrument_token)]['last_price']
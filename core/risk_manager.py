@@ -5,7 +5,7 @@ import pandas as pd
 from kiteconnect import KiteConnect
 
 class RiskManager:
-    def __init__(self, kite, logger, config, order_manager):
+    def __init__(self, kite, logger, config, order_manager, executor=None):
         """
         Initialize RiskManager with KiteConnect instance
         
@@ -14,6 +14,7 @@ class RiskManager:
             logger: Logger instance
             config: Configuration instance
             order_manager: OrderManager instance
+            executor: Shared ThreadPoolExecutor for the refreshes (run sequentially if None)
         """
         self.kite = kite
         self.logger = logger
@@ -27,6 +28,14 @@ class RiskManager:
         self.shutdown_loss_amount = self.capital_allocated * (self.shutdown_loss_percentage / 100)
         
         self.logger.info(f"RiskManager: Shutdown loss set at {self.shutdown_loss_percentage}% (₹{self.shutdown_loss_amount:.2f})")
+        
+        # Trading hours are fixed for the run, so parse them once
+        self.trading_start_time = datetime.datetime.strptime(self.config.start_time, "%H:%M:%S").time()
+        self.trading_end_time = datetime.datetime.strptime(self.config.end_time, "%H:%M:%S").time()
+        
+        # Application pool for overlapping the positions and orders refreshes; owned by the caller
+        self._refresh_executor = executor
+        
         self.logger.info("RiskManager: Risk manager initialized")
     
     def get_monthly_pnl(self):
@@ -41,27 +50,32 @@ class RiskManager:
              today = datetime.datetime.now()
              month_start = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
              
-             # Get positions
-             positions = self.order_manager.refresh_positions()
+             # Positions and orders are independent, so overlap their network latency
+             if self._refresh_executor is not None:
+                 positions_future = self._refresh_executor.submit(self.order_manager.refresh_positions)
+                 orders_future = self._refresh_executor.submit(self.order_manager.refresh_orders)
+                 positions = positions_future.result()
+                 all_orders = orders_future.result()
+             else:
+                 positions = self.order_manager.refresh_positions()
+                 all_orders = self.order_manager.refresh_orders()
              
-             # Calculate unrealized PnL
+             # Sum unrealized and realized PnL in a single pass
              unrealized_pnl = 0
-             for position in positions.get('net', []):
-                 unrealized_pnl += position.get('unrealised_pnl', 0)
-             
-             # Calculate realized PnL
              realized_pnl = 0
              for position in positions.get('net', []):
+                 unrealized_pnl += position.get('unrealised_pnl', 0)
                  realized_pnl += position.get('realised_pnl', 0)
              
-             # Get completed trades for the month
-             orders = self.order_manager.refresh_orders()
+             # Get completed trades for the month, parsing all timestamps in one call
+             orders = [order for order in all_orders if 'order_timestamp' in order]
              monthly_orders = []
-             for order in orders:
-                 if 'order_timestamp' in order:
-                     order_time = pd.to_datetime(order['order_timestamp'])
-                     if order_time >= month_start and order['status'] == 'COMPLETE':
-                         monthly_orders.append(order)
+             if orders:
+                 in_month = pd.to_datetime([order['order_timestamp'] for order in orders]) >= month_start
+                 monthly_orders = [
+                     order for order, current in zip(orders, in_month)
+                     if current and order['status'] == 'COMPLETE'
+                 ]
              
              return {
                  'unrealized_pnl': unrealized_pnl,
@@ -135,7 +149,7 @@ class RiskManager:
             option_positions = []
             for position in positions.get('net', []):
                 # Check if this position is for the specified option type
-                if position['tradingsymbol'].endswith(option_type):
+                if position['tradingsymbol'][-2:] == option_type:
                     option_positions.append(position)
             
             if not option_positions:
@@ -167,6 +181,43 @@ class RiskManager:
             # In case of error, don't trigger exit
             return False
     
+    def check_profit_exit_conditions(self):
+        """
+        Check profit exit conditions for both option types in a single pass
+        over the cached positions DataFrame
+        
+        Returns:
+            Dictionary mapping CE and PE to True if the profit exit condition is met
+        """
+        result = {"CE": False, "PE": False}
+        try:
+            df = self.order_manager.positions_df
+            short = df[df['is_short'] & df['opt_type'].isin(["CE", "PE"])]
+            if short.empty:
+                self.logger.info("RiskManager: No short positions found for profit exit check")
+                return result
+            
+            # For short positions, profit is positive when price goes down
+            ltps = short['instrument_token'].map(self.order_manager.get_ltp)
+            valid = ltps.notna() & (ltps != 0) & short['sell_price'].notna() & (short['sell_price'] != 0)
+            profit_points = ((short['sell_price'] - ltps) * short['quantity'].abs())[valid]
+            totals = profit_points.groupby(short['opt_type'][valid]).sum()
+            
+            for option_type in result:
+                total_profit_points = float(totals.get(option_type, 0))
+                self.logger.info(f"RiskManager: Total profit for {option_type} positions: {total_profit_points:.2f} points")
+                
+                # Check if profit exceeds threshold
+                if total_profit_points >= self.config.profit_points:
+                    self.logger.info(f"RiskManager: Profit exit condition met for {option_type}! Profit ({total_profit_points:.2f} points) exceeds threshold ({self.config.profit_points} points)")
+                    result[option_type] = True
+            
+            return result
+        except Exception as e:
+            self.logger.error(f"RiskManager: Error checking profit exit conditions: {str(e)}")
+            # In case of error, don't trigger exit
+            return {"CE": False, "PE": False}
+    
     def calculate_position_profit_percentage(self, position):
         """
         Calculate profit percentage for a position
@@ -272,8 +323,8 @@ class RiskManager:
                 return False
         
         # Check trading hours
-        start_time = datetime.datetime.strptime(self.config.start_time, "%H:%M:%S").time()
-        end_time = datetime.datetime.strptime(self.config.end_time, "%H:%M:%S").time()
+        start_time = self.trading_start_time
+        end_time = self.trading_end_time
         
         if current_time < start_time or current_time > end_time:
             self.logger.info(f"RiskManager: Current time ({current_time}) is outside trading hours ({start_time} - {end_time}), trading not allowed")
@@ -1,12 +1,44 @@
 import os
+import time
 import logging
 import datetime
-import pandas as pd
+import functools
 import numpy as np
+from dataclasses import dataclass
 from kiteconnect import KiteConnect
+from core.expiry_manager import expiry_tag
+
+NIFTY_SPOT_SYMBOL = "NSE:NIFTY 50"
+NIFTY_SPOT_TOKEN = 256265
+OPTION_TICK_SIZE = 0.05
+HEDGE_TOUCH_FRACTION = 0.005  # Spot within 0.5% of a hedge strike counts as touching it
+STRIKE_SEARCH_TTL = 1.5  # Seconds a premium-to-strike search result stays valid
+
+@functools.cache
+def _kernels():
+    """Import the numeric kernels on first use so loading this module stays cheap"""
+    from core import kernels
+    return kernels
+
+@functools.cache
+def _strike_rounder(strike_gap):
+    """Return a strike rounding function, specialized for the Nifty 50-point gap"""
+    kernels = _kernels()
+    if strike_gap == 50:
+        return kernels.round_to_strike_50
+    return functools.partial(kernels.round_to_strike, strike_gap=strike_gap)
+
+@dataclass(frozen=True, slots=True)
+class TickContext:
+    """Values resolved once at the start of an execute() cycle"""
+    now: datetime.datetime
+    today: datetime.date
+    far: datetime.date
+    weekly: datetime.date
+    is_expiry: bool
 
 class Strategy:
-    def __init__(self, kite, logger, config, order_manager, expiry_manager, risk_manager, streaming_service):
+    def __init__(self, kite, logger, config, order_manager, expiry_manager, risk_manager, streaming_service, executor=None):
         """
         Initialize Strategy with required components
         
@@ -18,6 +50,7 @@ class Strategy:
             expiry_manager: ExpiryManager instance
             risk_manager: RiskManager instance
             streaming_service: StreamingService instance
+            executor: Shared ThreadPoolExecutor for the refreshes (run sequentially if None)
         """
         self.kite = kite
         self.logger = logger
@@ -33,6 +66,43 @@ class Strategy:
         self.nifty_spot_price = None
         self.instruments_to_monitor = []
         
+        # Dates resolved once per execute() cycle, None outside a cycle
+        self._tick = None
+        
+        # Last computed ATM strike as ((spot, bias), strike)
+        self._atm_cache = None
+        
+        # Monotonic start time of the current execute() cycle
+        self._cycle_started_at = None
+        
+        # Structure existence results for the positions snapshot they were computed from
+        self._existence_cache = {}
+        self._existence_source = None
+        
+        # (expiry, option type, strike) of long positions, rebuilt when positions are refreshed
+        self._long_strikes = None
+        self._long_strikes_source = None
+        
+        # (positions, band slice) of the last hedge touch check that found nothing to do
+        self._last_touch_check = None
+        
+        # Touch bands of the hedges in the positions list they were built from
+        self._touch_bands = None
+        self._touch_bands_source = None
+        
+        # Positions grouped by (option type, side) for the positions DataFrame they were built from
+        self._position_buckets = {}
+        self._position_buckets_source = None
+        
+        # Recent _find_strike_for_premium results: key -> (monotonic time, strike)
+        self._strike_search_cache = {}
+        
+        # Streamed strike-search candidates: (expiry, option type) -> set of tokens
+        self._candidate_windows = {}
+        
+        # Application pool for running the independent positions/orders REST refreshes concurrently; owned by the caller
+        self._refresh_executor = executor
+        
         self.logger.info("Strategy: Strategy module initialized")
 
     def _execute_trend_based_strategy(self):
@@ -48,12 +118,12 @@ class Strategy:
              return
              
          # Get far month expiry
-         far_month_expiry = self.expiry_manager.get_far_month_expiry()
+         far_month_expiry = self._get_far_month_expiry()
          if not far_month_expiry:
              self.logger.error("Strategy: Could not determine far month expiry")
              return
              
-         self.logger.info(f"Strategy: Far month expiry: {far_month_expiry}, trend: {self.config.trend}")
+         self.logger.info("Strategy: Far month expiry: %s, trend: %s", far_month_expiry, self.config.trend)
          
          # Get ATM strike
          atm_strike = self.get_atm_strike()
@@ -77,7 +147,7 @@ class Strategy:
              atm_strike: ATM strike price
              trend: Trend direction ("bullish" or "bearish")
          """
-         self.logger.info(f"Strategy: Placing trend-based orders for {trend} trend")
+         self.logger.info("Strategy: Placing trend-based orders for %s trend", trend)
          
          # Calculate strikes based on trend
          if trend == "bullish":
@@ -108,7 +178,7 @@ class Strategy:
          far_exists = self._sell_order_exists_for_type(expiry, far_type)
          
          if normal_exists and far_exists:
-             self.logger.info(f"Strategy: Both {normal_type} and {far_type} orders already exist, skipping")
+             self.logger.info("Strategy: Both %s and %s orders already exist, skipping", normal_type, far_type)
              return
          
          # Place normal order if it doesn't exist
@@ -134,14 +204,14 @@ class Strategy:
          """
          # Check if buy order exists at this strike
          if self._buy_order_exists_at_strike(expiry, strike, option_type):
-             self.logger.warning(f"Strategy: Buy order exists at strike {strike}, adjusting strike")
+             self.logger.warning("Strategy: Buy order exists at strike %s, adjusting strike", strike)
              adjustment = -50 if option_type == "CE" else 50
              strike = self._adjust_strike_for_conflict(strike, adjustment)
          
          # Get instrument token
          token = self.order_manager.get_instrument_token(expiry, strike, option_type)
          if not token:
-             self.logger.error(f"Strategy: Could not find instrument for {expiry}, {strike} {option_type}")
+             self.logger.error("Strategy: Could not find instrument for %s, %s %s", expiry, strike, option_type)
              return
          
          # Determine tag
@@ -163,13 +233,13 @@ class Strategy:
          )
          
          if order_id:
-             self.logger.info(f"Strategy: Trend {order_type} order placed successfully for {option_type}, order_id: {order_id}")
+             self.logger.info("Strategy: Trend %s order placed successfully for %s, order_id: %s", order_type, option_type, order_id)
              
              # Place hedge buy order
              if self.config.buy_hedge:
                  self._place_single_hedge_buy_order(token, option_type)
          else:
-             self.logger.error(f"Strategy: Failed to place trend {order_type} order for {option_type}")
+             self.logger.error("Strategy: Failed to place trend %s order for %s", order_type, option_type)
     
     def _check_strategy_conversion(self, expiry, normal_type, far_type):
          """
@@ -191,11 +261,7 @@ class Strategy:
                  continue
                  
              # Find instrument details
-             instrument = None
-             for instr in self.order_manager.instruments_cache.values():
-                 if instr['instrument_token'] == position['instrument_token']:
-                     instrument = instr
-                     break
+             instrument = self.order_manager.instruments_by_token.get(position['instrument_token'])
                      
              if not instrument:
                  continue
@@ -211,7 +277,7 @@ class Strategy:
              return
              
          # Check if premium has increased by threshold
-         current_premium = self.order_manager.get_ltp(far_position['instrument_token'])
+         current_premium = self._get_ltp(far_position['instrument_token'])
          if not current_premium:
              return
              
@@ -219,7 +285,7 @@ class Strategy:
          premium_change = ((current_premium - original_premium) / original_premium) * 100
          
          if premium_change >= self.config.strategy_conversion_threshold:
-             self.logger.info(f"Strategy: Far {far_type} premium increased by {premium_change:.2f}%, converting strategy")
+             self.logger.info("Strategy: Far %s premium increased by %.2f%%, converting strategy", far_type, premium_change)
              
              # Close far order and its hedge
              self._close_position(far_position)
@@ -269,11 +335,7 @@ class Strategy:
              position: Position dictionary
          """
          # Find instrument details
-         instrument = None
-         for instr in self.order_manager.instruments_cache.values():
-             if instr['instrument_token'] == position['instrument_token']:
-                 instrument = instr
-                 break
+         instrument = self.order_manager.instruments_by_token.get(position['instrument_token'])
                  
          if not instrument:
              return
@@ -286,11 +348,7 @@ class Strategy:
                  continue
                  
              # Find hedge instrument details
-             hedge_instrument = None
-             for instr in self.order_manager.instruments_cache.values():
-                 if instr['instrument_token'] == hedge_position['instrument_token']:
-                     hedge_instrument = instr
-                     break
+             hedge_instrument = self.order_manager.instruments_by_token.get(hedge_position['instrument_token'])
                      
              if not hedge_instrument:
                  continue
@@ -319,11 +377,7 @@ class Strategy:
                  continue
                  
              # Find instrument details
-             instrument = None
-             for instr in self.order_manager.instruments_cache.values():
-                 if instr['instrument_token'] == position['instrument_token']:
-                     instrument = instr
-                     break
+             instrument = self.order_manager.instruments_by_token.get(position['instrument_token'])
                      
              if not instrument:
                  continue
@@ -343,19 +397,159 @@ class Strategy:
             Current Nifty spot price
         """
         try:
-            # Get Nifty 50 instrument token (hardcoded for now)
-            nifty_instrument_token = 256265  # Nifty 50 index
+            # Use the streamed or prefetched LTP if available, otherwise fetch it
+            spot_price = self._get_streamed_ltp(NIFTY_SPOT_TOKEN)
+            if spot_price is None:
+                spot_price = self.order_manager.ltp_cache.get(NIFTY_SPOT_SYMBOL)
+            if spot_price is None:
+                ltp_data = self.kite.ltp([NIFTY_SPOT_SYMBOL])
+                spot_price = ltp_data[NIFTY_SPOT_SYMBOL]["last_price"]
             
-            # Get LTP
-            ltp_data = self.kite.ltp([f"NSE:NIFTY 50"])
-            self.nifty_spot_price = ltp_data["NSE:NIFTY 50"]["last_price"]
-            self.logger.info(f"Strategy: Updated Nifty spot price: {self.nifty_spot_price}")
+            self.nifty_spot_price = spot_price
+            self.logger.info("Strategy: Updated Nifty spot price: %s", self.nifty_spot_price)
             
             return self.nifty_spot_price
         except Exception as e:
-            self.logger.error(f"Strategy: Failed to update Nifty spot price: {str(e)}")
+            self.logger.error("Strategy: Failed to update Nifty spot price: %s", e)
             return None
     
+    def _get_far_month_expiry(self):
+        """
+        Get far month expiry, reusing the value resolved for the current cycle
+        
+        Returns:
+            Expiry date or None if not available
+        """
+        if self._tick is not None:
+            return self._tick.far
+        return self.expiry_manager.get_far_month_expiry()
+    
+    def _get_next_weekly_expiry(self):
+        """
+        Get next weekly expiry, reusing the value resolved for the current cycle
+        
+        Returns:
+            Expiry date or None if not available
+        """
+        if self._tick is not None:
+            return self._tick.weekly
+        return self.expiry_manager.get_next_weekly_expiry()
+    
+    def _refresh_account_state(self):
+        """
+        Refresh positions and orders, skipping the REST calls when the order
+        update stream shows nothing has changed since the last refresh, or when
+        they were already refreshed earlier in this cycle
+        """
+        stream_live = self.streaming_service is not None and self.streaming_service.is_connected
+        refreshes = []
+        
+        if self.order_manager.positions_dirty or (
+                not stream_live and not self._refreshed_this_cycle(self.order_manager.positions_refreshed_at)):
+            refreshes.append(self.order_manager.refresh_positions)
+        
+        if self.order_manager.orders_dirty or (
+                not stream_live and not self._refreshed_this_cycle(self.order_manager.orders_refreshed_at)):
+            refreshes.append(self.order_manager.refresh_orders)
+        
+        # The two calls are independent, so overlap their network latency
+        if len(refreshes) > 1 and self._refresh_executor is not None:
+            futures = [self._refresh_executor.submit(refresh) for refresh in refreshes]
+            for future in futures:
+                future.result()
+        else:
+            for refresh in refreshes:
+                refresh()
+    
+    def _refreshed_this_cycle(self, refreshed_at):
+        """
+        Check if a refresh happened during the current execute() cycle
+        
+        Args:
+            refreshed_at: Monotonic time of the refresh or None
+            
+        Returns:
+            True if refreshed since the cycle started, False otherwise
+        """
+        return (self._cycle_started_at is not None and refreshed_at is not None
+                and refreshed_at >= self._cycle_started_at)
+    
+    def _subscribe_open_positions(self):
+        """
+        Stream prices for the Nifty spot and all open positions so LTPs can be read from memory
+        """
+        if self.streaming_service is None:
+            return
+        
+        positions = self.order_manager.positions.get('net', [])
+        tokens = [NIFTY_SPOT_TOKEN]
+        tokens.extend(p['instrument_token'] for p in positions if p['quantity'] != 0)
+        self.streaming_service.subscribe(tokens)
+    
+    def _get_streamed_ltp(self, instrument_token):
+        """
+        Get last traded price from the tick stream only
+        
+        Args:
+            instrument_token: Instrument token
+            
+        Returns:
+            Last traded price or None if the stream is down or has no tick yet
+        """
+        if self.streaming_service is not None and self.streaming_service.is_connected:
+            return self.streaming_service.get_ltp(instrument_token)
+        return None
+    
+    def _get_ltp(self, instrument_token):
+        """
+        Get last traded price from the tick stream, falling back to the REST API
+        
+        Args:
+            instrument_token: Instrument token
+            
+        Returns:
+            Last traded price or None if not available
+        """
+        ltp = self._get_streamed_ltp(instrument_token)
+        if ltp is not None:
+            return ltp
+        
+        return self.order_manager.get_ltp(instrument_token)
+    
+    def _prefetch_ltps(self):
+        """
+        Cache spot and open position LTPs for this cycle, copying streamed prices
+        and fetching the rest in a single round-trip
+        """
+        positions = self.order_manager.positions.get('net', [])
+        wanted = [(NIFTY_SPOT_SYMBOL, NIFTY_SPOT_TOKEN)]
+        wanted.extend((p['instrument_token'], p['instrument_token']) for p in positions if p['quantity'] != 0)
+        
+        keys = []
+        for key, token in wanted:
+            ltp = self._get_streamed_ltp(token)
+            if ltp is not None:
+                self.order_manager.ltp_cache[key] = ltp
+            else:
+                keys.append(key)
+        
+        if keys:
+            self.order_manager.prefetch_ltps(keys)
+    
+    def _prefetch_missing_ltps(self, instrument_tokens):
+        """
+        Fetch LTPs that are neither streamed nor cached in a single round-trip
+        
+        Args:
+            instrument_tokens: List of instrument tokens that are about to be priced
+        """
+        missing = [
+            token for token in instrument_tokens
+            if token not in self.order_manager.ltp_cache and self._get_streamed_ltp(token) is None
+        ]
+        if missing:
+            self.order_manager.prefetch_ltps(missing)
+    
     def get_atm_strike(self):
         """
         Get at-the-money strike price based on current spot price and bias
@@ -370,15 +564,43 @@ class Strategy:
                 self.logger.error("Strategy: Could not determine spot price for ATM strike calculation")
                 return None
         
+        # Reuse the ATM strike if spot and bias are unchanged
+        atm_key = (self.nifty_spot_price, self.config.bias)
+        if self._atm_cache and self._atm_cache[0] == atm_key:
+            return self._atm_cache[1]
+        
         # Apply bias to spot price
         adjusted_spot = self.nifty_spot_price + self.config.bias
         
         # Round to nearest 50 for Nifty
-        atm_strike = round(adjusted_spot / self.config.strike_gap) * self.config.strike_gap
+        atm_strike = self._round_to_strike(adjusted_spot)
+        self._atm_cache = (atm_key, atm_strike)
         
-        self.logger.info(f"Strategy: ATM strike calculated as {atm_strike} (spot: {self.nifty_spot_price}, bias: {self.config.bias})")
+        self.logger.info("Strategy: ATM strike calculated as %s (spot: %s, bias: %s)", atm_strike, self.nifty_spot_price, self.config.bias)
         return atm_strike
     
+    def _round_to_strike(self, price):
+        """
+        Round a price to the nearest strike on the configured strike gap
+        
+        Args:
+            price: Price to round
+            
+        Returns:
+            Nearest strike price
+        """
+        return _strike_rounder(self.config.strike_gap)(price)
+    
+    def _compute_strikes(self):
+        """
+        Compute ATM and strangle strikes for the current spot price and bias
+        
+        Returns:
+            Tuple of (ATM strike, CE strangle strike, PE strangle strike)
+        """
+        return _kernels().compute_strikes(self.nifty_spot_price, self.config.bias,
+                                         self.config.strangle_distance, self.config.strike_gap)
+    
     def execute(self):
         """
         Execute the strategy
@@ -387,6 +609,14 @@ class Strategy:
             True if execution was successful, False otherwise
         """
         self.logger.info("Strategy: Starting strategy execution")
+        self._cycle_started_at = time.monotonic()
+        
+        # Invalidate prices and strikes cached during the previous cycle
+        self.order_manager.clear_ltp_cache()
+        self._atm_cache = None
+        self._existence_cache = {}
+        self._long_strikes = None
+        self._strike_search_cache = {}
         
         # Check if trading is allowed
         if not self.risk_manager.is_trading_allowed():
@@ -399,58 +629,155 @@ class Strategy:
             self._exit_all_positions()
             return False
         
-        # Update spot price
-        if not self.update_spot_price():
-            self.logger.error("Strategy: Failed to update spot price, cannot execute strategy")
-            return False
-        
-        # Refresh positions and orders
-        self.order_manager.refresh_positions()
-        self.order_manager.refresh_orders()
-        
-        # Check if we need to handle expiry day operations
-        if self.expiry_manager.is_expiry_day():
-            self.logger.info("Strategy: Today is an expiry day, handling expiry operations")
-            self._handle_expiry_day()
-        
-        # Check profit exit conditions
-        if self.risk_manager.check_profit_exit_condition(None, "CE"):
-            self.logger.info("Strategy: Profit exit condition met for CE options, exiting all CE positions")
-            self._exit_all_positions_by_type("CE")
-        
-        if self.risk_manager.check_profit_exit_condition(None, "PE"):
-            self.logger.info("Strategy: Profit exit condition met for PE options, exiting all PE positions")
-            self._exit_all_positions_by_type("PE")
-        
-        # Execute trend-based strategy
-        self._execute_trend_based_strategy()
+        # Resolve dates once for this cycle
+        now = datetime.datetime.now()
+        self._tick = TickContext(
+            now=now,
+            today=now.date(),
+            far=self.expiry_manager.get_far_month_expiry(),
+            weekly=self.expiry_manager.get_next_weekly_expiry(),
+            is_expiry=self.expiry_manager.is_expiry_day()
+        )
         
-        # Check for profitable legs and add stop loss
-        self._manage_profitable_legs()
+        try:
+            # Refresh positions and orders if they may have changed
+            self._refresh_account_state()
+            
+            # Stream prices for open positions
+            self._subscribe_open_positions()
+            
+            # Batch spot and position LTP lookups into one API call
+            self._prefetch_ltps()
+            
+            # Update spot price
+            if not self.update_spot_price():
+                self.logger.error("Strategy: Failed to update spot price, cannot execute strategy")
+                return False
+            
+            # Check if we need to handle expiry day operations
+            if self._tick.is_expiry:
+                self.logger.info("Strategy: Today is an expiry day, handling expiry operations")
+                self._handle_expiry_day()
+            
+            # Check profit exit conditions for both sides in one pass
+            profit_exits = self.risk_manager.check_profit_exit_conditions()
+            if profit_exits.get("CE"):
+                self.logger.info("Strategy: Profit exit condition met for CE options, exiting all CE positions")
+                self._exit_all_positions_by_type("CE")
+            
+            if profit_exits.get("PE"):
+                self.logger.info("Strategy: Profit exit condition met for PE options, exiting all PE positions")
+                self._exit_all_positions_by_type("PE")
+            
+            # Execute trend-based strategy unless the structure is already open
+            if self._structure_open():
+                self.logger.info("Strategy: Structure already open for far month expiry, skipping entry")
+            else:
+                self._execute_trend_based_strategy()
+            
+            # Position management below reads one shared snapshot
+            snapshot = self._build_snapshot()
+            
+            # Check for profitable legs and add stop loss
+            self._manage_profitable_legs(snapshot)
+            
+            # Check for hedge buy orders in loss
+            self._manage_hedge_buy_orders(snapshot)
+            
+            # Check for orphan hedge orders
+            self._close_orphan_hedge_orders(snapshot)
+            
+            # Check if spot price touches hedge buy order strike
+            self._check_spot_price_touches_hedge(snapshot)
+            
+            self.logger.info("Strategy: Strategy execution completed")
+            return True
+        finally:
+            self._tick = None
+    
+    def _build_snapshot(self):
+        """
+        Build a snapshot of positions and prices shared by the position management steps
         
-        # Check for hedge buy orders in loss
-        self._manage_hedge_buy_orders()
+        Returns:
+            Dictionary with net positions, positions DataFrame, LTP cache and spot price
+        """
+        return {
+            'positions': self.order_manager.positions.get('net', []),
+            'positions_df': self.order_manager.positions_df,
+            'ltps': self.order_manager.ltp_cache,
+            'spot': self.nifty_spot_price
+        }
+    
+    def _select_positions(self, option_type=None, side=None, snapshot=None):
+        """
+        Select net positions with vectorized masks over the positions DataFrame
         
-        # Check for orphan hedge orders
-        self._close_orphan_hedge_orders()
+        Args:
+            option_type: Option type (CE or PE), or None for both
+            side: 1 for long, -1 for short, or None for any open position
+            snapshot: Cycle snapshot from _build_snapshot (built if not given)
+            
+        Returns:
+            List of matching position dictionaries
+        """
+        snapshot = snapshot or self._build_snapshot()
+        positions_df = snapshot['positions_df']
+        if positions_df is None or positions_df.empty:
+            return []
+        
+        # Buckets are built once per positions refresh and shared by every helper in the cycle
+        if self._position_buckets_source is not positions_df:
+            self._position_buckets = self._build_position_buckets(snapshot['positions'], positions_df)
+            self._position_buckets_source = positions_df
+        return self._position_buckets.get((option_type, side), [])
+    
+    @staticmethod
+    def _build_position_buckets(positions, positions_df):
+        """
+        Group net positions by option type and side
         
-        # Check if spot price touches hedge buy order strike
-        self._check_spot_price_touches_hedge()
+        Args:
+            positions: List of net position dictionaries
+            positions_df: DataFrame built from the same positions
+            
+        Returns:
+            Dictionary mapping (option type or None, side or None) to a list of position dictionaries
+        """
+        quantities = positions_df['quantity'].to_numpy()
+        side_masks = {None: quantities != 0, 1: quantities > 0, -1: quantities < 0}
+        type_masks = {None: np.ones(len(quantities), dtype=bool)}
+        for option_type in ("CE", "PE"):
+            type_masks[option_type] = (positions_df['opt_type'] == option_type).to_numpy()
+        
+        return {
+            (option_type, side): [positions[i] for i in np.flatnonzero(type_mask & side_mask)]
+            for option_type, type_mask in type_masks.items()
+            for side, side_mask in side_masks.items()
+        }
+    
+    def _structure_open(self):
+        """
+        Check if the sideways straddle/strangle is already open for the far month expiry
         
-        self.logger.info("Strategy: Strategy execution completed")
-        return True
+        Returns:
+            True if no entry orders are needed, False otherwise
+        """
+        if self.config.trend != "sideways" or self._tick is None or not self._tick.far:
+            return False
+        return self._short_straddle_exists(self._tick.far)
     
     def _execute_short_straddle(self):
         """
         Execute short straddle strategy
         """
         # Get far month expiry
-        far_month_expiry = self.expiry_manager.get_far_month_expiry()
+        far_month_expiry = self._get_far_month_expiry()
         if not far_month_expiry:
             self.logger.error("Strategy: Could not determine far month expiry")
             return
         
-        self.logger.info(f"Strategy: Far month expiry: {far_month_expiry}")
+        self.logger.info("Strategy: Far month expiry: %s", far_month_expiry)
         
         # Check if short straddle already exists for far month expiry
         if self._short_straddle_exists(far_month_expiry):
@@ -471,12 +798,12 @@ class Strategy:
         Execute short strangle strategy
         """
         # Get far month expiry
-        far_month_expiry = self.expiry_manager.get_far_month_expiry()
+        far_month_expiry = self._get_far_month_expiry()
         if not far_month_expiry:
             self.logger.error("Strategy: Could not determine far month expiry")
             return
         
-        self.logger.info(f"Strategy: Far month expiry: {far_month_expiry}")
+        self.logger.info("Strategy: Far month expiry: %s", far_month_expiry)
         
         # Check if short strangle already exists for far month expiry
         if self._short_strangle_exists(far_month_expiry):
@@ -490,14 +817,9 @@ class Strategy:
             return
         
         # Calculate strangle strikes (approximately 1000 points away from spot price)
-        ce_strike = atm_strike + self.config.strangle_distance
-        pe_strike = atm_strike - self.config.strangle_distance
-        
-        # Round to nearest 50 for Nifty
-        ce_strike = round(ce_strike / self.config.strike_gap) * self.config.strike_gap
-        pe_strike = round(pe_strike / self.config.strike_gap) * self.config.strike_gap
+        _, ce_strike, pe_strike = self._compute_strikes()
         
-        self.logger.info(f"Strategy: Strangle strikes - CE: {ce_strike}, PE: {pe_strike}")
+        self.logger.info("Strategy: Strangle strikes - CE: %s, PE: %s", ce_strike, pe_strike)
         
         # Place sell orders for CE and PE at calculated strikes
         self._place_short_strangle_orders(far_month_expiry, ce_strike, pe_strike)
@@ -512,17 +834,24 @@ class Strategy:
         Returns:
             True if short straddle exists, False otherwise
         """
-        positions = self.order_manager.positions.get('net', [])
+        index = self.order_manager.positions_by_expiry_type
+        
+        # Reuse the result while the positions snapshot is unchanged
+        if self._existence_source is not index:
+            self._existence_cache = {}
+            self._existence_source = index
         
-        # Filter positions by expiry
-        expiry_str = expiry.strftime('%y%b').upper()
-        expiry_positions = [p for p in positions if expiry_str in p['tradingsymbol']]
+        key = (expiry, 'straddle')
+        if key in self._existence_cache:
+            return self._existence_cache[key]
         
-        # Check if we have both CE and PE short positions
-        ce_short = any(p['quantity'] < 0 and p['tradingsymbol'].endswith('CE') for p in expiry_positions)
-        pe_short = any(p['quantity'] < 0 and p['tradingsymbol'].endswith('PE') for p in expiry_positions)
+        # Check if we have both CE and PE short positions for this expiry
+        expiry_str = expiry_tag(expiry)
+        ce_short = any(p['quantity'] < 0 for p in index.get((expiry_str, 'CE'), []))
+        pe_short = any(p['quantity'] < 0 for p in index.get((expiry_str, 'PE'), []))
         
-        return ce_short and pe_short
+        self._existence_cache[key] = ce_short and pe_short
+        return self._existence_cache[key]
     
     def _short_strangle_exists(self, expiry):
         """
@@ -534,7 +863,7 @@ class Strategy:
         Returns:
             True if short strangle exists, False otherwise
         """
-        # For our purposes, the check is the same as for straddle
+        # For our purposes, the check is the same as for straddle and shares its cached result
         return self._short_straddle_exists(expiry)
     
     def _place_short_straddle_orders(self, expiry, strike):
@@ -545,11 +874,11 @@ class Strategy:
             expiry: Expiry date
             strike: Strike price
         """
-        self.logger.info(f"Strategy: Placing short straddle orders for expiry {expiry}, strike {strike}")
+        self.logger.info("Strategy: Placing short straddle orders for expiry %s, strike %s", expiry, strike)
         
         # Check if buy orders exist at this strike
         if self._buy_order_exists_at_strike(expiry, strike, "CE") or self._buy_order_exists_at_strike(expiry, strike, "PE"):
-            self.logger.warning(f"Strategy: Buy order exists at strike {strike}, adjusting strike")
+            self.logger.warning("Strategy: Buy order exists at strike %s, adjusting strike", strike)
             strike = self._adjust_strike_for_conflict(strike, -50)  # Move to lower strike
         
         # Get instrument tokens
@@ -557,11 +886,11 @@ class Strategy:
         pe_token = self.order_manager.get_instrument_token(expiry, strike, "PE")
         
         if not ce_token or not pe_token:
-            self.logger.error(f"Strategy: Could not find instruments for expiry {expiry}, strike {strike}")
+            self.logger.error("Strategy: Could not find instruments for expiry %s, strike %s", expiry, strike)
             return
         
-        # Place sell orders
-        ce_order_id = self.order_manager.place_order(
+        # Place sell orders concurrently and wait for both acknowledgements
+        ce_future = self.order_manager.place_order_async(
             instrument_token=ce_token,
             transaction_type="SELL",
             quantity=self.config.lot_size,
@@ -569,7 +898,7 @@ class Strategy:
             tag="short_straddle_ce"
         )
         
-        pe_order_id = self.order_manager.place_order(
+        pe_future = self.order_manager.place_order_async(
             instrument_token=pe_token,
             transaction_type="SELL",
             quantity=self.config.lot_size,
@@ -577,8 +906,15 @@ class Strategy:
             tag="short_straddle_pe"
         )
         
+        ce_order_id = ce_future.result()
+        pe_order_id = pe_future.result()
+        
         if ce_order_id and pe_order_id:
-            self.logger.info(f"Strategy: Short straddle orders placed successfully - CE: {ce_order_id}, PE: {pe_order_id}")
+            self.logger.info("Strategy: Short straddle orders placed successfully - CE: %s, PE: %s", ce_order_id, pe_order_id)
+            
+            # Stream prices for the new legs
+            if self.streaming_service is not None:
+                self.streaming_service.subscribe([ce_token, pe_token])
             
             # Place hedge buy orders
             self._place_hedge_buy_orders(ce_token, pe_token)
@@ -594,15 +930,15 @@ class Strategy:
             ce_strike: Strike price for CE
             pe_strike: Strike price for PE
         """
-        self.logger.info(f"Strategy: Placing short strangle orders for expiry {expiry}, CE strike {ce_strike}, PE strike {pe_strike}")
+        self.logger.info("Strategy: Placing short strangle orders for expiry %s, CE strike %s, PE strike %s", expiry, ce_strike, pe_strike)
         
         # Check if buy orders exist at these strikes
         if self._buy_order_exists_at_strike(expiry, ce_strike, "CE"):
-            self.logger.warning(f"Strategy: Buy order exists at CE strike {ce_strike}, adjusting strike")
+            self.logger.warning("Strategy: Buy order exists at CE strike %s, adjusting strike", ce_strike)
             ce_strike = self._adjust_strike_for_conflict(ce_strike, -50)  # Move to lower strike
         
         if self._buy_order_exists_at_strike(expiry, pe_strike, "PE"):
-            self.logger.warning(f"Strategy: Buy order exists at PE strike {pe_strike}, adjusting strike")
+            self.logger.warning("Strategy: Buy order exists at PE strike %s, adjusting strike", pe_strike)
             pe_strike = self._adjust_strike_for_conflict(pe_strike, 50)  # Move to higher strike
         
         # Get instrument tokens
@@ -610,11 +946,11 @@ class Strategy:
         pe_token = self.order_manager.get_instrument_token(expiry, pe_strike, "PE")
         
         if not ce_token or not pe_token:
-            self.logger.error(f"Strategy: Could not find instruments for expiry {expiry}, CE strike {ce_strike}, PE strike {pe_strike}")
+            self.logger.error("Strategy: Could not find instruments for expiry %s, CE strike %s, PE strike %s", expiry, ce_strike, pe_strike)
             return
         
-        # Place sell orders
-        ce_order_id = self.order_manager.place_order(
+        # Place sell orders concurrently and wait for both acknowledgements
+        ce_future = self.order_manager.place_order_async(
             instrument_token=ce_token,
             transaction_type="SELL",
             quantity=self.config.lot_size,
@@ -622,7 +958,7 @@ class Strategy:
             tag="short_strangle_ce"
         )
         
-        pe_order_id = self.order_manager.place_order(
+        pe_future = self.order_manager.place_order_async(
             instrument_token=pe_token,
             transaction_type="SELL",
             quantity=self.config.lot_size,
@@ -630,8 +966,15 @@ class Strategy:
             tag="short_strangle_pe"
         )
         
+        ce_order_id = ce_future.result()
+        pe_order_id = pe_future.result()
+        
         if ce_order_id and pe_order_id:
-            self.logger.info(f"Strategy: Short strangle orders placed successfully - CE: {ce_order_id}, PE: {pe_order_id}")
+            self.logger.info("Strategy: Short strangle orders placed successfully - CE: %s, PE: %s", ce_order_id, pe_order_id)
+            
+            # Stream prices for the new legs
+            if self.streaming_service is not None:
+                self.streaming_service.subscribe([ce_token, pe_token])
             
             # Place hedge buy orders
             self._place_hedge_buy_orders(ce_token, pe_token)
@@ -653,28 +996,25 @@ class Strategy:
         self.logger.info("Strategy: Placing hedge buy orders")
         
         # Get next weekly expiry
-        next_weekly_expiry = self.expiry_manager.get_next_weekly_expiry()
+        next_weekly_expiry = self._get_next_weekly_expiry()
         if not next_weekly_expiry:
             self.logger.error("Strategy: Could not determine next weekly expiry for hedge orders")
             return
         
+        # Fetch premiums of the new legs in one round-trip; they were not open at prefetch time
+        self._prefetch_missing_ltps([ce_token, pe_token])
+        
         # Get average premium of sell orders
-        ce_ltp = self.order_manager.get_ltp(ce_token)
-        pe_ltp = self.order_manager.get_ltp(pe_token)
+        ce_ltp = self._get_ltp(ce_token)
+        pe_ltp = self._get_ltp(pe_token)
         
         if not ce_ltp or not pe_ltp:
             self.logger.error("Strategy: Could not determine premiums for hedge orders")
             return
         
         # Get sell order details
-        ce_instrument = None
-        pe_instrument = None
-        
-        for instrument in self.order_manager.instruments_cache.values():
-            if instrument['instrument_token'] == ce_token:
-                ce_instrument = instrument
-            elif instrument['instrument_token'] == pe_token:
-                pe_instrument = instrument
+        ce_instrument = self.order_manager.instruments_by_token.get(ce_token)
+        pe_instrument = self.order_manager.instruments_by_token.get(pe_token)
         
         if not ce_instrument or not pe_instrument:
             self.logger.error("Strategy: Could not find instrument details for hedge orders")
@@ -683,29 +1023,34 @@ class Strategy:
         # Calculate hedge buy strike prices
         # For CE: sell_strike + premium
         # For PE: sell_strike - premium
-        ce_hedge_strike = ce_instrument['strike'] + ce_ltp
-        pe_hedge_strike = pe_instrument['strike'] - pe_ltp
+        # Both legs are computed and rounded to nearest 50 in one kernel call
+        ce_hedge_strike, pe_hedge_strike = _kernels().hedge_strikes(
+            np.array([ce_instrument['strike'], pe_instrument['strike']], dtype=np.float64),
+            np.array([ce_ltp, pe_ltp], dtype=np.float64),
+            np.array([1.0, -1.0]),
+            self.config.strike_gap
+        ).tolist()
         
-        # Round to nearest 50 for Nifty
-        ce_hedge_strike = round(ce_hedge_strike / self.config.strike_gap) * self.config.strike_gap
-        pe_hedge_strike = round(pe_hedge_strike / self.config.strike_gap) * self.config.strike_gap
+        # Snap to a listed weekly strike
+        ce_hedge_strike = self.order_manager.nearest_listed_strike(next_weekly_expiry, "CE", ce_hedge_strike)
+        pe_hedge_strike = self.order_manager.nearest_listed_strike(next_weekly_expiry, "PE", pe_hedge_strike)
         
-        self.logger.info(f"Strategy: Hedge strikes - CE: {ce_hedge_strike}, PE: {pe_hedge_strike}")
+        self.logger.info("Strategy: Hedge strikes - CE: %s, PE: %s", ce_hedge_strike, pe_hedge_strike)
         
         # Get hedge instrument tokens
         ce_hedge_token = self.order_manager.get_instrument_token(next_weekly_expiry, ce_hedge_strike, "CE")
         pe_hedge_token = self.order_manager.get_instrument_token(next_weekly_expiry, pe_hedge_strike, "PE")
         
         if not ce_hedge_token or not pe_hedge_token:
-            self.logger.error(f"Strategy: Could not find hedge instruments for expiry {next_weekly_expiry}")
+            self.logger.error("Strategy: Could not find hedge instruments for expiry %s", next_weekly_expiry)
             return
         
         # Calculate hedge quantity
         ce_hedge_quantity = self.config.lot_size if self.config.hedge_one_lot else self._calculate_hedge_quantity("CE")
         pe_hedge_quantity = self.config.lot_size if self.config.hedge_one_lot else self._calculate_hedge_quantity("PE")
         
-        # Place hedge buy orders
-        ce_hedge_order_id = self.order_manager.place_order(
+        # Place hedge buy orders concurrently
+        ce_hedge_future = self.order_manager.place_order_async(
             instrument_token=ce_hedge_token,
             transaction_type="BUY",
             quantity=ce_hedge_quantity,
@@ -713,7 +1058,7 @@ class Strategy:
             tag="hedge_buy_ce"
         )
         
-        pe_hedge_order_id = self.order_manager.place_order(
+        pe_hedge_future = self.order_manager.place_order_async(
             instrument_token=pe_hedge_token,
             transaction_type="BUY",
             quantity=pe_hedge_quantity,
@@ -721,8 +1066,11 @@ class Strategy:
             tag="hedge_buy_pe"
         )
         
+        ce_hedge_order_id = ce_hedge_future.result()
+        pe_hedge_order_id = pe_hedge_future.result()
+        
         if ce_hedge_order_id and pe_hedge_order_id:
-            self.logger.info(f"Strategy: Hedge buy orders placed successfully - CE: {ce_hedge_order_id}, PE: {pe_hedge_order_id}")
+            self.logger.info("Strategy: Hedge buy orders placed successfully - CE: %s, PE: %s", ce_hedge_order_id, pe_hedge_order_id)
         else:
             self.logger.error("Strategy: Failed to place hedge buy orders")
     
@@ -736,19 +1084,12 @@ class Strategy:
         Returns:
             Hedge quantity
         """
-        positions = self.order_manager.positions.get('net', [])
-        
-        # Calculate total sell quantity
-        total_sell_quantity = 0
-        for position in positions:
-            if position['tradingsymbol'].endswith(option_type) and position['quantity'] < 0:
-                total_sell_quantity += abs(position['quantity'])
+        df = self.order_manager.positions_df
+        quantities = df['quantity'].to_numpy(dtype=np.int64)[(df['opt_type'] == option_type).to_numpy()]
         
-        # Calculate active buy quantity
-        active_buy_quantity = 0
-        for position in positions:
-            if position['tradingsymbol'].endswith(option_type) and position['quantity'] > 0:
-                active_buy_quantity += position['quantity']
+        # Calculate total sell and active buy quantity
+        total_sell_quantity = int(-quantities[quantities < 0].sum())
+        active_buy_quantity = int(quantities[quantities > 0].sum())
         
         # Calculate required hedge quantity
         hedge_quantity = total_sell_quantity - active_buy_quantity
@@ -760,36 +1101,43 @@ class Strategy:
             # Round to nearest lot size
             hedge_quantity = round(hedge_quantity / self.config.lot_size) * self.config.lot_size
         
-        self.logger.info(f"Strategy: Calculated hedge quantity for {option_type}: {hedge_quantity} (total sell: {total_sell_quantity}, active buy: {active_buy_quantity})")
+        self.logger.info("Strategy: Calculated hedge quantity for %s: %s (total sell: %s, active buy: %s)", option_type, hedge_quantity, total_sell_quantity, active_buy_quantity)
         return hedge_quantity
     
-    def _manage_profitable_legs(self):
+    def _manage_profitable_legs(self, snapshot=None):
         """
         Check for profitable legs and add stop loss and new sell orders
+        
+        Args:
+            snapshot: Cycle snapshot from _build_snapshot (built if not given)
         """
         self.logger.info("Strategy: Managing profitable legs")
         
-        positions = self.order_manager.positions.get('net', [])
+        snapshot = snapshot or self._build_snapshot()
+        positions = snapshot['positions']
         
-        for position in positions:
-            # Only check short positions
-            if position['quantity'] >= 0:
-                continue
-            
-            # Check if position is in profit
-            profit_percentage = self.risk_manager.calculate_position_profit_percentage(position)
+        quantities = np.fromiter((p['quantity'] for p in positions), dtype=np.int64, count=len(positions))
+        if not (quantities < 0).any():
+            return
+        
+        # Only short positions need prices; they come from the per-cycle LTP cache
+        sell_prices = np.fromiter((p.get('sell_price') or 0 for p in positions), dtype=np.float64, count=len(positions))
+        ltps = np.fromiter(
+            ((self._get_ltp(p['instrument_token']) or 0) if p['quantity'] < 0 else 0 for p in positions),
+            dtype=np.float64, count=len(positions)
+        )
+        
+        # Check which short positions are in profit
+        for i in _kernels().profitable_leg_indices(quantities, sell_prices, ltps, float(self.config.profit_percentage)):
+            position = positions[i]
+            profit_percentage = (sell_prices[i] - ltps[i]) / sell_prices[i] * 100
+            self.logger.info("Strategy: Position %s is in %.2f%% profit, adding stop loss and new sell order", position['tradingsymbol'], profit_percentage)
             
-            if profit_percentage is None:
-                continue
+            # Add stop loss
+            self._add_stop_loss_for_position(position)
             
-            if profit_percentage >= self.config.profit_percentage:
-                self.logger.info(f"Strategy: Position {position['tradingsymbol']} is in {profit_percentage:.2f}% profit, adding stop loss and new sell order")
-                
-                # Add stop loss
-                self._add_stop_loss_for_position(position)
-                
-                # Add new sell order
-                self._add_new_sell_order_for_profitable_leg(position)
+            # Add new sell order
+            self._add_new_sell_order_for_profitable_leg(position)
     
     def _add_stop_loss_for_position(self, position):
         """
@@ -798,11 +1146,11 @@ class Strategy:
         Args:
             position: Position dictionary
         """
-        # Calculate stop loss price
+        # Calculate stop loss price; Kite rejects triggers that are not on the tick grid
         entry_price = position['sell_price']
-        stop_loss_price = entry_price * (self.config.stop_loss_percentage / 100)
+        stop_loss_price = _kernels().round_to_tick(entry_price * (self.config.stop_loss_percentage / 100), OPTION_TICK_SIZE)
         
-        self.logger.info(f"Strategy: Setting stop loss for {position['tradingsymbol']} at {stop_loss_price:.2f} (entry: {entry_price:.2f})")
+        self.logger.info("Strategy: Setting stop loss for %s at %.2f (entry: %.2f)", position['tradingsymbol'], stop_loss_price, entry_price)
         
         # Find open orders for this position
         orders = self.order_manager.get_orders_for_instrument(position['instrument_token'])
@@ -811,7 +1159,7 @@ class Strategy:
         sl_exists = any(order['transaction_type'] == 'BUY' and order['order_type'] in ['SL', 'SL-M'] for order in orders)
         
         if sl_exists:
-            self.logger.info(f"Strategy: Stop loss already exists for {position['tradingsymbol']}")
+            self.logger.info("Strategy: Stop loss already exists for %s", position['tradingsymbol'])
             return
         
         # Place stop loss order
@@ -825,9 +1173,9 @@ class Strategy:
         )
         
         if order_id:
-            self.logger.info(f"Strategy: Stop loss order placed successfully for {position['tradingsymbol']}, order_id: {order_id}")
+            self.logger.info("Strategy: Stop loss order placed successfully for %s, order_id: %s", position['tradingsymbol'], order_id)
         else:
-            self.logger.error(f"Strategy: Failed to place stop loss order for {position['tradingsymbol']}")
+            self.logger.error("Strategy: Failed to place stop loss order for %s", position['tradingsymbol'])
     
     def _add_new_sell_order_for_profitable_leg(self, position):
         """
@@ -841,14 +1189,10 @@ class Strategy:
         instrument_token = position['instrument_token']
         
         # Find instrument details
-        instrument = None
-        for instr in self.order_manager.instruments_cache.values():
-            if instr['instrument_token'] == instrument_token:
-                instrument = instr
-                break
+        instrument = self.order_manager.instruments_by_token.get(instrument_token)
         
         if not instrument:
-            self.logger.error(f"Strategy: Could not find instrument details for {tradingsymbol}")
+            self.logger.error("Strategy: Could not find instrument details for %s", tradingsymbol)
             return
         
         # Determine expiry and option type
@@ -862,22 +1206,22 @@ class Strategy:
             target_expiry = expiry
         else:
             # Use next week expiry
-            target_expiry = self.expiry_manager.get_next_weekly_expiry()
+            target_expiry = self._get_next_weekly_expiry()
         
         if not target_expiry:
-            self.logger.error(f"Strategy: Could not determine target expiry for new sell order")
+            self.logger.error("Strategy: Could not determine target expiry for new sell order")
             return
         
         # Check if buy order exists at this strike
         if self._buy_order_exists_at_strike(target_expiry, strike, option_type):
-            self.logger.warning(f"Strategy: Buy order exists at strike {strike}, adjusting strike")
+            self.logger.warning("Strategy: Buy order exists at strike %s, adjusting strike", strike)
             strike = self._adjust_strike_for_conflict(strike, -50 if option_type == "CE" else 50)
         
         # Get target instrument token
         target_token = self.order_manager.get_instrument_token(target_expiry, strike, option_type)
         
         if not target_token:
-            self.logger.error(f"Strategy: Could not find target instrument for new sell order")
+            self.logger.error("Strategy: Could not find target instrument for new sell order")
             return
         
         # Place new sell order (one lot)
@@ -890,13 +1234,13 @@ class Strategy:
         )
         
         if order_id:
-            self.logger.info(f"Strategy: New sell order placed successfully for {target_expiry}, {strike} {option_type}, order_id: {order_id}")
+            self.logger.info("Strategy: New sell order placed successfully for %s, %s %s, order_id: %s", target_expiry, strike, option_type, order_id)
             
             # Place hedge buy order for the new sell order
             if self.config.buy_hedge:
                 self._place_single_hedge_buy_order(target_token, option_type)
         else:
-            self.logger.error(f"Strategy: Failed to place new sell order")
+            self.logger.error("Strategy: Failed to place new sell order")
     
     def _place_single_hedge_buy_order(self, sell_token, option_type):
         """
@@ -906,27 +1250,23 @@ class Strategy:
             sell_token: Sell order instrument token
             option_type: Option type (CE or PE)
         """
-        self.logger.info(f"Strategy: Placing single hedge buy order for {option_type}")
+        self.logger.info("Strategy: Placing single hedge buy order for %s", option_type)
         
         # Get next weekly expiry
-        next_weekly_expiry = self.expiry_manager.get_next_weekly_expiry()
+        next_weekly_expiry = self._get_next_weekly_expiry()
         if not next_weekly_expiry:
             self.logger.error("Strategy: Could not determine next weekly expiry for hedge order")
             return
         
         # Get average premium of sell order
-        sell_ltp = self.order_manager.get_ltp(sell_token)
+        sell_ltp = self._get_ltp(sell_token)
         
         if not sell_ltp:
             self.logger.error("Strategy: Could not determine premium for hedge order")
             return
         
         # Get sell order details
-        sell_instrument = None
-        for instrument in self.order_manager.instruments_cache.values():
-            if instrument['instrument_token'] == sell_token:
-                sell_instrument = instrument
-                break
+        sell_instrument = self.order_manager.instruments_by_token.get(sell_token)
         
         if not sell_instrument:
             self.logger.error("Strategy: Could not find instrument details for hedge order")
@@ -938,16 +1278,16 @@ class Strategy:
         else:  # PE
             hedge_strike = sell_instrument['strike'] - sell_ltp
         
-        # Round to nearest 50 for Nifty
-        hedge_strike = round(hedge_strike / self.config.strike_gap) * self.config.strike_gap
+        # Round to nearest 50 for Nifty and snap to a listed weekly strike
+        hedge_strike = self.order_manager.nearest_listed_strike(next_weekly_expiry, option_type, self._round_to_strike(hedge_strike))
         
-        self.logger.info(f"Strategy: Hedge strike for {option_type}: {hedge_strike}")
+        self.logger.info("Strategy: Hedge strike for %s: %s", option_type, hedge_strike)
         
         # Get hedge instrument token
         hedge_token = self.order_manager.get_instrument_token(next_weekly_expiry, hedge_strike, option_type)
         
         if not hedge_token:
-            self.logger.error(f"Strategy: Could not find hedge instrument for expiry {next_weekly_expiry}")
+            self.logger.error("Strategy: Could not find hedge instrument for expiry %s", next_weekly_expiry)
             return
         
         # Calculate hedge quantity
@@ -963,20 +1303,28 @@ class Strategy:
         )
         
         if hedge_order_id:
-            self.logger.info(f"Strategy: Hedge buy order placed successfully - {option_type}: {hedge_order_id}")
+            self.logger.info("Strategy: Hedge buy order placed successfully - %s: %s", option_type, hedge_order_id)
         else:
-            self.logger.error(f"Strategy: Failed to place hedge buy order for {option_type}")
+            self.logger.error("Strategy: Failed to place hedge buy order for %s", option_type)
     
-    def _manage_hedge_buy_orders(self):
+    def _manage_hedge_buy_orders(self, snapshot=None):
         """
         Check for hedge buy orders in loss and add new sell orders
+        
+        Args:
+            snapshot: Cycle snapshot from _build_snapshot (built if not given)
         """
         if not self.config.buy_hedge:
             return
         
         self.logger.info("Strategy: Managing hedge buy orders")
         
-        positions = self.order_manager.positions.get('net', [])
+        snapshot = snapshot or self._build_snapshot()
+        positions = snapshot['positions']
+        
+        quantities = np.fromiter((p['quantity'] for p in positions), dtype=np.int64, count=len(positions))
+        if not (quantities > 0).any():
+            return
         
         for position in positions:
             # Only check long positions
@@ -987,7 +1335,7 @@ class Strategy:
             loss_threshold = self.risk_manager.check_position_loss_threshold(position)
             
             if loss_threshold:
-                self.logger.info(f"Strategy: Hedge position {position['tradingsymbol']} is in loss, adding new sell order")
+                self.logger.info("Strategy: Hedge position %s is in loss, adding new sell order", position['tradingsymbol'])
                 
                 # Add new sell order at adjacency gap
                 self._add_sell_order_for_hedge_in_loss(position)
@@ -1004,14 +1352,10 @@ class Strategy:
         instrument_token = position['instrument_token']
         
         # Find instrument details
-        instrument = None
-        for instr in self.order_manager.instruments_cache.values():
-            if instr['instrument_token'] == instrument_token:
-                instrument = instr
-                break
+        instrument = self.order_manager.instruments_by_token.get(instrument_token)
         
         if not instrument:
-            self.logger.error(f"Strategy: Could not find instrument details for {tradingsymbol}")
+            self.logger.error("Strategy: Could not find instrument details for %s", tradingsymbol)
             return
         
         # Determine expiry, strike and option type
@@ -1026,20 +1370,20 @@ class Strategy:
             new_strike = strike - self.config.adjacency_gap
         
         # Round to nearest 50 for Nifty
-        new_strike = round(new_strike / self.config.strike_gap) * self.config.strike_gap
+        new_strike = self._round_to_strike(new_strike)
         
-        self.logger.info(f"Strategy: New strike for sell order: {new_strike} (original: {strike}, gap: {self.config.adjacency_gap})")
+        self.logger.info("Strategy: New strike for sell order: %s (original: %s, gap: %s)", new_strike, strike, self.config.adjacency_gap)
         
         # Check if buy order exists at this strike
         if self._buy_order_exists_at_strike(expiry, new_strike, option_type):
-            self.logger.warning(f"Strategy: Buy order exists at strike {new_strike}, adjusting strike")
+            self.logger.warning("Strategy: Buy order exists at strike %s, adjusting strike", new_strike)
             new_strike = self._adjust_strike_for_conflict(new_strike, -1*self.config.strike_gap if option_type == "CE" else self.config.strike_gap)
         
         # Get new instrument token
         new_token = self.order_manager.get_instrument_token(expiry, new_strike, option_type)
         
         if not new_token:
-            self.logger.error(f"Strategy: Could not find instrument for new sell order")
+            self.logger.error("Strategy: Could not find instrument for new sell order")
             return
         
         # Place new sell order
@@ -1052,121 +1396,182 @@ class Strategy:
         )
         
         if order_id:
-            self.logger.info(f"Strategy: New sell order placed successfully for {expiry}, {new_strike} {option_type}, order_id: {order_id}")
+            self.logger.info("Strategy: New sell order placed successfully for %s, %s %s, order_id: %s", expiry, new_strike, option_type, order_id)
         else:
-            self.logger.error(f"Strategy: Failed to place new sell order for hedge in loss")
+            self.logger.error("Strategy: Failed to place new sell order for hedge in loss")
     
-    def _close_orphan_hedge_orders(self):
+    def _close_orphan_hedge_orders(self, snapshot=None):
         """
         Close hedge buy orders that don't have corresponding sell orders
+        
+        Args:
+            snapshot: Cycle snapshot from _build_snapshot (built if not given)
         """
         if not self.config.buy_hedge:
             return
         
         self.logger.info("Strategy: Checking for orphan hedge orders")
         
-        positions = self.order_manager.positions.get('net', [])
+        snapshot = snapshot or self._build_snapshot()
+        positions_df = snapshot['positions_df']
+        if positions_df is None or positions_df.empty:
+            return
         
-        # Group positions by option type
-        ce_positions = [p for p in positions if p['tradingsymbol'].endswith('CE')]
-        pe_positions = [p for p in positions if p['tradingsymbol'].endswith('PE')]
+        # Build the side and type masks once and derive all four flags from them
+        quantities = positions_df['quantity'].to_numpy()
+        is_sell = quantities < 0
+        is_buy = quantities > 0
+        is_ce = positions_df['is_ce'].to_numpy(dtype=bool)
+        is_pe = positions_df['is_pe'].to_numpy(dtype=bool)
         
         # Check CE positions
-        ce_has_sell = any(p['quantity'] < 0 for p in ce_positions)
-        ce_has_buy = any(p['quantity'] > 0 for p in ce_positions)
+        ce_has_sell = (is_sell & is_ce).any()
+        ce_has_buy = (is_buy & is_ce).any()
         
         if ce_has_buy and not ce_has_sell:
             self.logger.info("Strategy: Found orphan CE hedge orders, closing them")
             self._close_all_buy_positions_by_type("CE")
         
         # Check PE positions
-        pe_has_sell = any(p['quantity'] < 0 for p in pe_positions)
-        pe_has_buy = any(p['quantity'] > 0 for p in pe_positions)
+        pe_has_sell = (is_sell & is_pe).any()
+        pe_has_buy = (is_buy & is_pe).any()
         
         if pe_has_buy and not pe_has_sell:
             self.logger.info("Strategy: Found orphan PE hedge orders, closing them")
             self._close_all_buy_positions_by_type("PE")
     
-    def _check_spot_price_touches_hedge(self):
+    def _check_spot_price_touches_hedge(self, snapshot=None):
         """
         Check if spot price touches hedge buy order strike and take action
+        
+        Args:
+            snapshot: Cycle snapshot from _build_snapshot (built if not given)
         """
-        if not self.config.buy_hedge or not self.nifty_spot_price:
+        snapshot = snapshot or self._build_snapshot()
+        spot = snapshot['spot']
+        
+        if not self.config.buy_hedge or not spot:
             return
         
-        self.logger.info("Strategy: Checking if spot price touches hedge buy order strike")
+        positions = snapshot['positions']
         
-        positions = self.order_manager.positions.get('net', [])
+        # Bands are sorted by strike, so both bounds are sorted and the touched hedges are one slice
+        lows, highs, hedges = self._get_touch_bands(positions)
+        first = int(np.searchsorted(highs, spot, side='left'))
+        last = int(np.searchsorted(lows, spot, side='right'))
         
-        # Filter buy positions
-        buy_positions = [p for p in positions if p['quantity'] > 0]
+        # Skip the scan while spot stays between the same bands and the positions are unchanged
+        if self._last_touch_check is not None:
+            last_positions, last_first, last_last = self._last_touch_check
+            if last_positions is positions and (first, last) == (last_first, last_last):
+                return
         
-        for position in buy_positions:
-            # Extract details from position
-            tradingsymbol = position['tradingsymbol']
-            instrument_token = position['instrument_token']
-            
-            # Find instrument details
-            instrument = None
-            for instr in self.order_manager.instruments_cache.values():
-                if instr['instrument_token'] == instrument_token:
-                    instrument = instr
-                    break
-            
-            if not instrument:
-                continue
-            
-            # Check if spot price is near the strike
+        self.logger.info("Strategy: Checking if spot price touches hedge buy order strike")
+        
+        touched = False
+        
+        for position, instrument in hedges[first:last]:
             strike = instrument['strike']
-            option_type = instrument['instrument_type']
-            
-            # Define "touching" as within 0.5% of the strike
-            touch_threshold = 0.005 * strike
-            
-            if abs(self.nifty_spot_price - strike) <= touch_threshold:
-                self.logger.info(f"Strategy: Spot price ({self.nifty_spot_price}) touches hedge strike ({strike}), closing hedge and adding far month orders")
+            if abs(spot - strike) <= HEDGE_TOUCH_FRACTION * strike:
+                self.logger.info("Strategy: Spot price (%s) touches hedge strike (%s), closing hedge and adding far month orders", spot, strike)
+                touched = True
                 
                 # Close the hedge
                 self._close_position(position)
                 
                 # Add far month buy order
-                self._add_far_month_buy_order(position)
+                self._add_far_month_buy_order(position, instrument=instrument)
+        
+        # Only a check that found nothing can be reused; touched hedges are rechecked until closed
+        self._last_touch_check = None if touched else (positions, first, last)
+    
+    def spot_touches_hedge(self, spot):
+        """
+        Check if a spot price falls in a hedge touch band from the last check;
+        cheap enough to run on every tick
+        
+        Args:
+            spot: Nifty spot price
+            
+        Returns:
+            True if spot is within a band, False otherwise or before the first check
+        """
+        bands = self._touch_bands
+        if bands is None or not self.config.buy_hedge:
+            return False
+        
+        lows, highs, _ = bands
+        return int(np.searchsorted(highs, spot, side='left')) < int(np.searchsorted(lows, spot, side='right'))
     
-    def _add_far_month_buy_order(self, position):
+    def force_touch_check(self):
+        """
+        Make the next hedge touch check scan even if spot and positions look unchanged
+        """
+        self._last_touch_check = None
+    
+    def _get_touch_bands(self, positions):
+        """
+        Get the spot bands in which each hedge buy position counts as touched
+        
+        Args:
+            positions: List of net position dictionaries
+            
+        Returns:
+            Tuple of (band lows, band highs, list of (position, instrument)), sorted by strike
+        """
+        if self._touch_bands is not None and self._touch_bands_source is positions:
+            return self._touch_bands
+        
+        hedges = []
+        for position in positions:
+            if position['quantity'] <= 0:
+                continue
+            
+            # Find instrument details
+            instrument = self.order_manager.instruments_by_token.get(position['instrument_token'])
+            if instrument:
+                hedges.append((position, instrument))
+        
+        hedges.sort(key=lambda hedge: hedge[1]['strike'])
+        strikes = np.fromiter((instrument['strike'] for _, instrument in hedges), dtype=np.float64, count=len(hedges))
+        
+        self._touch_bands = (strikes * (1 - HEDGE_TOUCH_FRACTION), strikes * (1 + HEDGE_TOUCH_FRACTION), hedges)
+        self._touch_bands_source = positions
+        return self._touch_bands
+    
+    def _add_far_month_buy_order(self, position, instrument=None):
         """
         Add far month buy order to compensate for closed hedge
         
         Args:
             position: Position dictionary of the closed hedge
+            instrument: Instrument details of the closed hedge (looked up if not given)
         """
         # Extract details from position
         tradingsymbol = position['tradingsymbol']
         instrument_token = position['instrument_token']
         
         # Find instrument details
-        instrument = None
-        for instr in self.order_manager.instruments_cache.values():
-            if instr['instrument_token'] == instrument_token:
-                instrument = instr
-                break
+        if instrument is None:
+            instrument = self.order_manager.instruments_by_token.get(instrument_token)
         
         if not instrument:
-            self.logger.error(f"Strategy: Could not find instrument details for {tradingsymbol}")
+            self.logger.error("Strategy: Could not find instrument details for %s", tradingsymbol)
             return
         
         # Determine option type
         option_type = instrument['instrument_type']
         
         # Get far month expiry
-        far_month_expiry = self.expiry_manager.get_far_month_expiry()
+        far_month_expiry = self._get_far_month_expiry()
         if not far_month_expiry:
             self.logger.error("Strategy: Could not determine far month expiry")
             return
         
         # Get current premium of the position
-        premium = self.order_manager.get_ltp(instrument_token)
+        premium = self._get_ltp(instrument_token)
         if not premium:
-            self.logger.error(f"Strategy: Could not determine premium for {tradingsymbol}")
+            self.logger.error("Strategy: Could not determine premium for %s", tradingsymbol)
             return
         
         # Calculate target premium for far month (half of current premium)
@@ -1175,13 +1580,13 @@ class Strategy:
         # Find a strike price that gives approximately the target premium
         target_strike = self._find_strike_for_premium(far_month_expiry, option_type, target_premium)
         if not target_strike:
-            self.logger.error(f"Strategy: Could not find suitable strike for far month buy order")
+            self.logger.error("Strategy: Could not find suitable strike for far month buy order")
             return
         
         # Get target instrument token
         target_token = self.order_manager.get_instrument_token(far_month_expiry, target_strike, option_type)
         if not target_token:
-            self.logger.error(f"Strategy: Could not find instrument for far month buy order")
+            self.logger.error("Strategy: Could not find instrument for far month buy order")
             return
         
         # Calculate quantity (2x the lot size of the closed hedge)
@@ -1197,9 +1602,9 @@ class Strategy:
         )
         
         if order_id:
-            self.logger.info(f"Strategy: Far month buy order placed successfully for {far_month_expiry}, {target_strike} {option_type}, quantity: {quantity}, order_id: {order_id}")
+            self.logger.info("Strategy: Far month buy order placed successfully for %s, %s %s, quantity: %s, order_id: %s", far_month_expiry, target_strike, option_type, quantity, order_id)
         else:
-            self.logger.error(f"Strategy: Failed to place far month buy order")
+            self.logger.error("Strategy: Failed to place far month buy order")
     
     def _find_strike_for_premium(self, expiry, option_type, target_premium):
         """
@@ -1213,30 +1618,68 @@ class Strategy:
         Returns:
             Strike price or None if not found
         """
+        # Bursts of near-identical searches reuse the last result for a short time
+        key = (expiry, option_type, round(target_premium, 1))
+        cached_at, cached_strike = self._strike_search_cache.get(key, (0, None))
+        if cached_strike is not None and time.monotonic() - cached_at < STRIKE_SEARCH_TTL:
+            return cached_strike
+        
         # Get ATM strike as a starting point
         atm_strike = self.get_atm_strike()
         if not atm_strike:
             return None
         
-        # Define a range of strikes to check
-        if option_type == "CE":
-            # For CE, check strikes above ATM
-            strikes_to_check = [atm_strike + i * self.config.strike_gap for i in range(20)]
-        else:
-            # For PE, check strikes below ATM
-            strikes_to_check = [atm_strike - i * self.config.strike_gap for i in range(20)]
+        # Define a range of strikes to check: CE above ATM, PE below ATM, from the listed strike table
+        strikes_to_check = self.order_manager.listed_strikes_from(expiry, option_type, atm_strike, 20, descending=option_type != "CE")
+        if not strikes_to_check:
+            if option_type == "CE":
+                # For CE, check strikes above ATM
+                strikes_to_check = [atm_strike + i * self.config.strike_gap for i in range(20)]
+            else:
+                # For PE, check strikes below ATM
+                strikes_to_check = [atm_strike - i * self.config.strike_gap for i in range(20)]
+        
+        # Resolve tokens locally and fetch every unstreamed candidate quote in one batch
+        tokens = [self.order_manager.get_instrument_token(expiry, strike, option_type) for strike in strikes_to_check]
+        candidate_tokens = [token for token in tokens if token]
+        self._prefetch_missing_ltps(candidate_tokens)
+        
+        # Stream the candidates so later searches read premiums from memory
+        if self.streaming_service is not None and candidate_tokens:
+            self._stream_candidate_window(expiry, option_type, candidate_tokens)
+        
+        premiums = {}
+        
+        def premium_at(i):
+            # Read each strike's premium at most once per search
+            if i not in premiums:
+                premiums[i] = self._get_ltp(tokens[i]) if tokens[i] else None
+            return premiums[i]
+        
+        # Premiums fall as strikes move away from ATM, so bisect for the first one at or below target
+        lo, hi = 0, len(strikes_to_check)
+        candidates = None
+        while lo < hi:
+            mid = (lo + hi) // 2
+            premium = premium_at(mid)
+            if not premium:
+                # A missing quote breaks monotonicity; fall back to checking every strike
+                candidates = range(len(strikes_to_check))
+                break
+            if premium > target_premium:
+                lo = mid + 1
+            else:
+                hi = mid
+        if candidates is None:
+            # The closest premium is on one side of the crossover
+            candidates = [i for i in (lo - 1, lo) if 0 <= i < len(strikes_to_check)]
         
         best_strike = None
         best_diff = float('inf')
         
-        for strike in strikes_to_check:
-            # Get instrument token
-            token = self.order_manager.get_instrument_token(expiry, strike, option_type)
-            if not token:
-                continue
-            
+        for i in candidates:
             # Get premium
-            premium = self.order_manager.get_ltp(token)
+            premium = premium_at(i)
             if not premium:
                 continue
             
@@ -1246,10 +1689,45 @@ class Strategy:
             # Update best if this is closer
             if diff < best_diff:
                 best_diff = diff
-                best_strike = strike
+                best_strike = strikes_to_check[i]
         
+        if best_strike is not None:
+            self._strike_search_cache[key] = (time.monotonic(), best_strike)
         return best_strike
     
+    def _stream_candidate_window(self, expiry, option_type, candidate_tokens):
+        """
+        Subscribe a strike-search candidate window and unsubscribe the tokens that left it,
+        so the ticker only streams the current windows and held positions
+        
+        Args:
+            expiry: Expiry date of the search
+            option_type: Option type (CE or PE)
+            candidate_tokens: Instrument tokens of the candidate strikes
+        """
+        self.streaming_service.subscribe(candidate_tokens)
+        
+        key = (expiry, option_type)
+        previous = self._candidate_windows.get(key, set())
+        self._candidate_windows[key] = set(candidate_tokens)
+        
+        # Windows of expiries that have passed are dropped entirely
+        today = datetime.date.today()
+        for other in list(self._candidate_windows):
+            other_expiry = other[0].date() if isinstance(other[0], datetime.datetime) else other[0]
+            if other != key and isinstance(other_expiry, datetime.date) and other_expiry < today:
+                previous |= self._candidate_windows.pop(other)
+        
+        # Keep tokens still in a window or held as positions
+        kept = {NIFTY_SPOT_TOKEN}
+        kept.update(p['instrument_token'] for p in self.order_manager.positions.get('net', []) if p['quantity'] != 0)
+        for window in self._candidate_windows.values():
+            kept |= window
+        
+        stale = [token for token in previous if token not in kept]
+        if stale:
+            self.streaming_service.unsubscribe(stale)
+    
     def _close_position(self, position):
         """
         Close a position
@@ -1257,22 +1735,53 @@ class Strategy:
         Args:
             position: Position dictionary
         """
-        # Determine transaction type (opposite of position)
-        transaction_type = "SELL" if position['quantity'] > 0 else "BUY"
-        
         # Place order to close position
-        order_id = self.order_manager.place_order(
-            instrument_token=position['instrument_token'],
-            transaction_type=transaction_type,
-            quantity=abs(position['quantity']),
-            order_type="MARKET",
-            tag="close_position"
-        )
+        order_id = self.order_manager.place_order(**self._close_order(position))
         
         if order_id:
-            self.logger.info(f"Strategy: Position {position['tradingsymbol']} closed successfully, order_id: {order_id}")
+            self.logger.info("Strategy: Position %s closed successfully, order_id: %s", position['tradingsymbol'], order_id)
         else:
-            self.logger.error(f"Strategy: Failed to close position {position['tradingsymbol']}")
+            self.logger.error("Strategy: Failed to close position %s", position['tradingsymbol'])
+    
+    def _close_order(self, position):
+        """
+        Build the market order that closes a position
+        
+        Args:
+            position: Position dictionary
+            
+        Returns:
+            Dictionary of place_order keyword arguments
+        """
+        # Determine transaction type (opposite of position)
+        transaction_type = "SELL" if position['quantity'] > 0 else "BUY"
+        
+        return {
+            'instrument_token': position['instrument_token'],
+            'transaction_type': transaction_type,
+            'quantity': abs(position['quantity']),
+            'order_type': "MARKET",
+            'tag': "close_position"
+        }
+    
+    def _close_positions(self, positions):
+        """
+        Close several positions with a single basket submission
+        
+        Args:
+            positions: List of position dictionaries
+        """
+        positions = [p for p in positions if p['quantity'] != 0]
+        if not positions:
+            return
+        
+        order_ids = self.order_manager.place_basket([self._close_order(p) for p in positions])
+        
+        for position, order_id in zip(positions, order_ids):
+            if order_id:
+                self.logger.info("Strategy: Position %s closed successfully, order_id: %s", position['tradingsymbol'], order_id)
+            else:
+                self.logger.error("Strategy: Failed to close position %s", position['tradingsymbol'])
     
     def _exit_all_positions(self):
         """
@@ -1280,14 +1789,7 @@ class Strategy:
         """
         self.logger.info("Strategy: Exiting all positions")
         
-        positions = self.order_manager.positions.get('net', [])
-        
-        for position in positions:
-            # Skip positions with zero quantity
-            if position['quantity'] == 0:
-                continue
-            
-            self._close_position(position)
+        self._close_positions(self.order_manager.positions.get('net', []))
     
     def _exit_all_positions_by_type(self, option_type):
         """
@@ -1296,16 +1798,9 @@ class Strategy:
         Args:
             option_type: Option type (CE or PE)
         """
-        self.logger.info(f"Strategy: Exiting all {option_type} positions")
-        
-        positions = self.order_manager.positions.get('net', [])
+        self.logger.info("Strategy: Exiting all %s positions", option_type)
         
-        for position in positions:
-            # Skip positions with zero quantity or wrong type
-            if position['quantity'] == 0 or not position['tradingsymbol'].endswith(option_type):
-                continue
-            
-            self._close_position(position)
+        self._close_positions(self._select_positions(option_type))
     
     def _close_all_buy_positions_by_type(self, option_type):
         """
@@ -1314,16 +1809,9 @@ class Strategy:
         Args:
             option_type: Option type (CE or PE)
         """
-        self.logger.info(f"Strategy: Closing all {option_type} buy positions")
-        
-        positions = self.order_manager.positions.get('net', [])
+        self.logger.info("Strategy: Closing all %s buy positions", option_type)
         
-        for position in positions:
-            # Skip positions with zero or negative quantity or wrong type
-            if position['quantity'] <= 0 or not position['tradingsymbol'].endswith(option_type):
-                continue
-            
-            self._close_position(position)
+        self._close_positions(self._select_positions(option_type, 1))
     
     def _handle_expiry_day(self):
         """
@@ -1332,41 +1820,32 @@ class Strategy:
         self.logger.info("Strategy: Handling expiry day operations")
         
         # Get today's date
-        today = datetime.datetime.now().date()
-        
-        # Refresh positions
-        positions = self.order_manager.positions.get('net', [])
+        today = self._tick.today if self._tick is not None else datetime.datetime.now().date()
         
         # Find expiring buy positions
+        today_ord = today.toordinal()
         expiring_buy_positions = []
-        for position in positions:
-            # Skip positions with zero or negative quantity
-            if position['quantity'] <= 0:
-                continue
-            
+        for position in self._select_positions(side=1):
             # Find instrument details
-            instrument = None
-            for instr in self.order_manager.instruments_cache.values():
-                if instr['instrument_token'] == position['instrument_token']:
-                    instrument = instr
-                    break
+            instrument = self.order_manager.instruments_by_token.get(position['instrument_token'])
             
             if not instrument:
                 continue
             
             # Check if expiry is today
-            if instrument['expiry'].date() == today:
+            if instrument['expiry_ord'] == today_ord:
                 expiring_buy_positions.append(position)
         
         if not expiring_buy_positions:
             self.logger.info("Strategy: No expiring buy positions found")
             return
         
-        self.logger.info(f"Strategy: Found {len(expiring_buy_positions)} expiring buy positions")
+        self.logger.info("Strategy: Found %s expiring buy positions", len(expiring_buy_positions))
         
         # Group by option type
-        ce_positions = [p for p in expiring_buy_positions if p['tradingsymbol'].endswith('CE')]
-        pe_positions = [p for p in expiring_buy_positions if p['tradingsymbol'].endswith('PE')]
+        expiring_tokens = {p['instrument_token'] for p in expiring_buy_positions}
+        ce_positions = [p for p in self._select_positions("CE", 1) if p['instrument_token'] in expiring_tokens]
+        pe_positions = [p for p in self._select_positions("PE", 1) if p['instrument_token'] in expiring_tokens]
         
         # Replace CE positions
         if ce_positions:
@@ -1384,10 +1863,10 @@ class Strategy:
             option_type: Option type (CE or PE)
             positions: List of positions to replace
         """
-        self.logger.info(f"Strategy: Replacing {len(positions)} expiring {option_type} buy positions")
+        self.logger.info("Strategy: Replacing %s expiring %s buy positions", len(positions), option_type)
         
         # Get next weekly expiry
-        next_weekly_expiry = self.expiry_manager.get_next_weekly_expiry()
+        next_weekly_expiry = self._get_next_weekly_expiry()
         if not next_weekly_expiry:
             self.logger.error("Strategy: Could not determine next weekly expiry")
             return
@@ -1396,15 +1875,20 @@ class Strategy:
         total_quantity = sum(p['quantity'] for p in positions)
         
         # Close expiring positions
-        for position in positions:
-            self._close_position(position)
+        self._close_positions(positions)
         
         # Calculate new strike price based on average of sell positions
-        sell_positions = [p for p in self.order_manager.positions.get('net', []) 
-                          if p['quantity'] < 0 and p['tradingsymbol'].endswith(option_type)]
+        sell_positions = self._select_positions(option_type, -1)
+        
+        # Net positions from Kite carry no strike; take it from the instrument when present
+        sell_strikes = np.fromiter(
+            (self._position_strike(p) for p in sell_positions), dtype=np.float64, count=len(sell_positions)
+        )
+        sell_quantities = np.fromiter((-p['quantity'] for p in sell_positions), dtype=np.float64, count=len(sell_positions))
+        known = ~np.isnan(sell_strikes)
         
-        if not sell_positions:
-            self.logger.warning(f"Strategy: No {option_type} sell positions found to calculate hedge strike")
+        if not known.any():
+            self.logger.warning("Strategy: No %s sell positions found to calculate hedge strike", option_type)
             # Use ATM strike as fallback
             atm_strike = self.get_atm_strike()
             if not atm_strike:
@@ -1414,20 +1898,17 @@ class Strategy:
             new_strike = atm_strike
         else:
             # Calculate weighted average strike of sell positions
-            total_sell_quantity = sum(abs(p['quantity']) for p in sell_positions)
-            weighted_strike = sum(p['strike'] * abs(p['quantity']) for p in sell_positions) / total_sell_quantity
+            weighted_strike = float(np.average(sell_strikes[known], weights=sell_quantities[known]))
             
             # Round to nearest 50 for Nifty
-            new_strike = round(weighted_strike / self.config.strike_gap) * self.config.strike_gap
+            new_strike = self._round_to_strike(weighted_strike)
         
         # Get average premium of sell positions
-        sell_premiums = []
-        for position in sell_positions:
-            ltp = self.order_manager.get_ltp(position['instrument_token'])
-            if ltp:
-                sell_premiums.append(ltp)
-        
-        avg_premium = sum(sell_premiums) / len(sell_premiums) if sell_premiums else 0
+        sell_premiums = np.fromiter(
+            ((self._get_ltp(p['instrument_token']) or 0) for p in sell_positions), dtype=np.float64, count=len(sell_positions)
+        )
+        sell_premiums = sell_premiums[sell_premiums > 0]
+        avg_premium = float(sell_premiums.mean()) if sell_premiums.size else 0
         
         # Calculate hedge strike
         if option_type == "CE":
@@ -1435,16 +1916,16 @@ class Strategy:
         else:  # PE
             hedge_strike = new_strike - avg_premium
         
-        # Round to nearest 50 for Nifty
-        hedge_strike = round(hedge_strike / self.config.strike_gap) * self.config.strike_gap
+        # Round to nearest 50 for Nifty and snap to a listed weekly strike
+        hedge_strike = self.order_manager.nearest_listed_strike(next_weekly_expiry, option_type, self._round_to_strike(hedge_strike))
         
-        self.logger.info(f"Strategy: New hedge strike for {option_type}: {hedge_strike}")
+        self.logger.info("Strategy: New hedge strike for %s: %s", option_type, hedge_strike)
         
         # Get hedge instrument token
         hedge_token = self.order_manager.get_instrument_token(next_weekly_expiry, hedge_strike, option_type)
         
         if not hedge_token:
-            self.logger.error(f"Strategy: Could not find hedge instrument for expiry {next_weekly_expiry}")
+            self.logger.error("Strategy: Could not find hedge instrument for expiry %s", next_weekly_expiry)
             return
         
         # Place new hedge buy order
@@ -1457,9 +1938,24 @@ class Strategy:
         )
         
         if order_id:
-            self.logger.info(f"Strategy: Replacement hedge buy order placed successfully - {option_type}: {order_id}, quantity: {total_quantity}")
+            self.logger.info("Strategy: Replacement hedge buy order placed successfully - %s: %s, quantity: %s", option_type, order_id, total_quantity)
         else:
-            self.logger.error(f"Strategy: Failed to place replacement hedge buy order for {option_type}")
+            self.logger.error("Strategy: Failed to place replacement hedge buy order for %s", option_type)
+    
+    def _position_strike(self, position):
+        """
+        Get the strike price of a position
+        
+        Args:
+            position: Position dictionary
+            
+        Returns:
+            Strike price, or NaN if it cannot be determined
+        """
+        instrument = self.order_manager.instruments_by_token.get(position['instrument_token'])
+        if instrument:
+            return instrument['strike']
+        return position.get('strike', np.nan)
     
     def _buy_order_exists_at_strike(self, expiry, strike, option_type):
         """
@@ -1473,30 +1969,36 @@ class Strategy:
         Returns:
             True if buy order exists, False otherwise
         """
-        positions = self.order_manager.positions.get('net', [])
+        return (expiry, option_type, strike) in self._get_long_strikes()
+    
+    def _get_long_strikes(self):
+        """
+        Get the set of strikes held long, built once per positions snapshot
         
-        for position in positions:
+        Returns:
+            Set of (expiry, option type, strike) tuples
+        """
+        positions = self.order_manager.positions
+        if self._long_strikes is not None and self._long_strikes_source is positions:
+            return self._long_strikes
+        
+        long_strikes = set()
+        for position in positions.get('net', []):
             # Skip positions with zero or negative quantity
             if position['quantity'] <= 0:
                 continue
             
             # Find instrument details
-            instrument = None
-            for instr in self.order_manager.instruments_cache.values():
-                if instr['instrument_token'] == position['instrument_token']:
-                    instrument = instr
-                    break
+            instrument = self.order_manager.instruments_by_token.get(position['instrument_token'])
             
             if not instrument:
                 continue
             
-            # Check if this is the same strike, expiry, and option type
-            if (instrument['expiry'] == expiry and 
-                instrument['strike'] == strike and 
-                instrument['instrument_type'] == option_type):
-                return True
+            long_strikes.add((instrument['expiry'], instrument['instrument_type'], instrument['strike']))
         
-        return False
+        self._long_strikes = long_strikes
+        self._long_strikes_source = positions
+        return long_strikes
     
     def _adjust_strike_for_conflict(self, strike, adjustment):
         """
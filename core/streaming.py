@@ -3,20 +3,27 @@ import logging
 import pandas as pd
 import datetime
 import time
+import threading
+from operator import itemgetter
 from kiteconnect import KiteTicker
 
+TICK_TOKEN = itemgetter('instrument_token')
+TICK_LAST_PRICE = itemgetter('last_price')
+
 class StreamingService:
-    def __init__(self, kite, logger, instruments=None):
+    def __init__(self, kite, logger, config, instruments=None):
         """
         Initialize the streaming service with KiteConnect instance
         
         Args:
             kite: Authenticated KiteConnect instance
             logger: Logger instance
+            config: Configuration instance
             instruments: List of instrument tokens to subscribe to
         """
         self.kite = kite
         self.logger = logger
+        self.config = config
         self.logger.info("StreamingService: Initializing streaming service")
         
         self.api_key = os.getenv('API_KEY')
@@ -25,11 +32,20 @@ class StreamingService:
         self.ticker = None
         self.instruments = instruments or []
         self.instrument_ltp = {}  # Store latest prices
+        self.mode_by_token = {}  # Streaming mode per instrument; unlisted instruments stream in MODE_LTP
         self.callbacks = {}  # Store callback functions
+        self._tick_callbacks = ()  # (name, callback) pairs iterated on every tick, rebuilt on change
+        self.order_callbacks = {}  # Store order update callback functions
         self.is_connected = False
         self.reconnect_attempts = 0
         self.max_reconnect_attempts = 5
         self.reconnect_interval = 5  # seconds
+        self.max_reconnect_delay = 60  # seconds
+        self._reconnect_timer = None
+        
+        # Set while a connection attempt is in flight so start() is not run twice
+        self._connecting = False
+        self._start_lock = threading.Lock()
         
         self.logger.info(f"StreamingService: Ready to stream data for {len(self.instruments)} instruments")
     
@@ -43,6 +59,12 @@ class StreamingService:
             self.logger.warning("StreamingService: No instruments to subscribe to")
             return False
         
+        with self._start_lock:
+            if self._connecting or self.is_connected:
+                self.logger.info("StreamingService: WebSocket already connected or connecting")
+                return True
+            self._connecting = True
+        
         try:
             self.ticker = KiteTicker(self.api_key, self.access_token)
             
@@ -53,11 +75,13 @@ class StreamingService:
             self.ticker.on_error = self.on_error
             self.ticker.on_reconnect = self.on_reconnect
             self.ticker.on_noreconnect = self.on_noreconnect
+            self.ticker.on_order_update = self.on_order_update
             
-            # Start the connection
-            self.ticker.connect()
+            # Start the connection without blocking the caller
+            self.ticker.connect(threaded=True)
             return True
         except Exception as e:
+            self._connecting = False
             self.logger.error(f"StreamingService: Failed to start WebSocket connection: {str(e)}")
             return False
     
@@ -66,32 +90,68 @@ class StreamingService:
         Stop the WebSocket connection
         """
         self.logger.info("StreamingService: Stopping WebSocket connection")
+        if self._reconnect_timer is not None:
+            self._reconnect_timer.cancel()
+            self._reconnect_timer = None
         if self.ticker:
             self.ticker.close()
             self.is_connected = False
             self.logger.info("StreamingService: WebSocket connection closed")
     
-    def subscribe(self, instruments):
+    def subscribe(self, instruments, mode=KiteTicker.MODE_LTP):
         """
         Subscribe to instruments
         
         Args:
             instruments: List of instrument tokens to subscribe to
+            mode: KiteTicker streaming mode; MODE_LTP unless quotes or depth are needed
         """
         if not instruments:
             self.logger.warning("StreamingService: No instruments to subscribe to")
             return
         
-        self.instruments = instruments
-        self.logger.info(f"StreamingService: Subscribing to {len(instruments)} instruments")
+        if mode != KiteTicker.MODE_LTP:
+            # Upgrade instruments already streamed in a lighter mode; never downgrade
+            upgraded = [i for i in instruments if i in self.instruments and self.mode_by_token.get(i, KiteTicker.MODE_LTP) != mode]
+            if upgraded:
+                self.mode_by_token.update(dict.fromkeys(upgraded, mode))
+                if self.ticker is not None and self.is_connected:
+                    self._subscribe_ticker(upgraded)
         
-        if self.ticker and self.is_connected:
-            try:
-                self.ticker.subscribe(instruments)
-                self.ticker.set_mode(self.ticker.MODE_FULL, instruments)
-                self.logger.info(f"StreamingService: Subscribed to {len(instruments)} instruments")
-            except Exception as e:
-                self.logger.error(f"StreamingService: Failed to subscribe to instruments: {str(e)}")
+        # Only subscribe instruments that are not already streamed
+        new_instruments = [i for i in instruments if i not in self.instruments]
+        if not new_instruments:
+            return
+        
+        self.mode_by_token.update(dict.fromkeys(new_instruments, mode))
+        self.instruments.extend(new_instruments)
+        self.logger.info(f"StreamingService: Subscribing to {len(new_instruments)} instruments")
+        
+        if self.ticker is None:
+            # Connection is opened lazily once there is something to stream
+            self.start()
+        elif self.is_connected:
+            self._subscribe_ticker(new_instruments)
+    
+    def _subscribe_ticker(self, instruments):
+        """
+        Subscribe instruments on the active WebSocket connection
+        
+        Args:
+            instruments: List of instrument tokens to subscribe to
+        """
+        try:
+            self.ticker.subscribe(instruments)
+            
+            # One set_mode call per mode in use
+            by_mode = {}
+            for i in instruments:
+                by_mode.setdefault(self.mode_by_token.get(i, KiteTicker.MODE_LTP), []).append(i)
+            for mode, tokens in by_mode.items():
+                self.ticker.set_mode(mode, tokens)
+            self.logger.info(f"StreamingService: Subscribed to {len(instruments)} instruments")
+        except Exception as e:
+            self.logger.error(f"StreamingService: Failed to subscribe to instruments: {str(e)}")
     
     def unsubscribe(self, instruments):
         """
@@ -105,11 +165,15 @@ class StreamingService:
         
         self.logger.info(f"StreamingService: Unsubscribing from {len(instruments)} instruments")
         
+        # Remove from our instruments list so they are not resubscribed on reconnect
+        removed = set(instruments)
+        self.instruments = [i for i in self.instruments if i not in removed]
+        for i in removed:
+            self.mode_by_token.pop(i, None)
+        
         if self.ticker and self.is_connected:
             try:
-                self.ticker.unsubscribe(instruments)
-                # Remove from our instruments list
-                self.instruments = [i for i in self.instruments if i not in instruments]
+                self.ticker.unsubscribe(list(instruments))
                 self.logger.info(f"StreamingService: Unsubscribed from instruments")
             except Exception as e:
                 self.logger.error(f"StreamingService: Failed to unsubscribe from instruments: {str(e)}")
@@ -123,6 +187,7 @@ class StreamingService:
             callback: Function to be called with ticks data
         """
         self.callbacks[name] = callback
+        self._tick_callbacks = tuple(self.callbacks.items())
         self.logger.info(f"StreamingService: Registered callback '{name}'")
     
     def unregister_callback(self, name):
@@ -134,8 +199,20 @@ class StreamingService:
         """
         if name in self.callbacks:
             del self.callbacks[name]
+            self._tick_callbacks = tuple(self.callbacks.items())
             self.logger.info(f"StreamingService: Unregistered callback '{name}'")
     
+    def register_order_callback(self, name, callback):
+        """
+        Register a callback function to be called when order updates are received
+        
+        Args:
+            name: Name of the callback
+            callback: Function to be called with order update data
+        """
+        self.order_callbacks[name] = callback
+        self.logger.info(f"StreamingService: Registered order callback '{name}'")
+    
     def get_ltp(self, instrument_token):
         """
         Get the last traded price for an instrument
@@ -162,27 +239,38 @@ class StreamingService:
         """
         Callback when ticks are received
         """
-        for tick in ticks:
-            # Update our price cache
-            self.instrument_ltp[tick['instrument_token']] = tick['last_price']
+        # Update our price cache; the key/value extraction runs in C via itemgetter
+        self.instrument_ltp.update(zip(map(TICK_TOKEN, ticks), map(TICK_LAST_PRICE, ticks)))
         
-        # Call registered callbacks
-        for name, callback in self.callbacks.items():
+        # Call registered callbacks from the prebuilt tuple; registration never mutates it mid-dispatch
+        for name, callback in self._tick_callbacks:
             try:
                 callback(ticks)
             except Exception as e:
                 self.logger.error(f"StreamingService: Error in callback '{name}': {str(e)}")
     
+    def on_order_update(self, ws, data):
+        """
+        Callback when an order update is received
+        """
+        for name, callback in self.order_callbacks.items():
+            try:
+                callback(data)
+            except Exception as e:
+                self.logger.error(f"StreamingService: Error in order callback '{name}': {str(e)}")
+    
     def on_connect(self, ws, response):
         """
         Callback when connection is established
         """
         self.is_connected = True
+        self._connecting = False
         self.reconnect_attempts = 0
         self.logger.info("StreamingService: WebSocket connected")
         
         # Subscribe to instruments
-        self.subscribe(self.instruments)
+        if self.instruments:
+            self._subscribe_ticker(self.instruments)
     
     def on_close(self, ws, code, reason):
         """
@@ -209,13 +297,16 @@ class StreamingService:
         Callback when reconnection fails
         """
         self.logger.error("StreamingService: WebSocket failed to reconnect, max attempts reached")
+        self._connecting = False
         
-        # Try to reconnect manually after some time
+        # Try to reconnect manually with exponential backoff, without blocking the WebSocket thread
         if self.reconnect_attempts < self.max_reconnect_attempts:
+            delay = min(self.reconnect_interval * (2 ** self.reconnect_attempts), self.max_reconnect_delay)
             self.reconnect_attempts += 1
-            self.logger.info(f"StreamingService: Manual reconnect attempt {self.reconnect_attempts} in {self.reconnect_interval} seconds")
-            time.sleep(self.reconnect_interval)
-            self.start()
+            self.logger.info(f"StreamingService: Manual reconnect attempt {self.reconnect_attempts} in {delay} seconds")
+            self._reconnect_timer = threading.Timer(delay, self.start)
+            self._reconnect_timer.daemon = True
+            self._reconnect_timer.start()
         else:
             self.logger.error("StreamingService: Max manual reconnect attempts reached, giving up")
     
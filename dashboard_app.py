@@ -0,0 +1,37 @@
+import os
+import sys
+import streamlit as st
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Import modules
+from core.bootstrap import get_components
+from utils.logger import Logger
+from utils.dashboard import run_dashboard
+from config import Config
+
+@st.cache_resource
+def load_components():
+    """
+    Build the trading components once per dashboard server; Streamlit reruns
+    this script on every interaction
+    
+    Returns:
+        Tuple of (kite, logger, config, order_manager, risk_manager, strategy)
+    """
+    # Create logger
+    logger = Logger().get_logger()
+    
+    # Load configuration
+    config = Config()
+    
+    # Authenticate with the access token passed in by the application and
+    # reuse the instruments it downloaded
+    components = get_components(logger, config, streaming=False)
+    
+    return (components.kite, logger, config, components.order_manager,
+            components.risk_manager, components.strategy)
+
+# Run dashboard
+run_dashboard(*load_components())
@@ -6,6 +6,7 @@ import datetime
 import schedule
 import threading
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from kiteconnect import KiteConnect
 
@@ -13,17 +14,19 @@ from kiteconnect import KiteConnect
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Import modules
-from auth.kite_auth import KiteAuth
-from core.strategy import Strategy
-from core.order_manager import OrderManager
-from core.expiry_manager import ExpiryManager
-from core.risk_manager import RiskManager
-from core.streaming import StreamingService
+from core.bootstrap import get_components
+from core.strategy import NIFTY_SPOT_TOKEN
 from utils.logger import Logger
 from utils.dashboard import run_dashboard
 from utils.notification import NotificationManager
 from config import Config
 
+# Longest the scheduler sleeps at once, so newly added jobs are picked up
+SCHEDULER_MAX_SLEEP = 30
+
+# Minimum seconds between tick-triggered strategy runs
+TICK_RUN_MIN_INTERVAL = 30
+
 class Application:
     def __init__(self):
         """
@@ -37,42 +40,38 @@ class Application:
         self.config = Config()
         self.logger.info("Application: Configuration loaded")
         
-        # Authenticate with Kite
-        self.kite_auth = KiteAuth(self.logger)
-        self.kite = self.kite_auth.authenticate()
-        self.logger.info("Application: Authentication completed")
-        
-        # Initialize components
-        self.order_manager = OrderManager(self.kite, self.logger, self.config)
-        
-        # Download instruments data
-        self.order_manager.download_instruments()
-        self.expiry_manager = ExpiryManager(self.kite, self.logger, self.config)
-        self.risk_manager = RiskManager(self.kite, self.logger, self.config, self.order_manager)
-        self.streaming_service = StreamingService(self.kite, self.logger, self.config)
+        # Authenticate and build the trading components
+        components = get_components(self.logger, self.config)
+        self.kite_auth = components.kite_auth
+        self.kite = components.kite
+        self.order_manager = components.order_manager
+        self.expiry_manager = components.expiry_manager
+        self.risk_manager = components.risk_manager
+        self.streaming_service = components.streaming_service
+        self.strategy = components.strategy
         self.notification_manager = NotificationManager(self.logger, self.config)
         
-        # Initialize strategy
-        self.strategy = Strategy(
-            self.kite,
-            self.logger,
-            self.config,
-            self.order_manager,
-            self.expiry_manager,
-            self.risk_manager,
-            self.streaming_service
-        )
-        
         self.logger.info("Application: All components initialized")
+        
+        # Pool shared with the strategy and risk manager for their refreshes
+        self._executor = components.executor
+        
+        # Notifications get their own worker so a slow send never delays a refresh
+        self._notify_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="notify")
 
         # Send startup notification
-        self.notification_manager.send_notification("NSE Trading application started", "INFO")
+        self._notify("NSE Trading application started", "INFO")
 
-        # Initialize dashboard thread
-        self.dashboard_thread = None
+        # Initialize dashboard process
+        self.dashboard_process = None
         
         # Initialize shutdown flag
         self.shutdown_flag = False
+        
+        # Set on shutdown or a tick-triggered run to wake the scheduler immediately
+        self._wake_event = threading.Event()
+        self._run_requested = False
+        self._last_tick_run = None
     
     def run(self):
         """
@@ -80,13 +79,14 @@ class Application:
         """
         self.logger.info("Application: Starting application")
         
-        # Start streaming service
+        # Start streaming service and react to spot ticks between scheduled runs
+        self.streaming_service.register_callback("application", self._on_ticks)
         self.streaming_service.start()
         
         # Schedule strategy execution
         self._schedule_strategy()
         
-        # Start dashboard in a separate thread
+        # Start dashboard in a separate process
         self._start_dashboard()
         
         # Run the scheduler
@@ -96,7 +96,7 @@ class Application:
         """
         Schedule strategy execution
         """
-        self.logger.info(f"Application: Scheduling strategy execution every {self.config.run_interval} minutes")
+        self.logger.info("Application: Scheduling strategy execution every %s minutes", self.config.run_interval)
         
         # Schedule strategy execution
         schedule.every(self.config.run_interval).minutes.do(self._execute_strategy)
@@ -119,9 +119,27 @@ class Application:
             
             return result
         except Exception as e:
-            self.logger.error(f"Application: Error executing strategy: {str(e)}")
+            self.logger.error("Application: Error executing strategy: %s", e)
             return False
     
+    def _on_ticks(self, ticks):
+        """
+        Wake the scheduler to run the strategy when spot enters a hedge touch band
+        
+        Args:
+            ticks: Ticks received by the streaming service
+        """
+        if self._run_requested:
+            return
+        
+        if self._last_tick_run is not None and time.monotonic() - self._last_tick_run < TICK_RUN_MIN_INTERVAL:
+            return
+        
+        spot = self.streaming_service.get_ltp(NIFTY_SPOT_TOKEN)
+        if spot is not None and self.strategy.spot_touches_hedge(spot):
+            self._run_requested = True
+            self._wake_event.set()
+    
     def _run_scheduler(self):
         """
         Run the scheduler
@@ -130,106 +148,96 @@ class Application:
         
         try:
             while not self.shutdown_flag:
+                # Sleep until the next job is due instead of polling every second
+                idle_seconds = schedule.idle_seconds()
+                if idle_seconds is None:
+                    self.logger.warning("Application: No scheduled jobs, stopping scheduler")
+                    break
+                if idle_seconds > 0:
+                    self._wake_event.wait(timeout=min(idle_seconds, SCHEDULER_MAX_SLEEP))
+                    self._wake_event.clear()
+                
+                if self.shutdown_flag:
+                    break
+                
+                # Run early when the tick callback saw spot reach a hedge
+                if self._run_requested:
+                    self.logger.info("Application: Spot price reached a hedge strike, executing strategy early")
+                    self._last_tick_run = time.monotonic()
+                    self.strategy.force_touch_check()
+                    self._execute_strategy()
+                    self._run_requested = False
+                
                 schedule.run_pending()
-                time.sleep(1)
         except KeyboardInterrupt:
             self.logger.info("Application: Keyboard interrupt received, shutting down")
             self.shutdown()
         except Exception as e:
-            self.logger.error(f"Application: Error in scheduler: {str(e)}")
+            self.logger.error("Application: Error in scheduler: %s", e)
             self.shutdown()
     
     def _start_dashboard(self):
         """
-        Start the Streamlit dashboard in a separate thread
+        Start the Streamlit dashboard in a separate process
         """
         self.logger.info("Application: Starting dashboard")
         
-        # Create a function to run the dashboard
-        def run_dashboard_process():
-            try:
-                # Create dashboard script
-                dashboard_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dashboard_app.py")
-                
-                with open(dashboard_script, "w") as f:
-                    f.write("""
-import os
-import sys
-import streamlit as st
-
-# Add project root to path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
-# Import modules
-from auth.kite_auth import KiteAuth
-from core.order_manager import OrderManager
-from core.expiry_manager import ExpiryManager
-from core.risk_manager import RiskManager
-from core.strategy import Strategy
-from utils.logger import Logger
-from utils.dashboard import run_dashboard
-from config import Config
-
-# Create logger
-logger = Logger().get_logger()
-
-# Load configuration
-config = Config()
-
-# Authenticate with Kite
-kite_auth = KiteAuth(logger)
-kite = kite_auth.authenticate()
-
-# Initialize components
-order_manager = OrderManager(kite, logger, config)
-expiry_manager = ExpiryManager(kite, logger, config)
-risk_manager = RiskManager(kite, logger, config, order_manager)
-
-# Initialize strategy
-strategy = Strategy(
-    kite,
-    logger,
-    config,
-    order_manager,
-    expiry_manager,
-    risk_manager,
-    None  # No streaming service in dashboard
-)
-
-# Run dashboard
-run_dashboard(kite, logger, config, order_manager, risk_manager, strategy)
-                    """)
-                
-                # Run the dashboard using streamlit
-                subprocess.run(["streamlit", "run", dashboard_script])
-            except Exception as e:
-                self.logger.error(f"Application: Error starting dashboard: {str(e)}")
-        
-        # Start the dashboard in a separate thread
-        self.dashboard_thread = threading.Thread(target=run_dashboard_process)
-        self.dashboard_thread.daemon = True
-        self.dashboard_thread.start()
+        try:
+            # Dashboard entry point shipped alongside this file
+            dashboard_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dashboard_app.py")
+            
+            # Hand the current session to the dashboard so it does not log in again
+            env = dict(os.environ, ACCESS_TOKEN=self.kite_auth.access_token or "")
+            
+            # Streamlit runs in its own process; no thread is needed to wait on it
+            self.dashboard_process = subprocess.Popen(["streamlit", "run", dashboard_script], env=env)
+        except Exception as e:
+            self.logger.error("Application: Error starting dashboard: %s", e)
+            return
         
         self.logger.info("Application: Dashboard started")
     
+    def _notify(self, message, level="INFO"):
+        """
+        Send a notification on its own worker so callers do not wait on the network
+        
+        Args:
+            message: Message to send
+            level: Message level (INFO, WARNING, ERROR, CRITICAL)
+            
+        Returns:
+            Future for the send_notification result
+        """
+        return self._notify_executor.submit(self.notification_manager.send_notification, message, level)
+    
     def shutdown(self):
         """
         Shutdown the application
         """
         self.logger.info("Application: Shutting down")
         
-        # Set shutdown flag
+        # Set shutdown flag and wake the scheduler
         self.shutdown_flag = True
+        self._wake_event.set()
         
         # Stop streaming service
         self.streaming_service.stop()
         
-        # Wait for dashboard thread to finish
-        if self.dashboard_thread and self.dashboard_thread.is_alive():
-            self.dashboard_thread.join(timeout=5)
-
-        # Send shutdown notification
-        self.notification_manager.send_notification("NSE Trading application shut down", "INFO")
+        # Wait for in-flight orders to be acknowledged
+        self.order_manager.shutdown()
+        
+        # Stop the dashboard process
+        if self.dashboard_process and self.dashboard_process.poll() is None:
+            self.dashboard_process.terminate()
+            try:
+                self.dashboard_process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.dashboard_process.kill()
+
+        # Send shutdown notification and wait for pending background work
+        self._notify("NSE Trading application shut down", "INFO")
+        self._notify_executor.shutdown(wait=True)
+        self._executor.shutdown(wait=True)
 
         self.logger.info("Application: Shutdown complete")
 
@@ -23,6 +23,7 @@ def install_packages():
         'python-dotenv',
         'pandas',
         'numpy',
+        'numba',
         'scipy',
         'schedule',
         'pytest',
@@ -35,6 +36,17 @@ def install_packages():
     
     print("All packages installed successfully.")
 
+def precompile_kernels():
+    """Compile numeric kernels ahead of time so the first trading cycle does not pay for JIT"""
+    print("Precompiling numeric kernels...")
+    result = subprocess.run([sys.executable, '-c', 'import core.kernels'], cwd='NSE_trading',
+                            capture_output=True, text=True)
+    
+    if result.returncode == 0:
+        print("Numeric kernels compiled and cached.")
+    else:
+        print(f"Could not precompile numeric kernels, they will be compiled on first use: {result.stderr}")
+
 def create_env_file():
     """Create .env file if it doesn't exist"""
     env_path = os.path.join('NSE_trading', 'auth', '.env')
@@ -144,6 +156,9 @@ def main():
     # Install required packages
     install_packages()
     
+    # Compile numeric kernels into the on-disk cache
+    precompile_kernels()
+    
     # Create .env file
     create_env_file()
     
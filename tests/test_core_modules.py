@@ -1,17 +1,27 @@
 import os
 import sys
 import unittest
+import logging
+import threading
+import time
+import tempfile
 from unittest.mock import MagicMock, patch
 import datetime
+import pandas as pd
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import modules
 from core.order_manager import OrderManager
-from core.expiry_manager import ExpiryManager
+from core.expiry_manager import ExpiryManager, expiry_tag
 from core.risk_manager import RiskManager
-from utils.logger import Logger
+from core.streaming import StreamingService
+from core.bootstrap import get_components
+from kiteconnect import KiteTicker
+import numpy as np
+from core.kernels import compute_strikes, hedge_strikes, profitable_leg_indices, round_to_strike, round_to_strike_50, round_to_tick
+from utils.logger import Logger, DuplicateFilter
 from config import Config
 
 class TestOrderManager(unittest.TestCase):
@@ -56,6 +66,13 @@ class TestOrderManager(unittest.TestCase):
         # Mock kite.instruments
         self.kite.instruments.return_value = self.sample_instruments
         
+        # Keep the instruments dump written by download_instruments out of the repo
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        csv_patch = patch('core.order_manager.INSTRUMENTS_CSV', os.path.join(temp_dir.name, 'instruments.csv'))
+        csv_patch.start()
+        self.addCleanup(csv_patch.stop)
+        
         # Create OrderManager instance
         self.order_manager = OrderManager(self.kite, self.logger, self.config)
         
@@ -77,6 +94,119 @@ class TestOrderManager(unittest.TestCase):
         self.kite.instruments.assert_called_once_with("NFO")
         self.assertEqual(len(self.order_manager.instruments_cache), 2)
     
+    def test_load_instruments_from_csv(self):
+        """Test loading instruments from CSV with parsed expiry dates"""
+        csv_df = pd.DataFrame([
+            {'instrument_token': 12345, 'name': 'NIFTY', 'expiry': '2025-04-24', 'strike': 18000, 'instrument_type': 'CE'},
+            {'instrument_token': 256265, 'name': 'NIFTY 50', 'expiry': float('nan'), 'strike': 0, 'instrument_type': 'EQ'}
+        ])
+        with patch('os.path.exists', return_value=True), patch('pandas.read_csv', return_value=csv_df):
+            instruments = self.order_manager.load_instruments_from_csv()
+        
+        # Verify
+        self.assertEqual(instruments[0]['expiry'], datetime.datetime(2025, 4, 24))
+        self.assertIs(type(instruments[0]['expiry']), datetime.datetime)
+        self.assertIs(instruments[1]['expiry'], pd.NaT)
+    
+    def test_load_instruments_from_csv_by_name(self):
+        """Test loading only one underlying from the instruments CSV"""
+        csv_df = pd.DataFrame([
+            {'instrument_token': 12345, 'name': 'NIFTY', 'expiry': '2025-04-24', 'strike': 18000, 'instrument_type': 'CE'},
+            {'instrument_token': 23456, 'name': 'BANKNIFTY', 'expiry': '2025-04-24', 'strike': 48000, 'instrument_type': 'CE'}
+        ])
+        with patch('os.path.exists', return_value=True), patch('pandas.read_csv', return_value=csv_df):
+            instruments = self.order_manager.load_instruments_from_csv(name='NIFTY')
+        
+        # Verify
+        self.assertEqual([i['instrument_token'] for i in instruments], [12345])
+    
+    def test_api_call_with_retry_backoff(self):
+        """Test that API retries back off exponentially up to the cap"""
+        self.config.max_retries = 5
+        self.config.retry_delay = 2
+        self.config.max_retry_delay = 5
+        func = MagicMock(side_effect=Exception("timeout"))
+        
+        with patch('core.order_manager.time.sleep') as mock_sleep:
+            result = self.order_manager._api_call_with_retry(func)
+        
+        # Verify
+        self.assertIsNone(result)
+        self.assertEqual(func.call_count, 5)
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [2, 4, 5, 5])
+    
+    def test_instruments_by_token(self):
+        """Test indexing instruments cache by instrument token"""
+        with patch.object(self.order_manager, 'load_instruments_from_csv', return_value=self.sample_instruments):
+            self.order_manager._init_instruments_cache()
+        
+        # Verify
+        self.assertEqual(len(self.order_manager.instruments_by_token), 2)
+        self.assertEqual(self.order_manager.instruments_by_token[67890]['tradingsymbol'], 'NIFTY25APR18000PE')
+        self.assertEqual(self.order_manager.instruments_by_token[67890]['expiry_ord'], datetime.date(2025, 4, 25).toordinal())
+    
+    def test_get_instrument_token_from_index(self):
+        """Test getting instrument token from the (expiry, strike, type) index"""
+        with patch.object(self.order_manager, 'load_instruments_from_csv', return_value=self.sample_instruments):
+            self.order_manager._init_instruments_cache()
+        
+        # Clear string-keyed cache to make sure the index is used
+        self.order_manager.instruments_cache = {}
+        
+        # Verify lookups with datetime, date and float strike
+        self.assertEqual(self.order_manager.get_instrument_token(datetime.datetime(2025, 4, 25), 18000, "CE"), 12345)
+        self.assertEqual(self.order_manager.get_instrument_token(datetime.date(2025, 4, 25), 18000.0, "PE"), 67890)
+    
+    def test_find_instruments(self):
+        """Test filtering the structured instruments array"""
+        with patch.object(self.order_manager, 'load_instruments_from_csv', return_value=self.sample_instruments):
+            self.order_manager._init_instruments_cache()
+        
+        # Filter by expiry and type
+        result = self.order_manager.find_instruments(datetime.date(2025, 4, 25), "PE")
+        self.assertEqual(len(result), 1)
+        self.assertEqual(int(result['token'][0]), 67890)
+        
+        # Filter by strike range
+        self.assertEqual(len(self.order_manager.find_instruments(min_strike=17500, max_strike=18500)), 2)
+        self.assertEqual(len(self.order_manager.find_instruments(min_strike=18050)), 0)
+    
+    def test_nearest_listed_strike(self):
+        """Test snapping a strike to the nearest listed strike"""
+        instruments = [
+            dict(self.sample_instruments[0], instrument_token=10000 + strike, strike=strike, tradingsymbol=f"NIFTY25APR{strike}CE")
+            for strike in [17900, 18000, 18200]
+        ]
+        with patch.object(self.order_manager, 'load_instruments_from_csv', return_value=instruments):
+            self.order_manager._init_instruments_cache()
+        
+        expiry = datetime.datetime(2025, 4, 25)
+        self.assertEqual(self.order_manager.nearest_listed_strike(expiry, "CE", 18050), 18000)
+        self.assertEqual(self.order_manager.nearest_listed_strike(expiry, "CE", 18150), 18200)
+        self.assertEqual(self.order_manager.nearest_listed_strike(expiry, "CE", 19000), 18200)
+        self.assertEqual(self.order_manager.nearest_listed_strike(expiry, "CE", 17000), 17900)
+        
+        # No listed strikes for the expiry/type
+        self.assertEqual(self.order_manager.nearest_listed_strike(expiry, "PE", 18050), 18050)
+    
+    def test_listed_strikes_from(self):
+        """Test walking listed strikes up and down from a starting strike"""
+        instruments = [
+            dict(self.sample_instruments[0], instrument_token=10000 + strike, strike=strike, tradingsymbol=f"NIFTY25APR{strike}CE")
+            for strike in [17900, 18000, 18100, 18200]
+        ]
+        with patch.object(self.order_manager, 'load_instruments_from_csv', return_value=instruments):
+            self.order_manager._init_instruments_cache()
+        
+        expiry = datetime.datetime(2025, 4, 25)
+        self.assertEqual(self.order_manager.listed_strikes_from(expiry, "CE", 18000, 2), [18000, 18100])
+        self.assertEqual(self.order_manager.listed_strikes_from(expiry, "CE", 18050, 5), [18100, 18200])
+        self.assertEqual(self.order_manager.listed_strikes_from(expiry, "CE", 18050, 5, descending=True), [18000, 17900])
+        self.assertEqual(self.order_manager.listed_strikes_from(expiry, "CE", 18100, 2, descending=True), [18100, 18000])
+        
+        # No listed strikes for the expiry/type
+        self.assertIsNone(self.order_manager.listed_strikes_from(expiry, "PE", 18000, 5))
+    
     def test_get_instrument(self):
         """Test getting instrument from cache"""
         # Get existing instrument
@@ -130,6 +260,65 @@ class TestOrderManager(unittest.TestCase):
         self.kite.positions.assert_called_once()
         self.assertEqual(len(result['net']), 1)
         self.assertEqual(self.order_manager.positions, result)
+        
+        # Verify precomputed DataFrame columns
+        positions_df = self.order_manager.positions_df
+        self.assertEqual(positions_df['opt_type'].tolist(), ['CE'])
+        self.assertEqual(positions_df['is_ce'].tolist(), [True])
+        self.assertEqual(positions_df['is_pe'].tolist(), [False])
+        self.assertEqual(positions_df['expiry_tag'].tolist(), ['25APR'])
+        self.assertEqual(positions_df['parsed_strike'].tolist(), [18000])
+        self.assertEqual(list(self.order_manager.positions_by_expiry_type), [('25APR', 'CE')])
+        self.assertEqual(positions_df['is_short'].tolist(), [True])
+    
+    def test_order_update_marks_dirty(self):
+        """Test that order updates mark positions and orders as stale"""
+        self.kite.positions.return_value = {'net': []}
+        self.kite.orders.return_value = []
+        
+        # Refresh clears the flags
+        self.order_manager.refresh_positions()
+        self.order_manager.refresh_orders()
+        self.assertFalse(self.order_manager.positions_dirty)
+        self.assertFalse(self.order_manager.orders_dirty)
+        
+        # Order update sets them again
+        self.order_manager.on_order_update({'order_id': 'order123', 'status': 'COMPLETE'})
+        self.assertTrue(self.order_manager.positions_dirty)
+        self.assertTrue(self.order_manager.orders_dirty)
+    
+    def test_order_update_during_refresh_keeps_dirty(self):
+        """Test that an order update arriving while a refresh is in flight is not lost"""
+        def positions_with_update():
+            self.order_manager.on_order_update({'order_id': 'order123', 'status': 'COMPLETE'})
+            return {'net': []}
+        
+        def orders_with_update():
+            self.order_manager.on_order_update({'order_id': 'order123', 'status': 'COMPLETE'})
+            return []
+        
+        self.kite.positions.side_effect = positions_with_update
+        self.kite.orders.side_effect = orders_with_update
+        
+        self.order_manager.refresh_positions()
+        self.assertTrue(self.order_manager.positions_dirty)
+        
+        self.order_manager.orders_dirty = False
+        self.order_manager.refresh_orders()
+        self.assertTrue(self.order_manager.orders_dirty)
+    
+    def test_refresh_failure_keeps_dirty(self):
+        """Test that a failed refresh leaves positions and orders marked stale"""
+        self.kite.positions.side_effect = Exception("timeout")
+        self.kite.orders.side_effect = Exception("timeout")
+        
+        # Call methods
+        self.assertIsNone(self.order_manager.refresh_positions())
+        self.assertIsNone(self.order_manager.refresh_orders())
+        
+        # Verify
+        self.assertTrue(self.order_manager.positions_dirty)
+        self.assertTrue(self.order_manager.orders_dirty)
     
     def test_refresh_orders(self):
         """Test refreshing orders"""
@@ -190,6 +379,56 @@ class TestOrderManager(unittest.TestCase):
         self.assertEqual(self.kite.place_order.call_count, 2)
         self.assertEqual(result, 'order456')
     
+    def test_place_order_async(self):
+        """Test placing an order asynchronously"""
+        # Mock kite.place_order
+        self.kite.place_order.return_value = 'order123'
+        
+        # Call method
+        future = self.order_manager.place_order_async(
+            instrument_token=12345,
+            transaction_type="SELL",
+            quantity=50,
+            order_type="MARKET",
+            tag="test_order"
+        )
+        
+        # Verify
+        self.assertEqual(future.result(timeout=5), 'order123')
+        self.kite.place_order.assert_called_once()
+    
+    def test_order_rate_limit(self):
+        """Test orders beyond the per-second limit wait for the window to roll over"""
+        self.config.max_orders_per_second = 2
+        
+        with patch('core.order_manager.time.monotonic', side_effect=[0.0, 0.1, 0.2, 1.0]), \
+             patch('core.order_manager.time.sleep') as sleep:
+            for _ in range(3):
+                self.order_manager._wait_for_order_slot()
+        
+        # The third order waits until the first leaves the one-second window
+        sleep.assert_called_once()
+        self.assertAlmostEqual(sleep.call_args[0][0], 0.8)
+        self.assertEqual(list(self.order_manager._order_times), [0.1, 1.0])
+    
+    def test_place_basket(self):
+        """Test basket orders are submitted concurrently and results keep input order"""
+        # Each order blocks until the other has been submitted
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def place_order(variety, **params):
+            barrier.wait()
+            return f"order_{params['transaction_type']}"
+        
+        self.kite.place_order.side_effect = place_order
+        
+        result = self.order_manager.place_basket([
+            {"instrument_token": 12345, "transaction_type": "BUY", "quantity": 50},
+            {"instrument_token": 67890, "transaction_type": "SELL", "quantity": 50}
+        ])
+        
+        self.assertEqual(result, ["order_BUY", "order_SELL"])
+    
     def test_modify_order(self):
         """Test modifying an order"""
         # Mock kite.modify_order
@@ -308,6 +547,27 @@ class TestOrderManager(unittest.TestCase):
         self.kite.ltp.assert_called_once_with([12345])
         self.assertIsNone(result)
     
+    def test_prefetch_ltps(self):
+        """Test prefetching LTPs in a single call"""
+        # Mock kite.ltp
+        self.kite.ltp.return_value = {
+            'NSE:NIFTY 50': {'instrument_token': 256265, 'last_price': 18000},
+            '12345': {'instrument_token': 12345, 'last_price': 100}
+        }
+        
+        # Call method
+        self.order_manager.prefetch_ltps(['NSE:NIFTY 50', 12345])
+        
+        # Verify cached prices are served without another API call
+        self.kite.ltp.assert_called_once_with(['NSE:NIFTY 50', 12345])
+        self.assertEqual(self.order_manager.ltp_cache['NSE:NIFTY 50'], 18000)
+        self.assertEqual(self.order_manager.get_ltp(12345), 100)
+        self.kite.ltp.assert_called_once()
+        
+        # Verify cache invalidation
+        self.order_manager.clear_ltp_cache()
+        self.assertEqual(self.order_manager.ltp_cache, {})
+    
     def test_get_margin_used(self):
         """Test getting margin used"""
         # Mock kite.margins
@@ -365,6 +625,29 @@ class TestOrderManager(unittest.TestCase):
         self.assertEqual(len(result), 2)
         self.assertEqual(result[0]['order_id'], 'order123')
         self.assertEqual(result[1]['order_id'], 'order456')
+        
+        # Replacing the orders rebuilds the token index
+        self.order_manager.orders = {'order999': {'order_id': 'order999', 'instrument_token': 12345, 'status': 'OPEN'}}
+        result = self.order_manager.get_orders_for_instrument(12345)
+        self.assertEqual([order['order_id'] for order in result], ['order999'])
+    
+    def test_get_position_for_instrument(self):
+        """Test getting a position through the token index"""
+        self.order_manager.positions = {
+            'net': [
+                {'tradingsymbol': 'NIFTY25APR18000CE', 'instrument_token': 12345, 'quantity': -75},
+                {'tradingsymbol': 'NIFTY25APR18000PE', 'instrument_token': 67890, 'quantity': -75}
+            ]
+        }
+        
+        # Verify
+        self.assertEqual(self.order_manager.get_position_for_instrument(67890)['tradingsymbol'], 'NIFTY25APR18000PE')
+        self.assertIsNone(self.order_manager.get_position_for_instrument(11111))
+        
+        # Refreshed positions replace the index
+        self.order_manager.positions = {'net': [{'tradingsymbol': 'NIFTY25APR18100CE', 'instrument_token': 11111, 'quantity': 75}]}
+        self.assertEqual(self.order_manager.get_position_for_instrument(11111)['quantity'], 75)
+        self.assertIsNone(self.order_manager.get_position_for_instrument(67890))
 
 class TestExpiryManager(unittest.TestCase):
     """Test cases for the ExpiryManager class"""
@@ -447,6 +730,19 @@ class TestExpiryManager(unittest.TestCase):
             self.sample_instruments[4]['expiry']
         ]
     
+    def test_init_with_preloaded_instruments(self):
+        """Test expiry dates are read from instruments passed in instead of downloaded"""
+        self.kite.instruments.reset_mock()
+        
+        expiry_manager = ExpiryManager(self.kite, self.logger, self.config, instruments=self.sample_instruments)
+        
+        # Verify
+        self.kite.instruments.assert_not_called()
+        self.assertEqual(
+            len(expiry_manager.monthly_expiry_dates) + len(expiry_manager.weekly_expiry_dates),
+            len({i['expiry'] for i in self.sample_instruments})
+        )
+    
     def test_get_far_month_expiry(self):
         """Test getting far month expiry"""
         # Call method
@@ -463,6 +759,21 @@ class TestExpiryManager(unittest.TestCase):
         # Verify - should return the 1st weekly expiry
         self.assertEqual(result, self.sample_instruments[0]['expiry'])
     
+    def test_expiry_resolved_once_per_day(self):
+        """Test that far month and weekly expiries are reused within a day"""
+        far = self.expiry_manager.get_far_month_expiry()
+        weekly = self.expiry_manager.get_next_weekly_expiry()
+        
+        # Emptying the lists shows the second lookups come from the daily cache
+        self.expiry_manager.weekly_expiry_dates = []
+        self.expiry_manager.monthly_expiry_dates = []
+        self.assertIs(self.expiry_manager.get_far_month_expiry(), far)
+        self.assertIs(self.expiry_manager.get_next_weekly_expiry(), weekly)
+        
+        # A new day resolves again
+        self.expiry_manager._resolved_for_date = datetime.date(2000, 1, 1)
+        self.assertIsNone(self.expiry_manager.get_next_weekly_expiry())
+    
     def test_is_expiry_day(self):
         """Test checking if today is an expiry day"""
         # Mock today as not an expiry day
@@ -521,6 +832,63 @@ class TestExpiryManager(unittest.TestCase):
         
         # Verify
         self.assertFalse(result)
+    
+    def test_expiry_tag(self):
+        """Test formatting the tradingsymbol tag for an expiry"""
+        self.assertEqual(expiry_tag(datetime.date(2025, 4, 24)), '25APR')
+        self.assertEqual(expiry_tag(datetime.datetime(2025, 4, 24, 15, 30)), '25APR')
+
+class TestBootstrap(unittest.TestCase):
+    """Test cases for building the shared components"""
+    
+    def setUp(self):
+        """Set up test environment before each test"""
+        get_components.cache_clear()
+        self.addCleanup(get_components.cache_clear)
+        self.logger = MagicMock()
+        self.config = Config()
+    
+    def test_get_components_shares_instruments(self):
+        """Test the downloaded instruments are reused by the expiry manager and components are built once"""
+        with patch('core.bootstrap.KiteAuth'), \
+                patch('core.bootstrap.OrderManager') as order_manager_cls, \
+                patch('core.bootstrap.ExpiryManager') as expiry_manager_cls, \
+                patch('core.bootstrap.RiskManager') as risk_manager_cls, \
+                patch('core.bootstrap.StreamingService'), \
+                patch('core.bootstrap.Strategy') as strategy_cls:
+            order_manager_cls.return_value.download_instruments.return_value = ['instrument']
+            
+            components = get_components(self.logger, self.config)
+            
+            # Verify
+            self.assertIs(get_components(self.logger, self.config), components)
+            order_manager_cls.assert_called_once()
+            self.assertEqual(expiry_manager_cls.call_args.kwargs['instruments'], ['instrument'])
+            self.assertIsNotNone(components.streaming_service)
+            
+            # The strategy and risk manager share the application pool
+            self.assertIs(risk_manager_cls.call_args.kwargs['executor'], components.executor)
+            self.assertIs(strategy_cls.call_args.kwargs['executor'], components.executor)
+            components.executor.shutdown()
+    
+    def test_get_components_without_streaming(self):
+        """Test read-only consumers reuse the cached instruments and skip streaming"""
+        with patch('core.bootstrap.KiteAuth'), \
+                patch('core.bootstrap.OrderManager') as order_manager_cls, \
+                patch('core.bootstrap.ExpiryManager') as expiry_manager_cls, \
+                patch('core.bootstrap.RiskManager'), \
+                patch('core.bootstrap.StreamingService') as streaming_cls, \
+                patch('core.bootstrap.Strategy'):
+            order_manager_cls.return_value.instruments_cache = {'key': 'instrument'}
+            
+            components = get_components(self.logger, self.config, streaming=False)
+            
+            # Verify
+            order_manager_cls.return_value.download_instruments.assert_not_called()
+            self.assertEqual(expiry_manager_cls.call_args.kwargs['instruments'], ['instrument'])
+            streaming_cls.assert_not_called()
+            self.assertIsNone(components.streaming_service)
+            self.assertIsNone(components.executor)
 
 class TestRiskManager(unittest.TestCase):
     """Test cases for the RiskManager class"""
@@ -585,6 +953,30 @@ class TestRiskManager(unittest.TestCase):
         # Verify
         self.assertTrue(result)
     
+    def test_get_monthly_pnl(self):
+        """Test monthly PnL sums positions and keeps only completed orders from this month"""
+        self.order_manager.refresh_positions.return_value = {
+            "net": [
+                {"tradingsymbol": "NIFTY25APR18000CE", "unrealised_pnl": 1000, "realised_pnl": 200},
+                {"tradingsymbol": "NIFTY25APR17000PE", "unrealised_pnl": -300, "realised_pnl": 50}
+            ]
+        }
+        now = datetime.datetime.now()
+        last_month = now.replace(day=1) - datetime.timedelta(days=1)
+        self.order_manager.refresh_orders.return_value = [
+            {"order_id": "1", "status": "COMPLETE", "order_timestamp": now},
+            {"order_id": "2", "status": "REJECTED", "order_timestamp": now},
+            {"order_id": "3", "status": "COMPLETE", "order_timestamp": last_month},
+            {"order_id": "4", "status": "COMPLETE"}
+        ]
+        
+        result = self.risk_manager.get_monthly_pnl()
+        
+        self.assertEqual(result['unrealized_pnl'], 700)
+        self.assertEqual(result['realized_pnl'], 250)
+        self.assertEqual(result['total_pnl'], 950)
+        self.assertEqual([o['order_id'] for o in result['monthly_orders']], ["1"])
+
     def test_check_profit_exit_condition(self):
         """Test checking profit exit condition"""
         # Mock positions with profit below threshold
@@ -625,6 +1017,22 @@ class TestRiskManager(unittest.TestCase):
         # Verify
         self.assertTrue(result)
     
+    def test_check_profit_exit_conditions(self):
+        """Test checking profit exit conditions for both option types at once"""
+        self.order_manager.positions_df = OrderManager.build_positions_df([
+            {"tradingsymbol": "NIFTY25APR18000CE", "quantity": -50, "sell_price": 100, "instrument_token": 12345},
+            {"tradingsymbol": "NIFTY25APR18000PE", "quantity": -50, "sell_price": 100, "instrument_token": 67890},
+            {"tradingsymbol": "NIFTY25APR19000CE", "quantity": 50, "sell_price": 0, "instrument_token": 11111}
+        ])
+        self.order_manager.get_ltp.side_effect = lambda token: {12345: 50, 67890: 98, 11111: 10}[token]
+        
+        # Call method
+        result = self.risk_manager.check_profit_exit_conditions()
+        
+        # Verify: CE profit 2500 points, PE profit 100 points
+        self.assertEqual(result, {"CE": True, "PE": False})
+        self.assertEqual(self.order_manager.get_ltp.call_count, 2)
+    
     def test_calculate_position_profit_percentage(self):
         """Test calculating position profit percentage"""
         # Test short position with profit
@@ -724,5 +1132,156 @@ class TestRiskManager(unittest.TestCase):
         # Verify
         self.assertTrue(result)
 
+class TestStreamingService(unittest.TestCase):
+    """Test cases for the StreamingService class"""
+    
+    def setUp(self):
+        """Set up test environment before each test"""
+        self.logger = MagicMock()
+        self.streaming_service = StreamingService(MagicMock(), self.logger, Config())
+    
+    def test_on_ticks(self):
+        """Test ticks update the price cache and reach registered callbacks"""
+        callback = MagicMock()
+        failing = MagicMock(side_effect=Exception("boom"))
+        self.streaming_service.register_callback("failing", failing)
+        self.streaming_service.register_callback("test", callback)
+        
+        ticks = [{"instrument_token": 12345, "last_price": 100.5}, {"instrument_token": 67890, "last_price": 80}]
+        self.streaming_service.on_ticks(None, ticks)
+        
+        self.assertEqual(self.streaming_service.get_ltp(12345), 100.5)
+        self.assertEqual(self.streaming_service.get_ltp(67890), 80)
+        callback.assert_called_once_with(ticks)
+        self.logger.error.assert_called_once()
+        
+        # Unregistered callbacks are no longer called
+        self.streaming_service.unregister_callback("test")
+        self.streaming_service.on_ticks(None, ticks)
+        callback.assert_called_once()
+    
+    def test_subscribe_modes(self):
+        """Test instruments stream in LTP mode unless a fuller mode is requested"""
+        ticker = MagicMock()
+        self.streaming_service.ticker = ticker
+        self.streaming_service.is_connected = True
+        
+        self.streaming_service.subscribe([12345, 67890])
+        ticker.set_mode.assert_called_once_with(KiteTicker.MODE_LTP, [12345, 67890])
+        
+        # Requesting full quotes upgrades an already streamed instrument
+        ticker.set_mode.reset_mock()
+        self.streaming_service.subscribe([12345], mode=KiteTicker.MODE_FULL)
+        ticker.set_mode.assert_called_once_with(KiteTicker.MODE_FULL, [12345])
+        
+        # A later LTP subscription does not downgrade it
+        ticker.set_mode.reset_mock()
+        self.streaming_service.subscribe([12345])
+        ticker.set_mode.assert_not_called()
+    
+    def test_unsubscribe_while_disconnected(self):
+        """Test unsubscribed instruments are not resubscribed on the next connect"""
+        self.streaming_service.subscribe([12345, 67890])
+        
+        self.streaming_service.unsubscribe([12345])
+        
+        # Verify
+        self.assertEqual(self.streaming_service.instruments, [67890])
+    
+    def test_on_noreconnect_backs_off(self):
+        """Test manual reconnects are scheduled on a timer with exponential backoff"""
+        with patch('core.streaming.threading.Timer') as timer:
+            for _ in range(4):
+                self.streaming_service.on_noreconnect(None)
+        
+        delays = [call.args[0] for call in timer.call_args_list]
+        self.assertEqual(delays, [5, 10, 20, 40])
+        self.assertEqual(timer.return_value.start.call_count, 4)
+    
+    def test_start_is_idempotent(self):
+        """Test start() does not open a second connection while one is in flight"""
+        self.streaming_service.instruments = [12345]
+        
+        with patch('core.streaming.KiteTicker') as ticker_cls:
+            self.assertTrue(self.streaming_service.start())
+            self.assertTrue(self.streaming_service.start())
+        
+        ticker_cls.return_value.connect.assert_called_once_with(threaded=True)
+    
+class TestKernels(unittest.TestCase):
+    """Test cases for the numeric strike kernels"""
+    
+    def test_round_to_strike(self):
+        """Test rounding to the nearest strike matches built-in round"""
+        for price in [18024.9, 18025, 18075, 18026.3, 17999.99]:
+            self.assertEqual(round_to_strike(price, 50), round(price / 50) * 50)
+    
+    def test_round_to_strike_50(self):
+        """Test the 50-point specialization matches the generic kernel"""
+        for price in [18024.9, 18025, 18075, 18026.3, 17999.99, 18125]:
+            self.assertEqual(round_to_strike_50(price), round_to_strike(price, 50))
+    
+    def test_round_to_tick(self):
+        """Test rounding prices to the exchange tick"""
+        self.assertEqual(round_to_tick(111.105, 0.05), 111.1)
+        self.assertEqual(round_to_tick(90.0, 0.05), 90.0)
+        self.assertEqual(round_to_tick(12.34, 0.05), 12.35)
+    
+    def test_compute_strikes(self):
+        """Test computing ATM and strangle strikes"""
+        self.assertEqual(compute_strikes(18025, 0, 1000, 50), (18000, 19000, 17000))
+        self.assertEqual(compute_strikes(18025, 25, 1000, 50), (18050, 19050, 17050))
+    
+    def test_hedge_strikes(self):
+        """Test computing hedge strikes for CE and PE legs together"""
+        result = hedge_strikes(
+            np.array([18000, 18000], dtype=np.float64),
+            np.array([110, 95.5], dtype=np.float64),
+            np.array([1.0, -1.0]),
+            50
+        )
+        self.assertEqual(result.tolist(), [18100, 17900])
+    
+    def test_profitable_leg_indices(self):
+        """Test finding short legs at or above the profit threshold"""
+        quantities = np.array([-50, -50, 50, -50, -50], dtype=np.int64)
+        sell_prices = np.array([100, 100, 100, 0, 100], dtype=np.float64)
+        ltps = np.array([75, 80, 50, 10, 0], dtype=np.float64)
+        
+        result = profitable_leg_indices(quantities, sell_prices, ltps, 25.0)
+        self.assertEqual(result.tolist(), [0])
+
+class TestDuplicateFilter(unittest.TestCase):
+    """Test cases for the DuplicateFilter logging filter"""
+    
+    def _record(self, level, msg, *args):
+        return logging.LogRecord('nse_trading', level, __file__, 0, msg, args, None)
+    
+    def test_drops_repeats_within_window(self):
+        """Test repeated errors are dropped and counted"""
+        log_filter = DuplicateFilter(window=60)
+        
+        self.assertTrue(log_filter.filter(self._record(logging.ERROR, "Order %s rejected", "1")))
+        self.assertFalse(log_filter.filter(self._record(logging.ERROR, "Order %s rejected", "1")))
+        self.assertFalse(log_filter.filter(self._record(logging.ERROR, "Order %s rejected", "1")))
+        
+        # Different messages and lower levels pass through
+        self.assertTrue(log_filter.filter(self._record(logging.ERROR, "Order %s rejected", "2")))
+        self.assertTrue(log_filter.filter(self._record(logging.INFO, "Order %s rejected", "1")))
+        self.assertTrue(log_filter.filter(self._record(logging.INFO, "Order %s rejected", "1")))
+    
+    def test_reports_repeats_after_window(self):
+        """Test the next emitted record reports how many repeats were dropped"""
+        log_filter = DuplicateFilter(window=0.05)
+        
+        log_filter.filter(self._record(logging.ERROR, "API down"))
+        log_filter.filter(self._record(logging.ERROR, "API down"))
+        log_filter.filter(self._record(logging.ERROR, "API down"))
+        time.sleep(0.06)
+        
+        record = self._record(logging.ERROR, "API down")
+        self.assertTrue(log_filter.filter(record))
+        self.assertEqual(record.getMessage(), "API down (repeated 2 times)")
+
 if __name__ == "__main__":
     unittest.main()
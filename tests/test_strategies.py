@@ -1,9 +1,12 @@
 import os
 import sys
 import unittest
+import time
+import threading
 import datetime
 import pandas as pd
-from unittest.mock import MagicMock, patch
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest.mock import MagicMock, patch, call
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -72,11 +75,23 @@ class TestStrategies(unittest.TestCase):
         self.order_manager.get_instrument_token.return_value = 12345
         self.order_manager.get_ltp.return_value = 100
         self.order_manager.place_order.return_value = "order123"
+        self.order_manager.place_order_async.side_effect = self._place_order_async
         self.order_manager.refresh_positions.return_value = {"net": []}
         self.order_manager.refresh_orders.return_value = []
         self.order_manager.positions = {"net": []}
+        self.order_manager.positions_df = OrderManager.build_positions_df([])
+        self.order_manager.positions_by_expiry_type = {}
         self.order_manager.orders = {}
+        self.order_manager.positions_dirty = True
+        self.order_manager.orders_dirty = True
+        self.order_manager.positions_refreshed_at = None
+        self.order_manager.orders_refreshed_at = None
         self.order_manager.instruments_cache = {}
+        self.order_manager.instruments_by_token = {}
+        self.order_manager.nearest_listed_strike.side_effect = lambda expiry, instrument_type, strike: strike
+        self.order_manager.listed_strikes_from.return_value = None
+        self.order_manager.place_basket.side_effect = lambda orders: [f"order{i}" for i in range(len(orders))]
+        self.order_manager.ltp_cache = {}
         
         # Mock expiry manager
         self.expiry_manager = MagicMock(spec=ExpiryManager)
@@ -89,11 +104,14 @@ class TestStrategies(unittest.TestCase):
         self.risk_manager.is_trading_allowed.return_value = True
         self.risk_manager.check_shutdown_condition.return_value = False
         self.risk_manager.check_profit_exit_condition.return_value = False
+        self.risk_manager.check_profit_exit_conditions.return_value = {"CE": False, "PE": False}
         self.risk_manager.calculate_position_profit_percentage.return_value = 0
         self.risk_manager.check_position_loss_threshold.return_value = False
         
         # Mock streaming service
         self.streaming_service = MagicMock(spec=StreamingService)
+        self.streaming_service.is_connected = False
+        self.streaming_service.get_ltp.return_value = None
         
         # Create strategy instance
         self.strategy = Strategy(
@@ -109,6 +127,24 @@ class TestStrategies(unittest.TestCase):
         # Mock spot price
         self.strategy.nifty_spot_price = 18000
     
+    def _place_order_async(self, **kwargs):
+        """Resolve async orders synchronously through the mocked place_order"""
+        future = Future()
+        future.set_result(self.order_manager.place_order(**kwargs))
+        return future
+    
+    def _set_positions(self, net_positions):
+        """Set mocked net positions along with their precomputed DataFrame"""
+        self.order_manager.positions = {"net": net_positions}
+        self.order_manager.positions_df = OrderManager.build_positions_df(net_positions)
+        self.order_manager.positions_by_expiry_type = OrderManager.build_positions_index(self.order_manager.positions_df)
+    
+    def _index_instruments(self):
+        """Index the mocked instruments cache by instrument token"""
+        self.order_manager.instruments_by_token = OrderManager.build_instruments_index(
+            self.order_manager.instruments_cache.values()
+        )
+    
     def test_update_spot_price(self):
         """Test updating spot price"""
         self.kite.ltp.return_value = {"NSE:NIFTY 50": {"last_price": 18000}}
@@ -116,6 +152,67 @@ class TestStrategies(unittest.TestCase):
         self.assertEqual(result, 18000)
         self.assertEqual(self.strategy.nifty_spot_price, 18000)
     
+    def test_update_spot_price_from_cache(self):
+        """Test updating spot price from prefetched LTPs"""
+        self.order_manager.ltp_cache = {"NSE:NIFTY 50": 18100}
+        result = self.strategy.update_spot_price()
+        self.assertEqual(result, 18100)
+        self.kite.ltp.assert_not_called()
+    
+    def test_update_spot_price_from_stream(self):
+        """Test updating spot price from the tick stream"""
+        self.streaming_service.is_connected = True
+        self.streaming_service.get_ltp.side_effect = lambda token: 18200 if token == 256265 else None
+        self.order_manager.ltp_cache = {"NSE:NIFTY 50": 18100}
+        
+        result = self.strategy.update_spot_price()
+        
+        self.assertEqual(result, 18200)
+        self.kite.ltp.assert_not_called()
+    
+    def test_prefetch_ltps_skips_streamed(self):
+        """Test that streamed prices are not fetched over REST"""
+        self.streaming_service.is_connected = True
+        self.streaming_service.get_ltp.side_effect = lambda token: {256265: 18000, 12345: 95}.get(token)
+        self.order_manager.positions = {"net": [
+            {"tradingsymbol": "NIFTY25APR18000CE", "quantity": -50, "instrument_token": 12345},
+            {"tradingsymbol": "NIFTY25APR18000PE", "quantity": -50, "instrument_token": 67890}
+        ]}
+        
+        self.strategy._prefetch_ltps()
+        self.order_manager.prefetch_ltps.assert_called_once_with([67890])
+        self.assertEqual(self.order_manager.ltp_cache, {"NSE:NIFTY 50": 18000, 12345: 95})
+        
+        # Everything streamed, no REST call at all
+        self.streaming_service.get_ltp.side_effect = lambda token: 100
+        self.order_manager.prefetch_ltps.reset_mock()
+        self.strategy._prefetch_ltps()
+        self.order_manager.prefetch_ltps.assert_not_called()
+    
+    def test_get_ltp_prefers_tick_stream(self):
+        """Test reading LTPs from the tick stream before falling back to REST"""
+        # Stream connected and price available
+        self.streaming_service.is_connected = True
+        self.streaming_service.get_ltp.return_value = 120
+        self.assertEqual(self.strategy._get_ltp(12345), 120)
+        self.order_manager.get_ltp.assert_not_called()
+        
+        # Cold miss falls back to REST
+        self.streaming_service.get_ltp.return_value = None
+        self.assertEqual(self.strategy._get_ltp(12345), 100)
+        self.order_manager.get_ltp.assert_called_once_with(12345)
+    
+    def test_prefetch_ltps(self):
+        """Test batching spot and open position LTP lookups"""
+        self.order_manager.positions = {"net": [
+            {"tradingsymbol": "NIFTY25APR18000CE", "quantity": -50, "instrument_token": 12345},
+            {"tradingsymbol": "NIFTY25APR18000PE", "quantity": 0, "instrument_token": 67890}
+        ]}
+        
+        self.strategy._prefetch_ltps()
+        
+        self.order_manager.prefetch_ltps.assert_called_once_with(["NSE:NIFTY 50", 12345])
+    
     def test_get_atm_strike(self):
         """Test getting ATM strike price"""
         self.strategy.nifty_spot_price = 18025
@@ -128,6 +225,15 @@ class TestStrategies(unittest.TestCase):
         result = self.strategy.get_atm_strike()
         self.assertEqual(result, 18050)  # With bias
     
+    def test_get_atm_strike_cached(self):
+        """Test that the ATM strike is reused while spot and bias are unchanged"""
+        self.strategy.nifty_spot_price = 18010
+        self.strategy._round_to_strike = MagicMock(return_value=18000)
+        
+        self.assertEqual(self.strategy.get_atm_strike(), 18000)
+        self.assertEqual(self.strategy.get_atm_strike(), 18000)
+        self.strategy._round_to_strike.assert_called_once_with(18010)
+    
     def test_execute_short_straddle(self):
         """Test executing short straddle strategy"""
         # Mock that no straddle exists
@@ -167,25 +273,45 @@ class TestStrategies(unittest.TestCase):
         expiry_str = expiry.strftime('%y%b').upper()
         
         # No positions
-        self.order_manager.positions = {"net": []}
+        self._set_positions([])
         result = self.strategy._short_straddle_exists(expiry)
         self.assertFalse(result)
         
         # Only CE short position
-        self.order_manager.positions = {"net": [
+        self._set_positions([
             {"tradingsymbol": f"NIFTY{expiry_str}18000CE", "quantity": -50}
-        ]}
+        ])
         result = self.strategy._short_straddle_exists(expiry)
         self.assertFalse(result)
         
         # Both CE and PE short positions
-        self.order_manager.positions = {"net": [
+        self._set_positions([
             {"tradingsymbol": f"NIFTY{expiry_str}18000CE", "quantity": -50},
             {"tradingsymbol": f"NIFTY{expiry_str}18000PE", "quantity": -50}
-        ]}
+        ])
         result = self.strategy._short_straddle_exists(expiry)
         self.assertTrue(result)
     
+    def test_short_strangle_exists_reuses_straddle_result(self):
+        """Test that straddle and strangle existence checks share one scan"""
+        expiry = datetime.datetime.now() + datetime.timedelta(days=90)
+        expiry_str = expiry.strftime('%y%b').upper()
+        self._set_positions([
+            {"tradingsymbol": f"NIFTY{expiry_str}18000CE", "quantity": -50},
+            {"tradingsymbol": f"NIFTY{expiry_str}18000PE", "quantity": -50}
+        ])
+        
+        self.assertTrue(self.strategy._short_straddle_exists(expiry))
+        self.assertIn((expiry, 'straddle'), self.strategy._existence_cache)
+        
+        # Mutating the snapshot in place is not seen until positions are refreshed
+        self.order_manager.positions_df['is_short'] = False
+        self.assertTrue(self.strategy._short_strangle_exists(expiry))
+        
+        # A refreshed snapshot invalidates the cached result
+        self._set_positions([])
+        self.assertFalse(self.strategy._short_strangle_exists(expiry))
+    
     def test_place_short_straddle_orders(self):
         """Test placing short straddle orders"""
         expiry = datetime.datetime.now() + datetime.timedelta(days=90)
@@ -257,10 +383,10 @@ class TestStrategies(unittest.TestCase):
         # Mock methods
         self.strategy._calculate_hedge_quantity = MagicMock(return_value=50)
         
-        # Mock instruments cache
-        self.order_manager.instruments_cache = {
-            "key1": {"instrument_token": ce_token, "strike": 18000, "instrument_type": "CE"},
-            "key2": {"instrument_token": pe_token, "strike": 18000, "instrument_type": "PE"}
+        # Mock instruments index
+        self.order_manager.instruments_by_token = {
+            ce_token: {"instrument_token": ce_token, "strike": 18000, "instrument_type": "CE"},
+            pe_token: {"instrument_token": pe_token, "strike": 18000, "instrument_type": "PE"}
         }
         
         # Execute
@@ -290,15 +416,64 @@ class TestStrategies(unittest.TestCase):
             tag="hedge_buy_pe"
         )
     
+    def test_prefetch_missing_ltps(self):
+        """Test that only unpriced tokens are fetched, in one call"""
+        self.order_manager.ltp_cache = {111: 95}
+        self.streaming_service.is_connected = True
+        self.streaming_service.get_ltp.side_effect = lambda token: 80 if token == 222 else None
+        
+        # Execute
+        self.strategy._prefetch_missing_ltps([111, 222, 333, 444])
+        
+        # Verify
+        self.order_manager.prefetch_ltps.assert_called_once_with([333, 444])
+    
+    def test_manage_legs_skipped_without_positions_of_side(self):
+        """Test that leg management returns early when there is nothing to manage"""
+        self.order_manager.positions = {"net": [
+            {"tradingsymbol": "NIFTY25APR18000CE", "quantity": 50, "buy_price": 100, "instrument_token": 12345}
+        ]}
+        self.strategy._manage_profitable_legs()
+        self.order_manager.get_ltp.assert_not_called()
+        self.order_manager.prefetch_ltps.assert_not_called()
+        
+        self.order_manager.positions = {"net": [
+            {"tradingsymbol": "NIFTY25APR18000CE", "quantity": -50, "sell_price": 100, "instrument_token": 12345}
+        ]}
+        self.strategy._manage_hedge_buy_orders()
+        self.risk_manager.check_position_loss_threshold.assert_not_called()
+        self.order_manager.get_ltp.assert_not_called()
+        self.order_manager.prefetch_ltps.assert_not_called()
+        self.streaming_service.get_ltp.assert_not_called()
+    
+    def test_calculate_hedge_quantity(self):
+        """Test hedge quantity from sell and active buy quantities"""
+        self._set_positions([
+            {"tradingsymbol": "NIFTY25APR18000CE", "quantity": -150, "instrument_token": 1},
+            {"tradingsymbol": "NIFTY25APR19000CE", "quantity": 50, "instrument_token": 2},
+            {"tradingsymbol": "NIFTY25APR17000PE", "quantity": -50, "instrument_token": 3}
+        ])
+        
+        # Verify
+        self.assertEqual(self.strategy._calculate_hedge_quantity("CE"), 100)
+        self.assertEqual(self.strategy._calculate_hedge_quantity("PE"), 50)
+        
+        # No sell positions falls back to one lot
+        self._set_positions([])
+        self.assertEqual(self.strategy._calculate_hedge_quantity("CE"), self.config.lot_size)
+    
     def test_manage_profitable_legs(self):
         """Test managing profitable legs"""
-        # Mock positions with one profitable position
+        # Mock positions with one profitable position, one short below threshold and one hedge
+        profitable = {"tradingsymbol": "NIFTY25APR18000CE", "quantity": -50, "sell_price": 100, "instrument_token": 12345}
         self.order_manager.positions = {"net": [
-            {"tradingsymbol": "NIFTY25APR18000CE", "quantity": -50, "sell_price": 100, "instrument_token": 12345}
+            profitable,
+            {"tradingsymbol": "NIFTY25APR18000PE", "quantity": -50, "sell_price": 100, "instrument_token": 67890},
+            {"tradingsymbol": "NIFTY25APR19000CE", "quantity": 50, "buy_price": 20, "instrument_token": 11111}
         ]}
         
-        # Mock profit calculation
-        self.risk_manager.calculate_position_profit_percentage.return_value = 30  # 30% profit
+        # Mock prices: 30% profit on the CE leg, 10% on the PE leg
+        self.order_manager.get_ltp.side_effect = {12345: 70, 67890: 90}.get
         
         # Mock methods
         self.strategy._add_stop_loss_for_position = MagicMock()
@@ -308,9 +483,9 @@ class TestStrategies(unittest.TestCase):
         self.strategy._manage_profitable_legs()
         
         # Verify calls
-        self.risk_manager.calculate_position_profit_percentage.assert_called_once()
-        self.strategy._add_stop_loss_for_position.assert_called_once()
-        self.strategy._add_new_sell_order_for_profitable_leg.assert_called_once()
+        self.strategy._add_stop_loss_for_position.assert_called_once_with(profitable)
+        self.strategy._add_new_sell_order_for_profitable_leg.assert_called_once_with(profitable)
+        self.assertEqual(self.order_manager.get_ltp.call_count, 2)
     
     def test_add_stop_loss_for_position(self):
         """Test adding stop loss for a profitable position"""
@@ -338,12 +513,22 @@ class TestStrategies(unittest.TestCase):
             tag="stop_loss"
         )
     
+    def test_add_stop_loss_for_position_rounds_to_tick(self):
+        """Test the stop loss trigger is placed on the 0.05 tick grid"""
+        position = {"tradingsymbol": "NIFTY25APR18000CE", "quantity": -50, "sell_price": 123.45, "instrument_token": 12345}
+        self.order_manager.get_orders_for_instrument.return_value = []
+        
+        self.strategy._add_stop_loss_for_position(position)
+        
+        # 90% of 123.45 is 111.105
+        self.assertEqual(self.order_manager.place_order.call_args.kwargs['trigger_price'], 111.1)
+    
     def test_close_orphan_hedge_orders(self):
         """Test closing orphan hedge orders"""
         # Mock positions with only buy orders for CE
-        self.order_manager.positions = {"net": [
+        self._set_positions([
             {"tradingsymbol": "NIFTY25APR18000CE", "quantity": 50, "instrument_token": 12345}
-        ]}
+        ])
         
         # Mock method
         self.strategy._close_all_buy_positions_by_type = MagicMock()
@@ -354,6 +539,20 @@ class TestStrategies(unittest.TestCase):
         # Verify calls
         self.strategy._close_all_buy_positions_by_type.assert_called_once_with("CE")
     
+    def test_close_orphan_hedge_orders_keeps_covered_hedges(self):
+        """Test hedges with a matching sell leg are not treated as orphans"""
+        self._set_positions([
+            {"tradingsymbol": "NIFTY25APR18000CE", "quantity": -50, "instrument_token": 12345},
+            {"tradingsymbol": "NIFTY25APR19000CE", "quantity": 50, "instrument_token": 54321},
+            {"tradingsymbol": "NIFTY25APR17000PE", "quantity": 50, "instrument_token": 67890}
+        ])
+        self.strategy._close_all_buy_positions_by_type = MagicMock()
+        
+        self.strategy._close_orphan_hedge_orders()
+        
+        # Only the PE hedge lacks a sell leg
+        self.strategy._close_all_buy_positions_by_type.assert_called_once_with("PE")
+    
     def test_handle_expiry_day(self):
         """Test handling expiry day operations"""
         # Mock that today is an expiry day
@@ -361,9 +560,9 @@ class TestStrategies(unittest.TestCase):
         
         # Mock positions with expiring buy positions
         today = datetime.datetime.now().date()
-        self.order_manager.positions = {"net": [
+        self._set_positions([
             {"tradingsymbol": "NIFTY25APR18000CE", "quantity": 50, "instrument_token": 12345}
-        ]}
+        ])
         
         # Mock instruments cache
         self.order_manager.instruments_cache = {
@@ -374,6 +573,7 @@ class TestStrategies(unittest.TestCase):
                 "expiry": datetime.datetime.combine(today, datetime.time())
             }
         }
+        self._index_instruments()
         
         # Mock method
         self.strategy._replace_expiring_buy_positions = MagicMock()
@@ -406,8 +606,7 @@ class TestStrategies(unittest.TestCase):
         self.order_manager.refresh_positions.assert_called_once()
         self.order_manager.refresh_orders.assert_called_once()
         self.expiry_manager.is_expiry_day.assert_called_once()
-        self.risk_manager.check_profit_exit_condition.assert_any_call(None, "CE")
-        self.risk_manager.check_profit_exit_condition.assert_any_call(None, "PE")
+        self.risk_manager.check_profit_exit_conditions.assert_called_once()
         self.strategy._execute_short_straddle.assert_called_once()
         self.strategy._manage_profitable_legs.assert_called_once()
         self.strategy._manage_hedge_buy_orders.assert_called_once()
@@ -415,6 +614,121 @@ class TestStrategies(unittest.TestCase):
         self.strategy._check_spot_price_touches_hedge.assert_called_once()
         self.assertTrue(result)
     
+    def test_execute_caches_expiry_per_cycle(self):
+        """Test that expiry lookups are resolved once per execute() cycle"""
+        # Mock methods
+        self.strategy.update_spot_price = MagicMock(return_value=18000)
+        self.strategy._manage_profitable_legs = MagicMock()
+        self.strategy._manage_hedge_buy_orders = MagicMock()
+        self.strategy._close_orphan_hedge_orders = MagicMock()
+        self.strategy._check_spot_price_touches_hedge = MagicMock()
+        self.strategy._short_straddle_exists = MagicMock(return_value=True)
+        
+        # Execute
+        self.strategy.execute()
+        
+        # Verify expiry lookups are not repeated by sub-helpers
+        self.expiry_manager.get_far_month_expiry.assert_called_once()
+        self.expiry_manager.get_next_weekly_expiry.assert_called_once()
+        self.expiry_manager.is_expiry_day.assert_called_once()
+        self.assertIsNone(self.strategy._tick)
+    
+    def test_execute_shares_snapshot(self):
+        """Test that position management steps share one snapshot per cycle"""
+        # Mock methods
+        self.strategy.update_spot_price = MagicMock(return_value=18000)
+        self.strategy._manage_profitable_legs = MagicMock()
+        self.strategy._manage_hedge_buy_orders = MagicMock()
+        self.strategy._close_orphan_hedge_orders = MagicMock()
+        self.strategy._check_spot_price_touches_hedge = MagicMock()
+        self.strategy._short_straddle_exists = MagicMock(return_value=True)
+        
+        # Execute
+        self.strategy.execute()
+        
+        # Verify
+        snapshot = self.strategy._manage_profitable_legs.call_args[0][0]
+        self.assertEqual(snapshot['spot'], 18000)
+        self.strategy._manage_hedge_buy_orders.assert_called_once_with(snapshot)
+        self.strategy._close_orphan_hedge_orders.assert_called_once_with(snapshot)
+        self.strategy._check_spot_price_touches_hedge.assert_called_once_with(snapshot)
+    
+    def test_refresh_account_state(self):
+        """Test skipping REST refreshes when the order stream reports no changes"""
+        # Stream live and nothing changed
+        self.streaming_service.is_connected = True
+        self.order_manager.positions_dirty = False
+        self.order_manager.orders_dirty = False
+        self.strategy._refresh_account_state()
+        self.order_manager.refresh_positions.assert_not_called()
+        self.order_manager.refresh_orders.assert_not_called()
+        
+        # Order update received
+        self.order_manager.positions_dirty = True
+        self.strategy._refresh_account_state()
+        self.order_manager.refresh_positions.assert_called_once()
+        self.order_manager.refresh_orders.assert_not_called()
+        
+        # Stream down, always refresh
+        self.streaming_service.is_connected = False
+        self.strategy._refresh_account_state()
+        self.assertEqual(self.order_manager.refresh_positions.call_count, 2)
+        self.order_manager.refresh_orders.assert_called_once()
+    
+    def test_refresh_account_state_concurrent(self):
+        """Test that positions and orders are refreshed concurrently on the application pool"""
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        self.strategy._refresh_executor = executor
+        barrier = threading.Barrier(2, timeout=5)
+        self.order_manager.refresh_positions.side_effect = lambda: barrier.wait()
+        self.order_manager.refresh_orders.side_effect = lambda: barrier.wait()
+        
+        # Each refresh blocks until the other has started
+        self.strategy._refresh_account_state()
+        
+        # Verify
+        self.order_manager.refresh_positions.assert_called_once()
+        self.order_manager.refresh_orders.assert_called_once()
+    
+    def test_refresh_account_state_sequential_without_pool(self):
+        """Test that both refreshes still run when no application pool is given"""
+        self.assertIsNone(self.strategy._refresh_executor)
+        
+        self.strategy._refresh_account_state()
+        
+        # Verify
+        self.order_manager.refresh_positions.assert_called_once()
+        self.order_manager.refresh_orders.assert_called_once()
+    
+    def test_refresh_skipped_when_refreshed_this_cycle(self):
+        """Test that positions refreshed by the shutdown check are not fetched again"""
+        self.order_manager.positions_dirty = False
+        self.order_manager.orders_dirty = False
+        self.strategy._cycle_started_at = 100.0
+        self.order_manager.positions_refreshed_at = 100.5
+        self.order_manager.orders_refreshed_at = 99.0
+        
+        self.strategy._refresh_account_state()
+        
+        self.order_manager.refresh_positions.assert_not_called()
+        self.order_manager.refresh_orders.assert_called_once()
+    
+    def test_execute_skips_entry_when_structure_open(self):
+        """Test that entry dispatch is skipped when the structure is already open"""
+        # Mock methods
+        self.strategy.update_spot_price = MagicMock(return_value=18000)
+        self.strategy._short_straddle_exists = MagicMock(return_value=True)
+        self.strategy._execute_trend_based_strategy = MagicMock()
+        self.strategy._manage_profitable_legs = MagicMock()
+        
+        # Execute
+        self.strategy.execute()
+        
+        # Verify entry skipped but position management still runs
+        self.strategy._execute_trend_based_strategy.assert_not_called()
+        self.strategy._manage_profitable_legs.assert_called_once()
+    
     def test_shutdown_condition(self):
         """Test shutdown condition handling"""
         # Mock shutdown condition
@@ -434,7 +748,8 @@ class TestStrategies(unittest.TestCase):
     def test_profit_exit_condition(self):
         """Test profit exit condition handling"""
         # Mock profit exit condition for CE
-        self.risk_manager.check_profit_exit_condition.side_effect = [True, False]
+        self.risk_manager.check_profit_exit_conditions.return_value = {"CE": True, "PE": False}
+        self.kite.ltp.return_value = {"NSE:NIFTY 50": {"last_price": 18000}}
         
         # Mock method
         self.strategy._exit_all_positions_by_type = MagicMock()
@@ -443,8 +758,7 @@ class TestStrategies(unittest.TestCase):
         self.strategy.execute()
         
         # Verify calls
-        self.risk_manager.check_profit_exit_condition.assert_any_call(None, "CE")
-        self.risk_manager.check_profit_exit_condition.assert_any_call(None, "PE")
+        self.risk_manager.check_profit_exit_conditions.assert_called_once()
         self.strategy._exit_all_positions_by_type.assert_called_once_with("CE")
     
     def test_add_new_sell_order_for_profitable_leg(self):
@@ -465,6 +779,7 @@ class TestStrategies(unittest.TestCase):
                 "expiry": datetime.datetime.now() + datetime.timedelta(days=90)
             }
         }
+        self._index_instruments()
         
         # Mock methods
         self.strategy._buy_order_exists_at_strike = MagicMock(return_value=False)
@@ -496,6 +811,7 @@ class TestStrategies(unittest.TestCase):
                 "expiry": datetime.datetime.now() + datetime.timedelta(days=7)
             }
         }
+        self._index_instruments()
         
         # Mock methods
         self.strategy._buy_order_exists_at_strike = MagicMock(return_value=False)
@@ -532,6 +848,7 @@ class TestStrategies(unittest.TestCase):
                 "expiry": datetime.datetime.now() + datetime.timedelta(days=7)
             }
         }
+        self._index_instruments()
         
         # Mock methods
         self.strategy._close_position = MagicMock()
@@ -542,7 +859,103 @@ class TestStrategies(unittest.TestCase):
         
         # Verify calls
         self.strategy._close_position.assert_called_once()
-        self.strategy._add_far_month_buy_order.assert_called_once()
+        self.strategy._add_far_month_buy_order.assert_called_once_with(
+            self.order_manager.positions["net"][0],
+            instrument=self.order_manager.instruments_by_token[12345]
+        )
+    
+    def test_check_spot_price_touches_hedge_debounced(self):
+        """Test the hedge scan is skipped only while spot stays between the same bands"""
+        self.strategy.nifty_spot_price = 18000
+        self._set_positions([
+            {"tradingsymbol": "NIFTY25APR19000CE", "quantity": 50, "instrument_token": 12345}
+        ])
+        self.order_manager.instruments_by_token = {
+            12345: {"instrument_token": 12345, "strike": 19000, "instrument_type": "CE",
+                    "expiry": datetime.datetime.now() + datetime.timedelta(days=7)}
+        }
+        self.strategy._close_position = MagicMock()
+        self.strategy._add_far_month_buy_order = MagicMock()
+        checking = call("Strategy: Checking if spot price touches hedge buy order strike")
+        
+        self.strategy._check_spot_price_touches_hedge()
+        self.strategy.nifty_spot_price = 18890
+        self.strategy._check_spot_price_touches_hedge()
+        self.assertEqual(self.logger.info.call_args_list.count(checking), 1)
+        self.strategy._close_position.assert_not_called()
+        
+        # A small move into the 19000 band (low 18905) is still acted on
+        self.strategy.nifty_spot_price = 18900
+        self.strategy._check_spot_price_touches_hedge()
+        self.strategy.nifty_spot_price = 18910
+        self.strategy._check_spot_price_touches_hedge()
+        self.strategy._close_position.assert_called_once()
+    
+    def test_spot_touches_hedge(self):
+        """Test the per-tick band check uses the bands from the last hedge scan"""
+        self.assertFalse(self.strategy.spot_touches_hedge(18000))
+        
+        self._set_positions([
+            {"tradingsymbol": "NIFTY25APR19000CE", "quantity": 50, "instrument_token": 12345}
+        ])
+        self.order_manager.instruments_by_token = {
+            12345: {"instrument_token": 12345, "strike": 19000, "instrument_type": "CE",
+                    "expiry": datetime.datetime.now() + datetime.timedelta(days=7)}
+        }
+        self.strategy.nifty_spot_price = 18000
+        self.strategy._check_spot_price_touches_hedge()
+        
+        # Verify
+        self.assertFalse(self.strategy.spot_touches_hedge(18000))
+        self.assertTrue(self.strategy.spot_touches_hedge(18950))
+        self.assertTrue(self.strategy.spot_touches_hedge(19090))
+        self.assertFalse(self.strategy.spot_touches_hedge(19100))
+    
+    def test_tick_band_touch_forces_hedge_check(self):
+        """Test a tick entering a hedge band leads to the hedge being closed on the early run"""
+        self._set_positions([
+            {"tradingsymbol": "NIFTY25APR19000CE", "quantity": 50, "instrument_token": 12345}
+        ])
+        self.order_manager.instruments_by_token = {
+            12345: {"instrument_token": 12345, "strike": 19000, "instrument_type": "CE",
+                    "expiry": datetime.datetime.now() + datetime.timedelta(days=7)}
+        }
+        self.strategy._close_position = MagicMock()
+        self.strategy._add_far_month_buy_order = MagicMock()
+        
+        # Scheduled scan with spot just outside the band (low 18905)
+        self.strategy.nifty_spot_price = 18900
+        self.strategy._check_spot_price_touches_hedge()
+        self.strategy._close_position.assert_not_called()
+        
+        # A tick 5 points inside the band triggers the early run
+        self.assertTrue(self.strategy.spot_touches_hedge(18910))
+        self.strategy.force_touch_check()
+        self.strategy.nifty_spot_price = 18910
+        self.strategy._check_spot_price_touches_hedge()
+        
+        # Verify
+        self.strategy._close_position.assert_called_once()
+    
+    def test_touch_bands_select_only_nearby_hedges(self):
+        """Test only hedges whose band contains spot are acted on"""
+        self.strategy.nifty_spot_price = 18050
+        near = {"tradingsymbol": "NIFTY25APR18000CE", "quantity": 50, "instrument_token": 1}
+        self._set_positions([
+            {"tradingsymbol": "NIFTY25APR19000CE", "quantity": 50, "instrument_token": 3},
+            near,
+            {"tradingsymbol": "NIFTY25APR17000PE", "quantity": 50, "instrument_token": 2}
+        ])
+        self.order_manager.instruments_by_token = {
+            token: {"instrument_token": token, "strike": strike, "instrument_type": "CE"}
+            for token, strike in [(1, 18000), (2, 17000), (3, 19000)]
+        }
+        self.strategy._close_position = MagicMock()
+        self.strategy._add_far_month_buy_order = MagicMock()
+        
+        self.strategy._check_spot_price_touches_hedge()
+        
+        self.strategy._close_position.assert_called_once_with(near)
     
     def test_add_far_month_buy_order(self):
         """Test adding far month buy order"""
@@ -562,6 +975,7 @@ class TestStrategies(unittest.TestCase):
                 "expiry": datetime.datetime.now() + datetime.timedelta(days=7)
             }
         }
+        self._index_instruments()
         
         # Mock methods
         self.strategy._find_strike_for_premium = MagicMock(return_value=18500)
@@ -601,6 +1015,84 @@ class TestStrategies(unittest.TestCase):
         # Verify
         self.assertEqual(result, 18200)
     
+    def test_find_strike_for_premium_bisects_premiums(self):
+        """Test the strike search probes O(log n) premiums when quotes are monotonic"""
+        expiry = datetime.date.today() + datetime.timedelta(days=90)
+        self.strategy.get_atm_strike = MagicMock(return_value=18000)
+        self.order_manager.get_instrument_token.side_effect = lambda exp, strike, opt: strike
+        
+        # PE premiums fall by 20 for every strike below ATM
+        self.order_manager.get_ltp.side_effect = lambda token: 400 - (18000 - token) / 50 * 20
+        
+        result = self.strategy._find_strike_for_premium(expiry, "PE", 135)
+        
+        # 18000 - 13 * 50 quotes 140, the closest to 135
+        self.assertEqual(result, 17350)
+        self.assertLessEqual(self.order_manager.get_ltp.call_count, 6)
+    
+    def test_find_strike_for_premium_batches_quotes(self):
+        """Test candidate quotes are fetched in one batch, skipping streamed tokens"""
+        expiry = datetime.date.today() + datetime.timedelta(days=90)
+        self.strategy.get_atm_strike = MagicMock(return_value=18000)
+        self.order_manager.get_instrument_token.side_effect = lambda exp, strike, opt: strike
+        self.order_manager.get_ltp.side_effect = lambda token: 400 - (token - 18000) / 50 * 20
+        self.streaming_service.is_connected = True
+        self.streaming_service.get_ltp.side_effect = lambda token: 400 if token == 18000 else None
+        
+        self.strategy._find_strike_for_premium(expiry, "CE", 135)
+        
+        self.order_manager.prefetch_ltps.assert_called_once_with([18000 + i * 50 for i in range(1, 20)])
+        
+        # Candidates are streamed for subsequent searches
+        self.streaming_service.subscribe.assert_called_once_with([18000 + i * 50 for i in range(20)])
+    
+    def test_execute_clears_strike_search_cache(self):
+        """Test strike search results do not outlive the cycle that found them"""
+        self.strategy._strike_search_cache[(datetime.date.today(), "CE", 135.0)] = (time.monotonic(), 18500)
+        self.risk_manager.is_trading_allowed.return_value = False
+        
+        self.strategy.execute()
+        
+        # Verify
+        self.assertEqual(self.strategy._strike_search_cache, {})
+    
+    def test_find_strike_for_premium_unsubscribes_stale_candidates(self):
+        """Test candidates that leave the search window are unsubscribed unless held"""
+        expiry = datetime.date.today() + datetime.timedelta(days=90)
+        self.order_manager.get_instrument_token.side_effect = lambda exp, strike, opt: strike
+        self.order_manager.get_ltp.side_effect = lambda token: 400 - (token - 18000) / 50 * 20
+        self._set_positions([
+            {"tradingsymbol": "NIFTY25APR18050CE", "quantity": -50, "instrument_token": 18050}
+        ])
+        
+        self.strategy.get_atm_strike = MagicMock(return_value=18000)
+        self.strategy._find_strike_for_premium(expiry, "CE", 135)
+        self.streaming_service.unsubscribe.assert_not_called()
+        
+        # Spot drifts up two strikes; 18000 leaves the window, 18050 is held
+        self.strategy.get_atm_strike = MagicMock(return_value=18100)
+        self.strategy._find_strike_for_premium(expiry, "CE", 125)
+        
+        # Verify
+        self.streaming_service.unsubscribe.assert_called_once_with([18000])
+    
+    def test_find_strike_for_premium_reuses_recent_result(self):
+        """Test repeated premium searches within the TTL skip the strike probes"""
+        expiry = datetime.date.today() + datetime.timedelta(days=90)
+        self.strategy.get_atm_strike = MagicMock(return_value=18000)
+        self.order_manager.get_instrument_token.side_effect = lambda exp, strike, opt: 12345 if strike == 18200 else None
+        self.order_manager.get_ltp.side_effect = lambda token: 50 if token == 12345 else None
+        
+        self.assertEqual(self.strategy._find_strike_for_premium(expiry, "CE", 50.02), 18200)
+        probes = self.order_manager.get_instrument_token.call_count
+        self.assertEqual(self.strategy._find_strike_for_premium(expiry, "CE", 49.98), 18200)
+        self.assertEqual(self.order_manager.get_instrument_token.call_count, probes)
+        
+        # An expired entry searches again
+        with patch('core.strategy.time.monotonic', return_value=time.monotonic() + 10):
+            self.strategy._find_strike_for_premium(expiry, "CE", 50)
+        self.assertGreater(self.order_manager.get_instrument_token.call_count, probes)
+    
     def test_close_position(self):
         """Test closing a position"""
         # Test closing a buy position
@@ -655,50 +1147,79 @@ class TestStrategies(unittest.TestCase):
             {"tradingsymbol": "NIFTY25APR19000CE", "quantity": 0, "instrument_token": 54321}  # Should be skipped
         ]}
         
-        # Mock method
-        self.strategy._close_position = MagicMock()
-        
         # Execute
         self.strategy._exit_all_positions()
         
         # Verify
-        self.assertEqual(self.strategy._close_position.call_count, 2)
+        self.order_manager.place_basket.assert_called_once()
+        self.assertEqual(len(self.order_manager.place_basket.call_args[0][0]), 2)
     
     def test_exit_all_positions_by_type(self):
         """Test exiting all positions by type"""
         # Mock positions
-        self.order_manager.positions = {"net": [
+        self._set_positions([
             {"tradingsymbol": "NIFTY25APR18000CE", "quantity": 50, "instrument_token": 12345},
             {"tradingsymbol": "NIFTY25APR18000PE", "quantity": -50, "instrument_token": 67890},
             {"tradingsymbol": "NIFTY25APR19000CE", "quantity": -25, "instrument_token": 54321}
-        ]}
-        
-        # Mock method
-        self.strategy._close_position = MagicMock()
+        ])
         
         # Execute
         self.strategy._exit_all_positions_by_type("CE")
         
         # Verify
-        self.assertEqual(self.strategy._close_position.call_count, 2)
+        self.order_manager.place_basket.assert_called_once()
+        self.assertEqual(len(self.order_manager.place_basket.call_args[0][0]), 2)
+    
+    def test_exit_all_positions_sends_one_basket(self):
+        """Test that mass exits submit all close orders as one basket"""
+        self._set_positions([
+            {"tradingsymbol": "NIFTY25APR18000CE", "quantity": -50, "instrument_token": 12345},
+            {"tradingsymbol": "NIFTY25APR18000PE", "quantity": 75, "instrument_token": 67890},
+            {"tradingsymbol": "NIFTY25APR19000CE", "quantity": 0, "instrument_token": 54321}
+        ])
+        
+        self.strategy._exit_all_positions()
+        
+        self.order_manager.place_basket.assert_called_once_with([
+            {"instrument_token": 12345, "transaction_type": "BUY", "quantity": 50, "order_type": "MARKET", "tag": "close_position"},
+            {"instrument_token": 67890, "transaction_type": "SELL", "quantity": 75, "order_type": "MARKET", "tag": "close_position"}
+        ])
+        self.order_manager.place_order.assert_not_called()
+    
+    def test_select_positions_buckets_once_per_refresh(self):
+        """Test positions are grouped by type and side once per positions refresh"""
+        ce_sell = {"tradingsymbol": "NIFTY25APR18000CE", "quantity": -50, "instrument_token": 12345}
+        ce_buy = {"tradingsymbol": "NIFTY25APR19000CE", "quantity": 50, "instrument_token": 54321}
+        pe_flat = {"tradingsymbol": "NIFTY25APR17000PE", "quantity": 0, "instrument_token": 67890}
+        self._set_positions([ce_sell, ce_buy, pe_flat])
+        
+        with patch.object(Strategy, '_build_position_buckets', wraps=Strategy._build_position_buckets) as build:
+            self.assertEqual(self.strategy._select_positions("CE", -1), [ce_sell])
+            self.assertEqual(self.strategy._select_positions("CE"), [ce_sell, ce_buy])
+            self.assertEqual(self.strategy._select_positions(side=1), [ce_buy])
+            self.assertEqual(self.strategy._select_positions("PE"), [])
+            build.assert_called_once()
+            
+            # A refresh regroups
+            self._set_positions([ce_buy])
+            self.assertEqual(self.strategy._select_positions("CE", -1), [])
+            self.assertEqual(build.call_count, 2)
     
     def test_close_all_buy_positions_by_type(self):
         """Test closing all buy positions by type"""
         # Mock positions
-        self.order_manager.positions = {"net": [
+        self._set_positions([
             {"tradingsymbol": "NIFTY25APR18000CE", "quantity": 50, "instrument_token": 12345},
             {"tradingsymbol": "NIFTY25APR18000PE", "quantity": 50, "instrument_token": 67890},
             {"tradingsymbol": "NIFTY25APR19000CE", "quantity": -25, "instrument_token": 54321}
-        ]}
-        
-        # Mock method
-        self.strategy._close_position = MagicMock()
+        ])
         
         # Execute
         self.strategy._close_all_buy_positions_by_type("CE")
         
         # Verify
-        self.assertEqual(self.strategy._close_position.call_count, 1)
+        self.order_manager.place_basket.assert_called_once()
+        self.assertEqual(len(self.order_manager.place_basket.call_args[0][0]), 1)
     
     def test_replace_expiring_buy_positions(self):
         """Test replacing expiring buy positions"""
@@ -712,18 +1233,35 @@ class TestStrategies(unittest.TestCase):
             {"tradingsymbol": "NIFTY25MAY18000CE", "quantity": -100, "instrument_token": 67890, "strike": 18000}
         ]}
         
-        # Mock methods
-        self.strategy._close_position = MagicMock()
-        
         # Execute
         self.strategy._replace_expiring_buy_positions("CE", positions)
         
         # Verify
-        self.strategy._close_position.assert_called_once()
+        self.order_manager.place_basket.assert_called_once()
         self.expiry_manager.get_next_weekly_expiry.assert_called_once()
         self.order_manager.get_instrument_token.assert_called_once()
         self.order_manager.place_order.assert_called_once()
     
+    def test_replace_expiring_buy_positions_weighted_strike(self):
+        """Test the replacement hedge is placed around the quantity-weighted sell strike"""
+        expiring = [{"tradingsymbol": "NIFTY25APR18000CE", "quantity": 50, "instrument_token": 12345}]
+        self._set_positions([
+            {"tradingsymbol": "NIFTY25MAY18000CE", "quantity": -100, "instrument_token": 67890},
+            {"tradingsymbol": "NIFTY25MAY18300CE", "quantity": -50, "instrument_token": 67891}
+        ])
+        self.order_manager.instruments_by_token = {
+            67890: {"instrument_token": 67890, "strike": 18000, "instrument_type": "CE"},
+            67891: {"instrument_token": 67891, "strike": 18300, "instrument_type": "CE"}
+        }
+        self.order_manager.get_ltp.side_effect = {67890: 120, 67891: 80}.get
+        
+        self.strategy._replace_expiring_buy_positions("CE", expiring)
+        
+        # Weighted strike 18100 plus the average premium of 100
+        self.order_manager.get_instrument_token.assert_called_once_with(
+            self.expiry_manager.get_next_weekly_expiry.return_value, 18200, "CE"
+        )
+    
     def test_buy_order_exists_at_strike(self):
         """Test checking if buy order exists at strike"""
         # Mock positions
@@ -741,6 +1279,7 @@ class TestStrategies(unittest.TestCase):
                 "expiry": expiry
             }
         }
+        self._index_instruments()
         
         # Execute - should find the buy order
         result = self.strategy._buy_order_exists_at_strike(expiry, 18000, "CE")
@@ -754,6 +1293,26 @@ class TestStrategies(unittest.TestCase):
         result = self.strategy._buy_order_exists_at_strike(expiry, 18000, "PE")
         self.assertFalse(result)
     
+    def test_buy_order_exists_at_strike_reuses_strike_set(self):
+        """Test long strikes are indexed once per positions snapshot"""
+        expiry = datetime.date.today() + datetime.timedelta(days=7)
+        self.order_manager.instruments_cache = {
+            "key1": {"instrument_token": 12345, "strike": 18000, "instrument_type": "CE", "expiry": expiry}
+        }
+        self._index_instruments()
+        self.order_manager.positions = {"net": [
+            {"tradingsymbol": "NIFTY25APR18000CE", "quantity": 50, "instrument_token": 12345}
+        ]}
+        
+        self.assertTrue(self.strategy._buy_order_exists_at_strike(expiry, 18000, "CE"))
+        long_strikes = self.strategy._long_strikes
+        self.assertFalse(self.strategy._buy_order_exists_at_strike(expiry, 18050, "CE"))
+        self.assertIs(self.strategy._long_strikes, long_strikes)
+        
+        # A refreshed positions snapshot rebuilds the set
+        self.order_manager.positions = {"net": []}
+        self.assertFalse(self.strategy._buy_order_exists_at_strike(expiry, 18000, "CE"))
+    
     def test_adjust_strike_for_conflict(self):
         """Test adjusting strike for conflict"""
         # Test positive adjustment
@@ -856,6 +1415,7 @@ class TestStrategies(unittest.TestCase):
                  "expiry": expiry
              }
          }
+         self._index_instruments()
          
          # Mock orders
          self.order_manager.orders = {
@@ -907,6 +1467,7 @@ class TestStrategies(unittest.TestCase):
                  "expiry": expiry
              }
          }
+         self._index_instruments()
          
          # Execute
          result = self.strategy._sell_order_exists_for_type(expiry, option_type)
@@ -1,9 +1,15 @@
 import os
+import time
 import datetime
 import pandas as pd
 import numpy as np
 from kiteconnect import KiteConnect
 
+NIFTY_SPOT_SYMBOL = "NSE:NIFTY 50"
+
+# Seconds a fetched spot price is reused before hitting the API again
+SPOT_PRICE_TTL = 1.0
+
 class Helpers:
     def __init__(self, kite, logger):
         """
@@ -16,6 +22,14 @@ class Helpers:
         self.kite = kite
         self.logger = logger
         self.logger.info("Helpers: Initializing helpers module")
+        
+        # Last fetched LTP per symbol as (monotonic time, price)
+        self._ltp_cache = {}
+        
+        # Instrument dumps per exchange, downloaded at most once a day
+        self._instruments = {}
+        self._instruments_by_symbol = {}
+        self._instruments_date = None
     
     def round_to_tick_size(self, price, tick_size=0.05):
         """
@@ -38,14 +52,44 @@ class Helpers:
             Current Nifty spot price or None if not available
         """
         try:
-            ltp_data = self.kite.ltp(["NSE:NIFTY 50"])
-            spot_price = ltp_data["NSE:NIFTY 50"]["last_price"]
+            # Reuse a price fetched within the TTL instead of another round-trip
+            now = time.monotonic()
+            cached = self._ltp_cache.get(NIFTY_SPOT_SYMBOL)
+            if cached is not None and now - cached[0] < SPOT_PRICE_TTL:
+                return cached[1]
+            
+            ltp_data = self.kite.ltp([NIFTY_SPOT_SYMBOL])
+            spot_price = ltp_data[NIFTY_SPOT_SYMBOL]["last_price"]
+            self._ltp_cache[NIFTY_SPOT_SYMBOL] = (now, spot_price)
             self.logger.info(f"Helpers: Nifty spot price: {spot_price}")
             return spot_price
         except Exception as e:
             self.logger.error(f"Helpers: Failed to get Nifty spot price: {str(e)}")
             return None
     
+    def _get_instruments(self, exchange):
+        """
+        Get the instrument dump for an exchange, reusing today's download
+        
+        Args:
+            exchange: Exchange
+            
+        Returns:
+            List of instruments
+        """
+        today = datetime.date.today()
+        if self._instruments_date != today:
+            self._instruments = {}
+            self._instruments_by_symbol = {}
+            self._instruments_date = today
+        
+        if exchange not in self._instruments:
+            instruments = self.kite.instruments(exchange)
+            self._instruments[exchange] = instruments
+            self._instruments_by_symbol[exchange] = {i["tradingsymbol"]: i for i in instruments}
+        
+        return self._instruments[exchange]
+    
     def get_instrument_details(self, tradingsymbol, exchange="NFO"):
         """
         Get instrument details by trading symbol
@@ -58,10 +102,10 @@ class Helpers:
             Instrument details or None if not found
         """
         try:
-            instruments = self.kite.instruments(exchange)
-            for instrument in instruments:
-                if instrument["tradingsymbol"] == tradingsymbol:
-                    return instrument
+            self._get_instruments(exchange)
+            instrument = self._instruments_by_symbol[exchange].get(tradingsymbol)
+            if instrument is not None:
+                return instrument
             
             self.logger.warning(f"Helpers: Instrument {tradingsymbol} not found")
             return None
@@ -88,7 +132,7 @@ class Helpers:
                 expiry_date = expiry_date.date()
             
             # Get all instruments
-            instruments = self.kite.instruments("NFO")
+            instruments = self._get_instruments("NFO")
             
             # Filter for the underlying and expiry
             filtered_instruments = [
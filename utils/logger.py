@@ -2,8 +2,78 @@ import logging
 import os
 import datetime
 import sys
+import time
+import queue
+import atexit
+import threading
 import inspect
 from functools import wraps
+from logging.handlers import QueueHandler, QueueListener
+
+# Background listener that writes queued records to the handlers
+_listener = None
+
+def _stop_listener():
+    """
+    Flush queued records and stop the background listener, if running
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+atexit.register(_stop_listener)
+
+class DuplicateFilter(logging.Filter):
+    def __init__(self, window=1.0, level=logging.ERROR, max_entries=1000):
+        """
+        Drop identical records repeated within a time window
+        
+        Args:
+            window: Seconds during which repeats of a message are dropped
+            level: Minimum level the filter applies to
+            max_entries: Number of distinct messages tracked before stale ones are pruned
+        """
+        super().__init__()
+        self.window = window
+        self.level = level
+        self.max_entries = max_entries
+        
+        # (level, message) -> [time last emitted, repeats dropped since]
+        self._seen = {}
+        self._lock = threading.Lock()
+    
+    def filter(self, record):
+        """
+        Decide whether a record is emitted
+        
+        Args:
+            record: Log record
+            
+        Returns:
+            False if the record repeats a message emitted within the window, True otherwise
+        """
+        if record.levelno < self.level:
+            return True
+        
+        message = record.getMessage()
+        key = (record.levelno, message)
+        now = time.monotonic()
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is not None and now - seen[0] < self.window:
+                seen[1] += 1
+                return False
+            
+            if len(self._seen) >= self.max_entries:
+                self._seen = {k: v for k, v in self._seen.items() if now - v[0] < self.window}
+            self._seen[key] = [now, 0]
+        
+        # Report the repeats dropped since this message was last emitted
+        if seen is not None and seen[1]:
+            record.msg = f"{message} (repeated {seen[1]} times)"
+            record.args = None
+        return True
 
 class Logger:
     def __init__(self, log_level=None, log_file=None, error_log_file=None):
@@ -43,19 +113,28 @@ class Logger:
         file_handler = logging.FileHandler(self.log_file)
         file_handler.setLevel(getattr(logging, self.log_level))
         file_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
         
         # Create error file handler
         error_file_handler = logging.FileHandler(self.error_log_file)
         error_file_handler.setLevel(logging.ERROR)
         error_file_handler.setFormatter(formatter)
-        self.logger.addHandler(error_file_handler)
         
         # Create console handler
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(getattr(logging, self.log_level))
         console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
+        
+        # Callers only enqueue records; file and console writes happen on the listener thread
+        global _listener
+        _stop_listener()
+        log_queue = queue.SimpleQueue()
+        queue_handler = QueueHandler(log_queue)
+        
+        # Drop error storms before they reach the queue
+        queue_handler.addFilter(DuplicateFilter())
+        self.logger.addHandler(queue_handler)
+        _listener = QueueListener(log_queue, file_handler, error_file_handler, console_handler, respect_handler_level=True)
+        _listener.start()
     
     def get_logger(self):
         """
@@ -173,43 +252,54 @@ class Logger:
             max_size_mb: Maximum size of log file in MB
             backup_count: Number of backup files to keep
         """
-        # Check main log file size
-        if os.path.exists(self.log_file) and os.path.getsize(self.log_file) > max_size_mb * 1024 * 1024:
-            self._rotate_log_file(self.log_file, backup_count)
+        max_size = max_size_mb * 1024 * 1024
+        rotated = False
+        for log_file in (self.log_file, self.error_log_file):
+            if self._file_size(log_file) > max_size:
+                self._rotate_log_file(log_file, backup_count)
+                rotated = True
+        
+        # Reconfigure handlers once, however many files were rotated
+        if rotated:
+            self.__init__(self.log_level, self.log_file, self.error_log_file)
+    
+    @staticmethod
+    def _file_size(path):
+        """
+        Get the size of a file with a single stat call
         
-        # Check error log file size
-        if os.path.exists(self.error_log_file) and os.path.getsize(self.error_log_file) > max_size_mb * 1024 * 1024:
-            self._rotate_log_file(self.error_log_file, backup_count)
+        Args:
+            path: File path
+            
+        Returns:
+            Size in bytes, or 0 if the file does not exist
+        """
+        try:
+            return os.stat(path).st_size
+        except FileNotFoundError:
+            return 0
     
     def _rotate_log_file(self, log_file, backup_count):
         """
-        Rotate a specific log file
+        Rotate a specific log file; the handlers recreate it when reconfigured
         
         Args:
             log_file: Log file path
             backup_count: Number of backup files to keep
         """
         # Remove oldest backup if it exists
-        oldest_backup = f"{log_file}.{backup_count}"
-        if os.path.exists(oldest_backup):
-            os.remove(oldest_backup)
-        
-        # Shift existing backups
-        for i in range(backup_count - 1, 0, -1):
-            backup = f"{log_file}.{i}"
-            new_backup = f"{log_file}.{i + 1}"
-            if os.path.exists(backup):
-                os.rename(backup, new_backup)
-        
-        # Rename current log file to .1
-        if os.path.exists(log_file):
-            os.rename(log_file, f"{log_file}.1")
-        
-        # Create new log file
-        open(log_file, 'w').close()
-        
-        # Reconfigure handlers
-        self.__init__(self.log_level, self.log_file, self.error_log_file)
+        try:
+            os.remove(f"{log_file}.{backup_count}")
+        except FileNotFoundError:
+            pass
+        
+        # Shift existing backups and rename the current log file to .1
+        for i in range(backup_count - 1, -1, -1):
+            source = f"{log_file}.{i}" if i else log_file
+            try:
+                os.replace(source, f"{log_file}.{i + 1}")
+            except FileNotFoundError:
+                pass
     
     def archive_old_logs(self, days=30):
         """
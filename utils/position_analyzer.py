@@ -76,10 +76,11 @@ class PositionAnalyzer:
             total_pnl += pnl
             
             # Classify by option type
-            if tradingsymbol.endswith('CE'):
+            option_type = tradingsymbol[-2:]
+            if option_type == 'CE':
                 ce_positions += 1
                 ce_pnl += pnl
-            elif tradingsymbol.endswith('PE'):
+            elif option_type == 'PE':
                 pe_positions += 1
                 pe_pnl += pnl
             
@@ -131,15 +132,19 @@ class PositionAnalyzer:
         
         # Add additional columns
         if not df.empty:
+            # Fetch quotes for all open positions in one call instead of one per row
+            ltp_cache = self.order_manager.ltp_cache
+            open_tokens = df.loc[df['quantity'] != 0, 'instrument_token'].tolist()
+            self.order_manager.prefetch_ltps([token for token in open_tokens if token not in ltp_cache])
+            
             # Calculate profit percentage
             df['profit_percentage'] = df.apply(
                 lambda row: self._calculate_profit_percentage(row), axis=1
             )
             
             # Extract option details
-            df['option_type'] = df['tradingsymbol'].apply(
-                lambda x: 'CE' if x.endswith('CE') else ('PE' if x.endswith('PE') else 'Other')
-            )
+            suffix = df['tradingsymbol'].str[-2:]
+            df['option_type'] = suffix.where(suffix.isin(['CE', 'PE']), 'Other')
             
             # Extract expiry from tradingsymbol (simplified)
             df['expiry'] = df['tradingsymbol'].apply(